@@ -0,0 +1,84 @@
+"""
+Benchmark: per-file commits vs. the single-transaction bulk insert path.
+
+Run from the repository root:
+    python -m backend.benchmarks.bulk_insert
+"""
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from ..data import question_models as service
+from ..model.question_models import Package, QuestionFolder, QuestionFile
+
+FOLDER_COUNTS = [10, 100, 1000]
+
+FILES = {
+    "question_html": "<pl-question-panel>{{ params.x }}</pl-question-panel>" * 20,
+    "server_js": "const generate = () => ({ params: {}, correct_answers: {} });" * 10,
+    "server_py": "def generate():\n    return {}\n" * 10,
+    "solution_html": "<pl-solution-panel></pl-solution-panel>" * 20,
+    "question_txt": "A ball is thrown from a building." * 5,
+    "metadata": {"title": "Question", "topic": ["Kinematics"], "tags": ["bench"]},
+}
+
+
+def legacy_create_package_with_folders(package, folders, session):
+    """The previous implementation: one commit and refresh per row."""
+    session.add(package)
+    session.commit()
+    session.refresh(package)
+    for title, files_content in folders:
+        folder = QuestionFolder(title=title, package_id=package.id)
+        session.add(folder)
+        session.commit()
+        session.refresh(folder)
+        for file in service._build_files(files_content):
+            file.question_folder_id = folder.id
+            session.add(file)
+            session.commit()
+            session.refresh(file)
+    return package
+
+
+def run(create, n_folders: int):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+        SQLModel.metadata.create_all(engine)
+        counts = {"commits": 0, "statements": 0}
+
+        def on_commit(conn):
+            counts["commits"] += 1
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            counts["statements"] += 1
+
+        event.listen(engine, "commit", on_commit)
+        event.listen(engine, "before_cursor_execute", on_execute)
+
+        folders = [(f"Question {i}", FILES) for i in range(n_folders)]
+        with Session(engine) as session:
+            start = time.perf_counter()
+            create(Package(title="Benchmark"), folders, session)
+            elapsed = time.perf_counter() - start
+            assert len(session.exec(select(QuestionFile.id)).all()) == n_folders * len(FILES)
+        engine.dispose()
+        return counts, elapsed
+
+
+def main():
+    print(f"{'folders':>8} {'path':>8} {'commits':>8} {'stmts':>8} {'seconds':>9}")
+    for n in FOLDER_COUNTS:
+        for label, create in (
+            ("legacy", legacy_create_package_with_folders),
+            ("bulk", service.create_package_with_folders),
+        ):
+            counts, elapsed = run(create, n)
+            print(f"{n:>8} {label:>8} {counts['commits']:>8} {counts['statements']:>8} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Load test: read throughput while a bulk write is in progress.
+
+Compares the previous default engine (rollback journal, no busy timeout) with
+the WAL profile built by `create_db_engine`. Reader threads query folders and
+files in a loop while a writer thread repeatedly inserts large packages.
+
+Run from the repository root:
+    python -m backend.benchmarks.concurrent_reads
+"""
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, Session, create_engine
+
+from ..data import question_models as service
+from ..data.database import DatabaseSettings, create_db_engine
+from ..model.question_models import Package
+from .bulk_insert import FILES
+
+READERS = 8
+DURATION = 5.0
+WRITE_FOLDERS = 500
+
+
+def run(profile: str):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = f"sqlite:///{os.path.join(tmpdir, 'load.db')}"
+        if profile == "legacy":
+            read_engine = write_engine = create_engine(url, connect_args={"check_same_thread": False})
+        else:
+            settings = DatabaseSettings(url=url)
+            read_engine = create_db_engine(settings)
+            write_engine = create_db_engine(settings, writer=True)
+        SQLModel.metadata.create_all(write_engine)
+        with Session(write_engine) as session:
+            package_id = service.create_package_with_folders(
+                Package(title="Seed"), [(f"Q{i}", FILES) for i in range(200)], session
+            ).id
+            folder_id = service.get_package_folder(package_id, session).id
+
+        stop = threading.Event()
+        stats = {"reads": 0, "read_errors": 0, "writes": 0, "write_errors": 0}
+        latencies = []
+        lock = threading.Lock()
+
+        def reader():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    with Session(read_engine) as session:
+                        service.get_folder_files(package_id, folder_id, session=session)
+                    key = "reads"
+                except OperationalError:
+                    key = "read_errors"
+                with lock:
+                    stats[key] += 1
+                    latencies.append(time.perf_counter() - start)
+
+        def writer():
+            while not stop.is_set():
+                try:
+                    with Session(write_engine) as session:
+                        service.create_package_with_folders(
+                            Package(title="Bulk"), [(f"W{i}", FILES) for i in range(WRITE_FOLDERS)], session
+                        )
+                    key = "writes"
+                except OperationalError:
+                    key = "write_errors"
+                with lock:
+                    stats[key] += 1
+
+        threads = [threading.Thread(target=reader) for _ in range(READERS)]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        time.sleep(DURATION)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        read_engine.dispose()
+        write_engine.dispose()
+        latencies.sort()
+        stats["p99_ms"] = latencies[int(len(latencies) * 0.99)] * 1000
+        stats["max_ms"] = latencies[-1] * 1000
+        return stats
+
+
+def main():
+    print(f"{READERS} readers, 1 writer inserting {WRITE_FOLDERS}-folder packages, {DURATION:.0f}s")
+    print(
+        f"{'profile':>8} {'reads/s':>9} {'p99 ms':>8} {'max ms':>8} "
+        f"{'read errs':>10} {'writes':>7} {'write errs':>11}"
+    )
+    for profile in ("legacy", "wal"):
+        stats = run(profile)
+        print(
+            f"{profile:>8} {stats['reads'] / DURATION:>9.0f} {stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f} "
+            f"{stats['read_errors']:>10} "
+            f"{stats['writes']:>7} {stats['write_errors']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
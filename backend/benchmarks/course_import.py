@@ -0,0 +1,61 @@
+"""
+Benchmark: importing a 5,000-question PrairieLearn course ZIP.
+
+Reports wall time and the peak RSS growth of the import itself; the archive
+is written to a temporary file first, as an upload would be spooled.
+
+Run from the repository root:
+    python -m backend.benchmarks.course_import
+"""
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+import zipfile
+
+from sqlmodel import Session, SQLModel
+
+from ..data import question_models as service
+from ..data.database import DatabaseSettings, create_db_engine
+from ..model.question_models import Package
+
+QUESTIONS = 5000
+WORDS = [f"w{i:04d}" for i in range(5000)]
+
+
+def write_course(path: str) -> None:
+    rng = random.Random(5)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as course:
+        for i in range(QUESTIONS):
+            root = f"course/questions/q{i:05d}"
+            info = {"uuid": f"{i:032x}", "title": f"Question {i}", "topic": "Kinematics", "tags": ["bench"]}
+            course.writestr(f"{root}/info.json", json.dumps(info))
+            course.writestr(f"{root}/question.html", " ".join(rng.choice(WORDS) for _ in range(400)))
+            course.writestr(f"{root}/server.py", "def generate(data):\n    pass\n" * 20)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        archive = os.path.join(tmpdir, "course.zip")
+        write_course(archive)
+        engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{os.path.join(tmpdir, 'import.db')}"))
+        SQLModel.metadata.create_all(engine)
+
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        with open(archive, "rb") as upload, Session(engine) as session:
+            result = service.import_package(Package(title="Course"), upload, session)
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(
+            f"{result.folders} questions, {result.files} files, {os.path.getsize(archive) / 1e6:.1f} MB zip: "
+            f"{elapsed:.2f} s, peak RSS +{(peak - baseline) / 1024:.1f} MB "
+            f"(batches of {service.IMPORT_BATCH_SIZE})"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: folder file listings with and without content.
+
+Compares the content-carrying routes (`get_all_files`, `folder/file_contents`)
+with the metadata-only routes (`files`, `folder/files`) on a folder whose files
+are a few hundred KB in total: response size and median / p95 latency.
+
+Run from the repository root:
+    python -m backend.benchmarks.file_listing
+"""
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..data import question_models as service
+from ..data.database import DatabaseSettings, create_async_db_engine, create_db_engine, get_async_session
+from ..model.question_models import Package
+from ..routes import question_models as routes
+
+REQUESTS = 200
+FILES = {
+    "question_html": "<pl-question-panel>" + "A ball is thrown horizontally from a building. " * 1500 + "</pl-question-panel>",
+    "server_js": "const generate = () => ({ params: {}, correct_answers: {} });\n" * 800,
+    "server_py": "def generate(data):\n    data['params']['x'] = 1\n" * 1000,
+    "solution_html": "<pl-solution-panel>" + "Use the kinematic equations. " * 1500 + "</pl-solution-panel>",
+    "question_txt": "A ball is thrown horizontally from a building. " * 500,
+    "metadata": {"title": "Projectile", "topic": "Kinematics"},
+}
+
+
+def measure(client: TestClient, url: str):
+    timings = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    timings.sort()
+    return len(response.content), statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        settings = DatabaseSettings(url=f"sqlite:///{os.path.join(tmpdir, 'listing.db')}")
+        engine = create_db_engine(settings)
+        async_engine = create_async_db_engine(settings)
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            package_id = service.create_package_with_folders(
+                Package(title="Listing"), [(f"Q{i}", FILES) for i in range(20)], session
+            ).id
+            folder_id = service.get_package_folder(package_id, session).id
+
+        async def override_session():
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                yield session
+
+        app = FastAPI()
+        app.include_router(routes.router)
+        app.dependency_overrides[get_async_session] = override_session
+        with TestClient(app) as client:
+            print(f"{'route':>44} {'bytes':>9} {'median ms':>10} {'p95 ms':>8}")
+            for url in (
+                f"/packages/simple/{package_id}/{folder_id}/get_all_files",
+                f"/packages/simple/{package_id}/{folder_id}/files",
+                f"/packages/simple/{package_id}/folder/file_contents",
+                f"/packages/simple/{package_id}/folder/files",
+            ):
+                size, median, p95 = measure(client, url)
+                print(f"{url:>44} {size:>9} {median:>10.2f} {p95:>8.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
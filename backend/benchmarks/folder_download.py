@@ -0,0 +1,92 @@
+"""
+Benchmark: single-folder download latency, temp files vs. zipping from the database.
+
+Compares the previous implementation (write every file to a temporary
+directory, then zip the files back from disk) with zipping stored contents
+directly, for folders of about 10 KB and 10 MB in total.
+
+Run from the repository root:
+    python -m backend.benchmarks.folder_download
+"""
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+import zipfile
+
+from sqlmodel import SQLModel, Session
+
+from ..data import question_models as service
+from ..data.database import DatabaseSettings, create_db_engine
+from ..data.zip_stream import stream_zip
+from ..model.question_models import Package
+
+SIZES = {"10 KB": 10 * 1024, "10 MB": 10 * 1024 * 1024}
+FILE_NAMES = ["question_html", "server_js", "server_py", "solution_html", "question_txt"]
+WORDS = [f"w{i:04d}" for i in range(5000)]
+
+
+def random_text(rng: random.Random, n_bytes: int) -> str:
+    words = []
+    size = 0
+    while size < n_bytes:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def legacy_download(package_id: int, folder_id: int, session: Session) -> bytes:
+    """The previous implementation: temp files, then an in-memory ZIP read back from disk."""
+    files = service.get_folder_files(package_id, folder_id, session)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for file in files:
+            path = os.path.join(tmpdir, file.save_name or service.file_name_map.get(file.name))
+            with open(path, "wb") as f:
+                f.write(file.content.encode("utf-8"))
+            paths.append(path)
+        memory_file = io.BytesIO()
+        with zipfile.ZipFile(memory_file, "w") as zipf:
+            for path in paths:
+                zipf.write(path, arcname=os.path.basename(path))
+        return memory_file.getvalue()
+
+
+def direct_download(package_id: int, folder_id: int, session: Session) -> bytes:
+    files = service.get_folder_files(package_id, folder_id, session)
+    return b"".join(stream_zip((service._archive_entry(file) for file in files), compression=zipfile.ZIP_STORED))
+
+
+def main():
+    rng = random.Random(5)
+    service.read_cache.enabled = False
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{os.path.join(tmpdir, 'folder.db')}"))
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            print(f"{'folder':>7} {'variant':>8} {'median ms':>10} {'p95 ms':>8}")
+            for label, total in SIZES.items():
+                files = {name: random_text(rng, total // len(FILE_NAMES)) for name in FILE_NAMES}
+                package_id = service.create_package_with_folders(Package(title=label), [(label, files)], session).id
+                folder_id = service.get_package_folder(package_id, session).id
+                runs = 200 if total < 1024 * 1024 else 20
+                for name, download in (("legacy", legacy_download), ("direct", direct_download)):
+                    timings = []
+                    for _ in range(runs):
+                        session.expire_all()
+                        start = time.perf_counter()
+                        download(package_id, folder_id, session)
+                        timings.append((time.perf_counter() - start) * 1000)
+                    timings.sort()
+                    print(
+                        f"{label:>7} {name:>8} {statistics.median(timings):>10.2f} "
+                        f"{timings[int(len(timings) * 0.95)]:>8.2f}"
+                    )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: module download peak memory and time to first byte, 1,000 folders.
+
+Compares the previous implementation (each folder ZIP built in a BytesIO and
+copied into a master BytesIO before the response starts) with the streamed
+archive, both nested and in the flat PrairieLearn layout. Each variant runs in a fresh process so peak RSS is its own. The
+streamed figure is mostly SQLite's page cache and memory map over the database
+file, which are capped by the engine settings rather than by the module size.
+
+Run from the repository root:
+    python -m backend.benchmarks.module_download
+"""
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+import zipfile
+from io import BytesIO
+
+from sqlmodel import SQLModel, Session
+
+from ..data import question_models as service
+from ..data.database import DatabaseSettings, create_db_engine
+from ..data.zip_stream import stream_zip
+from ..model.question_models import ArchiveLayout, Package, QuestionFolder
+
+FOLDERS = 1000
+WORDS = [f"w{i:04d}" for i in range(5000)]
+
+
+def random_text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def seed(url: str, results) -> None:
+    rng = random.Random(3)
+    engine = create_db_engine(DatabaseSettings(url=url))
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        folders = [
+            (
+                f"Question {i}",
+                {
+                    "question_html": f"<p>{random_text(rng, 3000)}</p>",
+                    "server_js": f"// {random_text(rng, 1500)}",
+                    "solution_html": f"<p>{random_text(rng, 2000)}</p>",
+                    "metadata": {"title": f"Question {i}"},
+                },
+            )
+            for i in range(FOLDERS)
+        ]
+        package_id = service.create_package_with_folders(Package(title="Export"), folders, session).id
+    engine.dispose()
+    results.put(package_id)
+
+
+def legacy_download(package_id: int, session: Session):
+    """The previous implementation, yielding the finished master buffer."""
+    folders = (
+        session.query(QuestionFolder)
+        .options(service.selectinload(QuestionFolder.question_files))
+        .filter(QuestionFolder.package_id == package_id)
+        .all()
+    )
+    master_zip_buffer = BytesIO()
+    with zipfile.ZipFile(master_zip_buffer, "w", zipfile.ZIP_DEFLATED) as master_zip:
+        for folder in folders:
+            folder_zip_buffer = BytesIO()
+            with zipfile.ZipFile(folder_zip_buffer, "w", zipfile.ZIP_DEFLATED) as folder_zip:
+                for file in service._with_contents(folder.question_files):
+                    folder_zip.writestr(*service._archive_entry(file))
+            master_zip.writestr(f"{folder.title}_{folder.id}.zip", folder_zip_buffer.getvalue())
+    master_zip_buffer.seek(0)
+    yield from iter(lambda: master_zip_buffer.read(64 * 1024), b"")
+
+
+def run(variant: str, url: str, package_id: int, results) -> None:
+    engine = create_db_engine(DatabaseSettings(url=url))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with Session(engine) as session:
+        if variant == "legacy":
+            chunks = legacy_download(package_id, session)
+        else:
+            layout = ArchiveLayout.flat if variant == "flat" else ArchiveLayout.nested
+            chunks = stream_zip(service._module_entries(package_id, lambda: Session(engine), layout=layout))
+        first_byte = None
+        size = 0
+        for chunk in chunks:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            size += len(chunk)
+    total = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((variant, size, first_byte, total, (peak - baseline) / 1024))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = f"sqlite:///{os.path.join(tmpdir, 'download.db')}"
+        # Every step runs in its own process: Linux carries peak RSS over into spawned children.
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=seed, args=(url, results))
+        process.start()
+        package_id = results.get()
+        process.join()
+
+        print(f"{'variant':>10} {'archive MB':>11} {'TTFB ms':>9} {'total s':>8} {'peak RSS +MB':>13}")
+        for variant in ("legacy", "streamed", "flat"):
+            process = context.Process(target=run, args=(variant, url, package_id, results))
+            process.start()
+            name, size, first_byte, total, rss = results.get()
+            process.join()
+            print(f"{name:>10} {size / 1e6:>11.1f} {first_byte * 1000:>9.1f} {total:>8.2f} {rss:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: server.js generators, a fresh `node` per call vs. the worker pool.
+
+The spawn-per-call variant is the previous `run_js`: `node server.js generate`
+with the result printed to stdout and parsed with json5. Both run the same
+generator, sequentially and from 8 threads at once.
+
+Run from the repository root:
+    python -m backend.benchmarks.node_pool
+"""
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import json5
+
+from ..processing.code_runners.node_pool import NodePool
+
+CALLS = 200
+CONCURRENCY = 8
+
+GENERATOR = """
+const generate = () => {
+    const units = [{ dist: "m", g: 9.81 }, { dist: "ft", g: 32.2 }][Math.floor(Math.random() * 2)];
+    const height = Math.floor(Math.random() * 91) + 10;
+    return {
+        params: { buildingHeight: height, unitsDist: units.dist },
+        correct_answers: { time: Math.sqrt(2 * height / units.g).toFixed(3) },
+    };
+};
+module.exports = { generate };
+if (process.argv[2] === "generate") console.log(JSON.stringify(generate()));
+"""
+
+
+def spawn(path: str) -> dict:
+    result = subprocess.run(["node", path, "generate"], capture_output=True, text=True, check=True)
+    return json5.loads(result.stdout)
+
+
+def measure(call, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda _: call(), range(CALLS)))
+    assert all("params" in result for result in results)
+    return (time.perf_counter() - start) / CALLS * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "server.js")
+        with open(path, "w") as file:
+            file.write(GENERATOR)
+        pool = NodePool(size=CONCURRENCY)
+        pool.run(GENERATOR, filename=path)  # Start one worker before timing.
+
+        print(f"{CALLS} calls, {os.cpu_count()} CPUs; ms per call")
+        print(f"{'threads':>8} {'spawn':>8} {'pool':>8}")
+        for threads in (1, CONCURRENCY):
+            spawned = measure(lambda: spawn(path), threads)
+            pooled = measure(lambda: pool.run(GENERATOR, filename=path, seed=1), threads)
+            print(f"{threads:>8} {spawned:>8.2f} {pooled:>8.2f}")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
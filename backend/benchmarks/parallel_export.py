@@ -0,0 +1,66 @@
+"""
+Benchmark: module export time with 1 to N folder compression threads.
+
+Builds the full module archive for a 300-folder package with a thread pool of
+each size and reports wall time and speedup over a single thread. Every run
+produces identical bytes. Scaling needs as many free cores as threads.
+
+Run from the repository root:
+    python -m backend.benchmarks.parallel_export
+"""
+import hashlib
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlmodel import SQLModel, Session
+
+from ..data import question_models as service
+from ..data.database import DatabaseSettings, create_db_engine
+from ..data.zip_stream import stream_zip
+from ..model.question_models import Package
+
+FOLDERS = 300
+WORDS = [f"w{i:04d}" for i in range(5000)]
+
+
+def random_text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def main():
+    rng = random.Random(11)
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus, 2 * cpus})
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{os.path.join(tmpdir, 'export.db')}"))
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            folders = [
+                (f"Question {i}", {"question_html": random_text(rng, 10000), "solution_html": random_text(rng, 6000)})
+                for i in range(FOLDERS)
+            ]
+            package_id = service.create_package_with_folders(Package(title="Export"), folders, session).id
+
+        print(f"{cpus} CPUs")
+        print(f"{'threads':>8} {'seconds':>8} {'speedup':>8}  sha256")
+        baseline = None
+        for workers in worker_counts:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                start = time.perf_counter()
+                digest = hashlib.sha256()
+                entries = service._module_entries(
+                    package_id, lambda: Session(engine), executor, max_pending=2 * workers
+                )
+                for chunk in stream_zip(entries):
+                    digest.update(chunk)
+                elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>8.2f} {baseline / elapsed:>8.2f}  {digest.hexdigest()[:16]}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
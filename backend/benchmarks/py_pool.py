@@ -0,0 +1,71 @@
+"""
+Benchmark: server.py generators, imported in-process per call vs. the worker pool.
+
+The in-process variant is the previous `run_generate_py`: the file is compiled
+and imported on every call, then `generate()` runs under the API's GIL. The
+pool compiles once per worker and runs generators in separate processes.
+Throughput is measured with 1, 8 and 32 renders in flight.
+
+Run from the repository root:
+    python -m backend.benchmarks.py_pool
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..processing.code_runners.code_runner import import_module_from_path
+from ..processing.code_runners.py_pool import PythonPool
+
+CALLS = 320
+CONCURRENCY = (1, 8, 32)
+
+GENERATOR = """
+import math
+import random
+
+G = {"m": 9.81, "ft": 32.2}
+
+def generate():
+    units = random.choice(list(G))
+    height = random.uniform(10, 50)
+    # A little arithmetic, as real generators do when they check their answers.
+    steps = [math.sqrt(2 * h / G[units]) for h in range(1, 2000)]
+    return {
+        "params": {"buildingHeight": round(height, 2), "unitsDist": units},
+        "correct_answers": {"time": round(math.sqrt(2 * height / G[units]), 3), "check": round(sum(steps), 3)},
+    }
+""" + "\n".join(f"# padding line {i} so compiling costs what a generated file does" for i in range(300))
+
+
+def in_process(path: str) -> dict:
+    return import_module_from_path(path).generate()
+
+
+def measure(call, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda _: call(), range(CALLS)))
+    assert all("params" in result for result in results)
+    return CALLS / (time.perf_counter() - start)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "server.py")
+        with open(path, "w") as file:
+            file.write(GENERATOR)
+        pool = PythonPool(size=os.cpu_count() or 1)
+        measure(lambda: pool.run(GENERATOR), pool.size)  # Start the workers before timing.
+
+        print(f"{CALLS} renders, {os.cpu_count()} CPUs, pool of {pool.size}; renders per second")
+        print(f"{'in flight':>9} {'in-process':>11} {'pool':>8}")
+        for threads in CONCURRENCY:
+            local = measure(lambda: in_process(path), threads)
+            pooled = measure(lambda: pool.run(GENERATOR), threads)
+            print(f"{threads:>9} {local:>11.0f} {pooled:>8.0f}")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
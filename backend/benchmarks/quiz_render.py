@@ -0,0 +1,106 @@
+"""
+Benchmark: quiz rendering through a temporary directory vs. straight from the database.
+
+The previous `generate_quiz` wrote every file of the question to a
+TemporaryDirectory with aiofiles, ran `server.js` from there and read
+`question.html` back. The current one hands the stored source to the code
+runner directly. Both use the same Node.js worker pool, so the difference is
+the filesystem round trip. Filesystem syscalls in this process are counted
+with an audit hook.
+
+Run from the repository root:
+    python -m backend.benchmarks.quiz_render
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import aiofiles
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..data import question_models as service
+from ..data.async_question_models import get_package_files
+from ..data.database import DatabaseSettings, create_async_db_engine, create_db_engine
+from ..data.generate_quiz import generate_quiz
+from ..data.helpers import format_question, read_file
+from ..model.question_models import Package
+from ..processing.code_runners.code_runner import run_generate
+
+RENDERS = 200
+# Audit events that touch the filesystem.
+FS_EVENTS = {"open", "os.mkdir", "os.rmdir", "os.remove", "os.listdir", "os.scandir", "os.chmod", "shutil.rmtree"}
+
+QUESTION_HTML = "<pl-question-panel><p>A ball falls {{ params.buildingHeight }} {{ params.unitsDist }}.</p></pl-question-panel>"
+SERVER_JS = """
+const generate = () => {
+    const height = Math.floor(Math.random() * 91) + 10;
+    return { params: { buildingHeight: height, unitsDist: "m" }, correct_answers: { time: Math.sqrt(2 * height / 9.81) } };
+};
+module.exports = { generate };
+"""
+
+counts = Counter()
+counting = False
+
+
+def audit(event, args):
+    if counting and event in FS_EVENTS:
+        counts[event] += 1
+
+
+async def legacy_generate_quiz(module_id: int, session) -> str:
+    """The previous implementation."""
+    files = await get_package_files(package_id=module_id, session=session)
+    for f in files:
+        f.save_name = service.file_name_map.get(f.name, f.name)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for f in files:
+            async with aiofiles.open(os.path.join(tmpdir, f.save_name), "w") as file:
+                await file.write(f.content)
+        generated_data = await asyncio.to_thread(run_generate, os.path.join(tmpdir, "server.js"))
+        data = {"params": generated_data.get("params", {}), "correct_answers": generated_data.get("correct_answers", {})}
+        html_content = await asyncio.to_thread(read_file, os.path.join(tmpdir, "question.html"))
+        return await asyncio.to_thread(format_question, html=html_content, data=data)
+
+
+async def measure(render, package_id: int, async_engine):
+    global counting
+    latencies = []
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        await render(package_id, session)  # Warm the worker pool and caches.
+        counts.clear()
+        counting = True
+        for _ in range(RENDERS):
+            start = time.perf_counter()
+            await render(package_id, session)
+            latencies.append((time.perf_counter() - start) * 1000)
+        counting = False
+    return statistics.median(latencies), sum(counts.values()) / RENDERS, dict(counts)
+
+
+def main():
+    sys.addaudithook(audit)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        settings = DatabaseSettings(url=f"sqlite:///{os.path.join(tmpdir, 'quiz.db')}")
+        engine = create_db_engine(settings)
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            files = {"question_html": QUESTION_HTML, "server_js": SERVER_JS, "metadata": {"title": "Drop"}}
+            package_id = service.create_package_with_folders(Package(title="Quiz"), [("Drop", files)], session).id
+        async_engine = create_async_db_engine(settings)
+
+        print(f"{'variant':>8} {'median ms':>10} {'fs calls':>9}  breakdown")
+        for name, render in (("tempdir", legacy_generate_quiz), ("direct", generate_quiz)):
+            median, per_render, breakdown = asyncio.run(measure(render, package_id, async_engine))
+            print(f"{name:>8} {median:>10.2f} {per_render:>9.1f}  {breakdown}")
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
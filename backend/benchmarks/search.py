@@ -0,0 +1,89 @@
+"""
+Benchmark: full-text search latency on a 100k-file catalog.
+
+Run from the repository root:
+    python -m backend.benchmarks.search
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlmodel import SQLModel, Session
+
+from ..data import question_models as service
+from ..data import search
+from ..data.database import DatabaseSettings, create_db_engine
+from ..model.question_models import Package, QuestionFolder
+
+FILES_PER_FOLDER = 6
+TOTAL_FILES = 100_000
+FOLDERS_PER_PACKAGE = 500
+QUERIES = ["heat", "projectile building", "thermodynamics entropy", "velocity", "piston work", "frict"]
+
+WORDS = (
+    "ball building thrown height velocity acceleration gravity time distance projectile heat engine "
+    "efficiency reservoir piston gas pressure volume temperature entropy work energy momentum force "
+    "friction incline spring mass beam stress strain torque moment circuit current voltage resistance"
+).split()
+TOPICS = ["Kinematics", "Thermodynamics", "Statics", "Dynamics", "Circuits"]
+
+
+# Filler vocabulary, so domain words appear in a realistic fraction of documents.
+FILLER = [f"w{i:04d}" for i in range(5000)]
+
+
+def random_text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) if rng.random() < 0.02 else rng.choice(FILLER) for _ in range(n_words))
+
+
+def seed(session: Session, rng: random.Random) -> None:
+    n_folders = TOTAL_FILES // FILES_PER_FOLDER
+    for start in range(0, n_folders, FOLDERS_PER_PACKAGE):
+        folders = []
+        for i in range(start, min(start + FOLDERS_PER_PACKAGE, n_folders)):
+            folder = QuestionFolder(
+                title=f"{random_text(rng, 3).title()} {i}",
+                topic=[rng.choice(TOPICS)],
+                tags=[random_text(rng, 2)],
+            )
+            files = {
+                "question_html": f"<p>{random_text(rng, 120)}</p>",
+                "server_js": f"// {random_text(rng, 40)}\nconst generate = () => ({{}});",
+                "server_py": f"# {random_text(rng, 40)}\ndef generate():\n    return {{}}",
+                "solution_html": f"<p>{random_text(rng, 150)}</p>",
+                "question_txt": random_text(rng, 60),
+                "metadata": {"title": folder.title, "n": i},
+            }
+            folders.append((folder, files))
+        service.bulk_create_package(Package(title=f"Catalog {start}"), folders, session)
+
+
+def main():
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{os.path.join(tmpdir, 'search.db')}"))
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            seed(session, rng)
+            print(f"seeded {TOTAL_FILES} files in {time.perf_counter() - start:.1f}s")
+
+            print(f"{'query':>28} {'hits':>5} {'median ms':>10} {'p95 ms':>8}")
+            for query in QUERIES:
+                timings = []
+                for _ in range(50):
+                    start = time.perf_counter()
+                    page = search.search_folders(query, limit=20, session=session)
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                print(
+                    f"{query:>28} {len(page.items):>5} {statistics.median(timings):>10.2f} "
+                    f"{timings[int(len(timings) * 0.95)]:>8.2f}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# data/archive_cache.py
+"""
+On-disk cache of built download archives.
+
+Archives are stored as `<package id>-<key>.zip`, where the key hashes whatever
+identifies the archive's content, such as the package version, and its build
+options (see `archive_key`), so an entry can never be served for changed
+content. Writes to a package still drop its entries to free the space early.
+An archive being served is pinned by a hard link, so eviction or invalidation
+cannot delete it partway through a response. The directory is kept under a
+byte budget by evicting the least recently served archives; file access times
+record use, so the order survives restarts and is shared between workers,
+while modification times stay at build time and serve as a stable
+Last-Modified.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import Iterable, Iterator, Optional
+
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "gestalt-archives")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def archive_key(rows: Iterable[Iterable[object]], *options: object) -> str:
+    """
+    Hash the rows describing an archive's contents, plus any build options.
+
+    Args:
+        rows (Iterable[Iterable[object]]): Rows identifying the archive's content.
+        options (object): Settings that change the archive bytes, such as the layout.
+
+    Returns:
+        str: A hex digest identifying the archive.
+    """
+    digest = hashlib.sha256(repr(options).encode("utf-8"))
+    for row in rows:
+        digest.update(b"\x1e")
+        digest.update("\x1f".join(map(str, row)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ArchiveCache:
+    """
+    A directory of built archives with least-recently-used eviction.
+
+    Args:
+        directory (str): Where archives are stored; created on first use.
+        max_bytes (int): The disk budget. 0 disables the cache.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def path(self, package_id: int, key: str) -> str:
+        return os.path.join(self.directory, f"{package_id}-{key}.zip")
+
+    def get(self, package_id: int, key: str) -> Optional[str]:
+        """Return the path of a stored archive and mark it as recently used, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self.path(package_id, key)
+        try:
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            return None
+        return path
+
+    def pin(self, path: str) -> Optional[str]:
+        """
+        Hard-link a stored archive under a private name for the length of a response.
+
+        Returns:
+            Optional[str]: The path to read the archive from, until `unpin`; None if
+                the archive has been deleted since it was looked up.
+        """
+        pinned = f"{path}.{uuid.uuid4().hex}.pin"
+        try:
+            os.link(path, pinned)
+        except FileNotFoundError:
+            return None
+        except OSError:
+            # No hard links on this filesystem; read the archive in place.
+            return path if os.path.exists(path) else None
+        return pinned
+
+    def unpin(self, pinned: str) -> None:
+        """Release a path returned by `pin`."""
+        if pinned.endswith(".pin"):
+            _remove(pinned)
+
+    def tee(self, package_id: int, key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass `chunks` through while saving them as the archive for `key`.
+
+        The archive is only published once every chunk has been written, so an
+        interrupted download leaves nothing behind.
+        """
+        if not self.enabled:
+            yield from chunks
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, partial = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        published = False
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in chunks:
+                    out.write(chunk)
+                    yield chunk
+            # Concurrent builds of the same key produce the same bytes; the last rename wins.
+            os.replace(partial, self.path(package_id, key))
+            published = True
+            self._evict()
+        finally:
+            if not published:
+                _remove(partial)
+
+    def invalidate_package(self, package_id: Optional[int]) -> None:
+        """Delete every stored archive of `package_id`."""
+        if package_id is None or not os.path.isdir(self.directory):
+            return
+        prefix = f"{package_id}-"
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(".zip"):
+                _remove(os.path.join(self.directory, name))
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".zip"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_atime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                _remove(path)
+                total -= size
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+cache = ArchiveCache(
+    directory=os.getenv("ARCHIVE_CACHE_DIR", DEFAULT_DIRECTORY),
+    max_bytes=int(os.getenv("ARCHIVE_CACHE_BYTES", DEFAULT_MAX_BYTES)),
+)
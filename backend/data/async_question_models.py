@@ -0,0 +1,94 @@
+"""
+Async CRUD and Download Services for Question Module Data
+
+Async counterparts of the functions in `question_models`, for use with an
+`AsyncSession`. Each function runs its synchronous implementation through
+`AsyncSession.run_sync`, so database I/O goes through the async driver on the
+event loop instead of occupying a threadpool slot, and both APIs share a
+single implementation.
+"""
+
+# ─────────────────────────────────────────────────────────────
+# Standard Library Imports
+# ─────────────────────────────────────────────────────────────
+import functools
+import inspect
+from typing import Any, Awaitable, Callable
+
+# ─────────────────────────────────────────────────────────────
+# Third-Party Imports
+# ─────────────────────────────────────────────────────────────
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# ─────────────────────────────────────────────────────────────
+# Internal App Imports
+# ─────────────────────────────────────────────────────────────
+from . import question_models as service
+from . import search
+
+
+def _async_variant(fn: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap a synchronous service function so it accepts an `AsyncSession`.
+
+    The wrapper keeps the original signature, so `session` can still be passed
+    positionally or by keyword.
+
+    Args:
+        fn (Callable[..., Any]): A service function taking a `session` argument.
+
+    Returns:
+        Callable[..., Awaitable[Any]]: The awaitable variant.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(*args, **kwargs)
+        session: AsyncSession = bound.arguments.pop("session", None)
+        if session is None:
+            raise TypeError(f"{fn.__name__}() requires an AsyncSession")
+        return await session.run_sync(
+            lambda sync_session: fn(*bound.args, **bound.kwargs, session=sync_session)
+        )
+
+    return wrapper
+
+
+# ─────────────────────────────────────────────────────────────
+# CRUD Service Functions
+# ─────────────────────────────────────────────────────────────
+get_package_folders = _async_variant(service.get_package_folders)
+get_folder_files = _async_variant(service.get_folder_files)
+get_all_question_folders = _async_variant(service.get_all_question_folders)
+get_question_folders_page = _async_variant(service.get_question_folders_page)
+get_facets = _async_variant(service.get_facets)
+get_package_by_id = _async_variant(service.get_package_by_id)
+get_package_folder = _async_variant(service.get_package_folder)
+get_package_files = _async_variant(service.get_package_files)
+get_folder_file_meta = _async_variant(service.get_folder_file_meta)
+get_package_file_meta = _async_variant(service.get_package_file_meta)
+get_package_tree = _async_variant(service.get_package_tree)
+get_batch = _async_variant(service.get_batch)
+get_packages = _async_variant(service.get_packages)
+get_packages_page = _async_variant(service.get_packages_page)
+serve_packages = _async_variant(service.serve_packages)
+serve_package = _async_variant(service.serve_package)
+get_single_file = _async_variant(service.get_single_file)
+serve_single_file = _async_variant(service.serve_single_file)
+create_file = _async_variant(service.create_file)
+create_folder = _async_variant(service.create_folder)
+bulk_create_package = _async_variant(service.bulk_create_package)
+create_package_with_folders = _async_variant(service.create_package_with_folders)
+create_package = _async_variant(service.create_package)
+
+# ─────────────────────────────────────────────────────────────
+# Search Services
+# ─────────────────────────────────────────────────────────────
+search_folders = _async_variant(search.search_folders)
+
+# ─────────────────────────────────────────────────────────────
+# Download Services
+# ─────────────────────────────────────────────────────────────
+download_single_folder = _async_variant(service.download_single_folder)
+download_all_folders_in_module = _async_variant(service.download_all_folders_in_module)
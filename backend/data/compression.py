@@ -0,0 +1,128 @@
+# data/compression.py
+"""
+Codecs for compressed blob storage.
+
+Encodings are named after their HTTP `Content-Encoding` tokens, so stored bytes
+can be sent to clients as-is: "deflate" is the zlib format, "zstd" is a
+Zstandard frame. zstd needs the optional `zstandard` package.
+"""
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+IDENTITY = "identity"
+DEFLATE = "deflate"
+ZSTD = "zstd"
+
+
+@dataclass(frozen=True)
+class CompressionSettings:
+    """
+    Blob compression configuration, read from the environment by `from_env`.
+
+    Compression is off by default. Contents smaller than `min_size` bytes, or
+    that do not shrink, are always stored uncompressed.
+    """
+    method: str = IDENTITY
+    level: int = 6
+    min_size: int = 1024
+
+    @classmethod
+    def from_env(cls) -> "CompressionSettings":
+        """Build settings from `BLOB_COMPRESSION`, `BLOB_COMPRESSION_LEVEL` and `BLOB_COMPRESSION_MIN_SIZE`."""
+        return cls(
+            method=os.getenv("BLOB_COMPRESSION", cls.method).strip().lower(),
+            level=int(os.getenv("BLOB_COMPRESSION_LEVEL", cls.level)),
+            min_size=int(os.getenv("BLOB_COMPRESSION_MIN_SIZE", cls.min_size)),
+        )
+
+
+def _zstd_module():
+    if zstandard is None:
+        raise RuntimeError("zstd blob compression requires the 'zstandard' package")
+    return zstandard
+
+
+def compress(content: str, settings: CompressionSettings) -> Tuple[str, bytes]:
+    """
+    Encode `content` for storage.
+
+    Args:
+        content (str): The file content.
+        settings (CompressionSettings): The compression configuration.
+
+    Returns:
+        Tuple[str, bytes]: The encoding used and the stored bytes.
+    """
+    raw = content.encode("utf-8")
+    if settings.method == IDENTITY or len(raw) < settings.min_size:
+        return IDENTITY, raw
+    if settings.method == DEFLATE:
+        data = zlib.compress(raw, settings.level)
+    elif settings.method == ZSTD:
+        data = _zstd_module().ZstdCompressor(level=settings.level).compress(raw)
+    else:
+        raise ValueError(f"Unsupported blob compression method: {settings.method}")
+    if len(data) >= len(raw):
+        return IDENTITY, raw
+    return settings.method, data
+
+
+def decompress(encoding: str, data: bytes) -> str:
+    """
+    Decode stored bytes back into the file content.
+
+    Args:
+        encoding (str): The encoding the bytes were stored with.
+        data (bytes): The stored bytes.
+
+    Returns:
+        str: The file content.
+    """
+    if encoding == IDENTITY:
+        raw = data
+    elif encoding == DEFLATE:
+        raw = zlib.decompress(data)
+    elif encoding == ZSTD:
+        raw = _zstd_module().ZstdDecompressor().decompress(data)
+    else:
+        raise ValueError(f"Unsupported blob encoding: {encoding}")
+    return raw.decode("utf-8")
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Check whether an `Accept-Encoding` header allows `encoding`.
+
+    Args:
+        accept_encoding (str): The request's Accept-Encoding header value.
+        encoding (str): The content coding to check, e.g. "deflate".
+
+    Returns:
+        bool: True if the coding (or "*") is listed with a non-zero quality.
+    """
+    wildcard = False
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token == encoding:
+            return quality > 0
+        if token == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+settings = CompressionSettings.from_env()
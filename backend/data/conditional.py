@@ -0,0 +1,101 @@
+# data/conditional.py
+"""
+HTTP conditional request helpers.
+
+Responses carry a strong `ETag`, an optional `Last-Modified` and
+`Cache-Control: no-cache`, so clients revalidate on every use and get an empty
+304 while nothing has changed. `If-None-Match` takes precedence over
+`If-Modified-Since`, as in RFC 9110.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi.responses import Response
+
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from the values identifying a representation."""
+    digest = hashlib.sha256("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored in UTC.
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def http_date(moment: datetime) -> str:
+    """Format `moment` as an HTTP date."""
+    return format_datetime(_as_utc(moment), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an `If-None-Match` header value matches `etag`, using weak comparison.
+
+    Args:
+        if_none_match (str): The request's If-None-Match header value.
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in candidates if tag}
+
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    if_none_match: str = "",
+    if_modified_since: str = "",
+) -> bool:
+    """
+    Evaluate the request's validators against the resource's current ones.
+
+    Args:
+        etag (str): The current ETag of the resource.
+        last_modified (Optional[datetime]): When the resource last changed, if known.
+        if_none_match (str): The request's If-None-Match header value.
+        if_modified_since (str): The request's If-Modified-Since header value.
+
+    Returns:
+        bool: True if a 304 Not Modified should be sent.
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates have one-second resolution.
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """The validator and Cache-Control headers to send with a representation."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """An empty 304 response carrying the given validator headers."""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,134 @@
+# data/course_import.py
+"""
+Reading PrairieLearn question directories out of a ZIP archive.
+
+A question directory is any directory holding an `info.json` (or, in archives
+without any, a `question.html`); every other entry belongs to the closest
+question directory above it. The archive is read member by member from its
+central directory, so nothing is extracted to disk and only one question's
+files are held in memory at a time.
+"""
+import json
+import posixpath
+import zipfile
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from ..model.question_models import QuestionFolder
+
+# Files larger than this are left out of an import.
+MAX_FILE_SIZE = 10 * 1024 * 1024
+# Archive entries that are never question content.
+IGNORED_PREFIXES = ("__MACOSX/",)
+IGNORED_NAMES = (".DS_Store",)
+
+
+@dataclass
+class ImportReport:
+    """What an import read, and the archive entries it left out with the reason."""
+    folders: int = 0
+    files: int = 0
+    skipped: List[str] = field(default_factory=list)
+
+
+def _question_roots(names: List[str]) -> List[str]:
+    for marker in ("info.json", "question.html"):
+        roots = sorted({posixpath.dirname(name) for name in names if posixpath.basename(name) == marker})
+        if roots:
+            return roots
+    return []
+
+
+def _root_of(name: str, roots: set) -> Optional[str]:
+    directory = posixpath.dirname(name)
+    while True:
+        if directory in roots:
+            return directory
+        if not directory:
+            return None
+        directory = posixpath.dirname(directory)
+
+
+def _folder_from_info(root: str, info: Optional[str]) -> QuestionFolder:
+    """A folder titled and labelled from the question's info.json, falling back to its directory name."""
+    try:
+        metadata = json.loads(info) if info else {}
+    except json.JSONDecodeError:
+        metadata = {}
+    if not isinstance(metadata, dict):
+        metadata = {}
+    topic = metadata.get("topic")
+    tags = metadata.get("tags")
+    return QuestionFolder(
+        title=str(metadata.get("title") or posixpath.basename(root) or "question"),
+        topic=[topic] if isinstance(topic, str) else topic if isinstance(topic, list) else None,
+        tags=[str(tag) for tag in tags] if isinstance(tags, list) else None,
+        ai_generated=False,
+    )
+
+
+def iter_questions(
+    archive: BinaryIO,
+    file_names: Dict[str, str],
+    report: ImportReport,
+) -> Iterator[Tuple[QuestionFolder, Dict[str, str]]]:
+    """
+    Yield each question directory of a PrairieLearn ZIP as an unsaved folder and its files.
+
+    Args:
+        archive (BinaryIO): A seekable file object holding the ZIP.
+        file_names (Dict[str, str]): Stored file names by PrairieLearn file name,
+            e.g. "question.html" -> "question_html". Other files keep their
+            path within the question directory.
+        report (ImportReport): Updated with the counts and skipped entries as questions are read.
+
+    Yields:
+        Tuple[QuestionFolder, Dict[str, str]]: A folder and its file contents by stored name.
+
+    Raises:
+        zipfile.BadZipFile: If `archive` is not a ZIP file.
+    """
+    with zipfile.ZipFile(archive) as source:
+        members = [
+            info for info in source.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith(IGNORED_PREFIXES)
+            and posixpath.basename(info.filename) not in IGNORED_NAMES
+        ]
+        roots = set(_question_roots([info.filename for info in members]))
+        by_root: Dict[str, List[zipfile.ZipInfo]] = {}
+        for info in members:
+            root = _root_of(info.filename, roots)
+            if root is None:
+                report.skipped.append(f"{info.filename}: not inside a question directory")
+            else:
+                by_root.setdefault(root, []).append(info)
+
+        for root in sorted(by_root):
+            files: Dict[str, str] = {}
+            for info in by_root[root]:
+                relative = posixpath.relpath(info.filename, root) if root else info.filename
+                relative = posixpath.normpath(relative)
+                if posixpath.isabs(relative) or relative.startswith(".."):
+                    # Such a name would escape the question directory wherever the files are written.
+                    report.skipped.append(f"{info.filename}: path outside its question directory")
+                    continue
+                if info.file_size > MAX_FILE_SIZE:
+                    report.skipped.append(f"{info.filename}: larger than {MAX_FILE_SIZE} bytes")
+                    continue
+                if info.flag_bits & 0x1:
+                    report.skipped.append(f"{info.filename}: encrypted")
+                    continue
+                try:
+                    content = source.read(info).decode("utf-8")
+                except NotImplementedError:
+                    report.skipped.append(f"{info.filename}: unsupported compression method")
+                    continue
+                except UnicodeDecodeError:
+                    report.skipped.append(f"{info.filename}: not UTF-8 text")
+                    continue
+                files[file_names.get(relative, relative)] = content
+            folder = _folder_from_info(root, files.get(file_names.get("info.json", "info.json")))
+            report.folders += 1
+            report.files += len(files)
+            yield folder, files
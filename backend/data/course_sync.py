@@ -0,0 +1,165 @@
+# data/course_sync.py
+"""
+Incremental export of a package into an on-disk PrairieLearn course tree.
+
+Each folder is written to `questions/<title>/` under the course directory with
+the same names as the flat module download (`question.html`, `server.js`,
+`info.json`, ...). A file is only rewritten when the SHA-256 of its new
+content differs from what is on disk, so a sync after a small change touches
+only the changed files and leaves the rest of the tree (and its timestamps)
+alone. Folders are written in parallel on a thread pool.
+
+Run from the repository root:
+    python -m backend.data.course_sync PACKAGE_ID COURSE_DIR [--workers N] [--prune]
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from . import question_models as service
+from .database import get_session_factory
+
+# Threads writing folders; file I/O and hashing release the GIL.
+SYNC_WORKERS = int(os.getenv("SYNC_WORKERS", min(8, (os.cpu_count() or 1) * 2)))
+# Bytes read at a time when hashing a file on disk.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SyncReport:
+    """Paths, relative to the course directory, that a sync wrote, left alone or removed."""
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def merge(self, other: "SyncReport") -> None:
+        self.written.extend(other.written)
+        self.unchanged.extend(other.unchanged)
+        self.removed.extend(other.removed)
+
+
+def file_sha256(path: str) -> Optional[str]:
+    """The hex SHA-256 of a file's bytes, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Readers of the course tree never see a half-written file.
+    fd, partial = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".sync-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.chmod(partial, 0o644)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+
+def _sync_folder(course_dir: str, directory: str, entries: List[Tuple[str, bytes]], prune: bool) -> SyncReport:
+    """Write one question directory, skipping files whose content hash already matches."""
+    report = SyncReport()
+    question_dir = os.path.join(course_dir, "questions", directory)
+    expected: Set[str] = set()
+    for name, data in entries:
+        relative = f"questions/{directory}/{name}"
+        path = os.path.normpath(os.path.join(course_dir, *relative.split("/")))
+        if not path.startswith(os.path.normpath(question_dir) + os.sep):
+            raise ValueError(f"File name {name!r} points outside its question directory")
+        expected.add(path)
+        if os.path.isfile(path) and os.path.getsize(path) == len(data) and file_sha256(path) == hashlib.sha256(data).hexdigest():
+            report.unchanged.append(relative)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, data)
+        report.written.append(relative)
+    if prune:
+        for root, _, names in os.walk(question_dir):
+            for name in names:
+                path = os.path.normpath(os.path.join(root, name))
+                if path not in expected:
+                    os.remove(path)
+                    report.removed.append(os.path.relpath(path, course_dir).replace(os.sep, "/"))
+    return report
+
+
+def sync_package(
+    package_id: int,
+    course_dir: str,
+    session_factory: Callable[[], Session] = get_session_factory(),
+    workers: int = SYNC_WORKERS,
+    prune: bool = False,
+) -> SyncReport:
+    """
+    Materialize a package into a PrairieLearn course directory, writing only changed files.
+
+    Folders are read in batches, as for module downloads, and each folder is
+    written on a pool of `workers` threads while later folders are read.
+
+    Args:
+        package_id (int): The package to export.
+        course_dir (str): The course root; questions go under `questions/`.
+        session_factory (Callable[[], Session]): Opens the session the package is read with.
+        workers (int): Threads writing folders in parallel.
+        prune (bool): Also delete files in the package's question directories
+            that the package no longer contains. Other directories are never touched.
+
+    Returns:
+        SyncReport: What was written, left unchanged and removed.
+
+    Raises:
+        HTTPException: If the package has no folders.
+    """
+    report = SyncReport()
+    directories: Set[str] = set()
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sync") as executor:
+        for folder, entries in service.module_folders(package_id, session_factory, course_names=True):
+            directory = service.question_directory(folder, directories)
+            pending.append(executor.submit(_sync_folder, course_dir, directory, entries, prune))
+            if len(pending) >= 2 * workers:
+                report.merge(pending.popleft().result())
+        while pending:
+            report.merge(pending.popleft().result())
+    if not directories:
+        raise HTTPException(status_code=404, detail="No folders found for this module.")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Sync a package into a PrairieLearn course directory.")
+    parser.add_argument("package_id", type=int)
+    parser.add_argument("course_dir")
+    parser.add_argument("--workers", type=int, default=SYNC_WORKERS)
+    parser.add_argument("--prune", action="store_true", help="delete files the package no longer has")
+    args = parser.parse_args(argv)
+
+    try:
+        report = sync_package(args.package_id, args.course_dir, workers=args.workers, prune=args.prune)
+    except HTTPException as exc:
+        parser.exit(1, f"{exc.detail}\n")
+    for path in report.written:
+        print(f"wrote   {path}")
+    for path in report.removed:
+        print(f"removed {path}")
+    print(f"{len(report.written)} written, {len(report.unchanged)} unchanged, {len(report.removed)} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,208 @@
 # data/database.py
 import os
-from typing import Generator
+from dataclasses import dataclass
+from typing import AsyncGenerator, Callable, Generator
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Set up the database file path.
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "database.db")
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=True)
+
+# Async drivers used for each sync dialect.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """
+    Engine configuration, read from the environment by `from_env`.
+
+    SQLite databases run in WAL mode with the pragmas below. Writes go through
+    writer engines, one for sync and one for async sessions, each holding a
+    single connection whose transactions take the write lock with BEGIN
+    IMMEDIATE. Writers on the same engine queue in its pool; the two engines
+    (and other processes) wait on each other for up to `sqlite_busy_timeout_ms`
+    before failing with "database is locked".
+    Postgres uses a regular connection pool sized by `pool_size` and `max_overflow`.
+    """
+    url: str = f"sqlite:///{DB_PATH}"
+    echo: bool = False
+    # Connection pool (Postgres, and SQLite readers).
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    # SQLite pragmas.
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size_kib: int = 64_000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        """Build settings from `DATABASE_URL` and the `DB_*` / `SQLITE_*` variables."""
+        return cls(
+            url=os.getenv("DATABASE_URL", cls.url),
+            echo=_env_bool("DB_ECHO", cls.echo),
+            pool_size=int(os.getenv("DB_POOL_SIZE", cls.pool_size)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", cls.max_overflow)),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", cls.pool_timeout)),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", cls.pool_recycle)),
+            sqlite_busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", cls.sqlite_busy_timeout_ms)),
+            sqlite_synchronous=os.getenv("SQLITE_SYNCHRONOUS", cls.sqlite_synchronous),
+            sqlite_cache_size_kib=int(os.getenv("SQLITE_CACHE_SIZE_KIB", cls.sqlite_cache_size_kib)),
+            sqlite_mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", cls.sqlite_mmap_size)),
+        )
+
+    @property
+    def is_sqlite(self) -> bool:
+        return make_url(self.url).get_backend_name() == "sqlite"
+
+    @property
+    def is_memory(self) -> bool:
+        return self.is_sqlite and make_url(self.url).database in (None, "", ":memory:")
+
+    @property
+    def async_url(self) -> str:
+        """The same database addressed through its async driver."""
+        url = make_url(self.url)
+        return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+            hide_password=False
+        )
+
+
+def _configure_sqlite(engine: Engine, settings: DatabaseSettings, writer: bool) -> None:
+    """
+    Apply the SQLite pragmas to every new connection of `engine`.
+
+    Writer connections start transactions with BEGIN IMMEDIATE, so the write lock
+    is taken up front rather than upgraded mid-transaction.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy, not the driver, decide when transactions begin.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
+
+
+def _engine_options(settings: DatabaseSettings, writer: bool) -> dict:
+    if settings.is_memory:
+        # In-memory SQLite uses a per-thread pool that takes no sizing options.
+        return {}
+    if settings.is_sqlite and writer:
+        # Single-writer discipline: one connection, callers wait for it in the pool.
+        return {"pool_size": 1, "max_overflow": 0, "pool_timeout": settings.pool_timeout}
+    return {
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_timeout": settings.pool_timeout,
+        "pool_recycle": settings.pool_recycle,
+        "pool_pre_ping": not settings.is_sqlite,
+    }
+
+
+def create_db_engine(settings: DatabaseSettings, writer: bool = False) -> Engine:
+    """
+    Create a sync engine for `settings`.
+
+    Args:
+        settings (DatabaseSettings): The engine configuration.
+        writer (bool): Build the SQLite single-writer engine instead of the pooled reader engine.
+
+    Returns:
+        Engine: The configured engine.
+    """
+    connect_args = {"check_same_thread": False} if settings.is_sqlite else {}
+    engine = create_engine(
+        settings.url, echo=settings.echo, connect_args=connect_args, **_engine_options(settings, writer)
+    )
+    if settings.is_sqlite:
+        _configure_sqlite(engine, settings, writer)
+    return engine
+
+
+def create_async_db_engine(settings: DatabaseSettings, writer: bool = False) -> AsyncEngine:
+    """
+    Create an async engine for `settings`, using the dialect's async driver.
+
+    Args:
+        settings (DatabaseSettings): The engine configuration.
+        writer (bool): Build the SQLite single-writer engine instead of the pooled reader engine.
+
+    Returns:
+        AsyncEngine: The configured engine.
+    """
+    async_engine = create_async_engine(
+        settings.async_url, echo=settings.echo, **_engine_options(settings, writer)
+    )
+    if settings.is_sqlite:
+        _configure_sqlite(async_engine.sync_engine, settings, writer)
+    return async_engine
+
+
+settings = DatabaseSettings.from_env()
+engine = create_db_engine(settings)
+async_engine = create_async_db_engine(settings)
+# Postgres handles concurrent writers itself, so only SQLite gets dedicated writer engines.
+write_engine = create_db_engine(settings, writer=True) if settings.is_sqlite else engine
+async_write_engine = create_async_db_engine(settings, writer=True) if settings.is_sqlite else async_engine
 
 # Create all tables at startup.
-SQLModel.metadata.create_all(engine)
+SQLModel.metadata.create_all(write_engine)
 
 def get_session() -> Generator[Session, None, None]:
     """Yield a SQLModel session."""
     with Session(engine) as session:
         yield session
+
+def get_write_session() -> Generator[Session, None, None]:
+    """Yield a SQLModel session bound to the writer engine."""
+    with Session(write_engine) as session:
+        yield session
+
+def get_session_factory() -> Callable[[], Session]:
+    """Return a factory of SQLModel sessions, for work that outlives the request's session.
+
+    Dependencies with `yield` are torn down before a streaming response is sent,
+    so response bodies that read the database open their own session from this.
+    """
+    return lambda: Session(engine)
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a SQLModel async session.
+
+    Attributes are not expired on commit, so returned rows can be serialized
+    after the transaction ends without issuing lazy I/O outside the event loop.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+async def get_async_write_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a SQLModel async session bound to the writer engine."""
+    async with AsyncSession(async_write_engine, expire_on_commit=False) as session:
+        yield session
@@ -1,68 +1,49 @@
 # data/generate_quiz_async.py
-import os
-import tempfile
 import asyncio
-import aiofiles
-from typing import Dict, Any
-from .question_models import get_package_files
-from ..data.helpers import read_file, format_question
-from ..processing.code_runners.code_runner import run_generate
+from typing import Optional
+from .async_question_models import get_package_files
+from .question_models import file_name_map
+from ..data.helpers import format_question
+from ..processing.code_runners.code_runner import SOURCE_GENERATORS, run_generate_source
 
-async def generate_quiz(module_id: int, session) -> str:
+async def generate_quiz(module_id: int, session, seed: Optional[int] = None) -> str:
     """
     Asynchronously generates a quiz for a given module.
 
-    This function retrieves file records for a module, writes them to a temporary
-    directory asynchronously, runs the generator file in a thread (since it is blocking),
-    and then formats the HTML question.
+    This function retrieves file records for a module and renders the question
+    straight from their stored contents: the generator source is handed to a
+    pooled code runner in a background thread (since it is blocking) and the
+    HTML question is formatted with its output. Nothing is written to disk.
 
     Args:
         module_id (int): Module identifier.
-        session: The database session.
+        session (AsyncSession): The async database session.
+        seed (Optional[int]): Seeds the generator for a reproducible quiz.
 
     Returns:
         str: The rendered HTML for the quiz question.
-    
+
     Raises:
         ValueError: If the required question file is missing.
     """
-    # Mapping from file type keys to file names.
-    question_name_map = {
-        "question_txt": "question.txt",
-        "question_html": "question.html",
-        "server_js": "server.js",
-        "server_py": "server.py",
-        "solution_html": "solution.html",
-        "metadata": "info.json",
-    }
-    # Retrieve files associated with the module in a thread to avoid blocking.
-    files = await asyncio.to_thread(get_package_files, module_id=module_id, session=session)
-    for f in files:
-        # Set the save name based on the map.
-        f.save_name = question_name_map.get(f.name, f.name)
-    
-    # Create a temporary directory for file operations.
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Write file contents to the temporary directory asynchronously.
-        for f in files:
-            filepath = os.path.join(tmpdir, f.save_name)
-            async with aiofiles.open(filepath, "w") as file:
-                await file.write(f.content)
-        
-        # Run the generator file in a background thread.
-        server_file = os.path.join(tmpdir, "server.js")
-        generated_data = await asyncio.to_thread(run_generate, server_file)
-        params = generated_data.get("params", {})
-        correct_answers = generated_data.get("correct_answers", {})
+    # Retrieve files associated with the module without blocking the event loop.
+    files = await get_package_files(package_id=module_id, session=session)
+    # File contents by download name, e.g. "question.html".
+    contents = {file_name_map.get(f.name, f.name): f.content for f in files}
+    html_content = contents.get("question.html")
+    if html_content is None:
+        raise ValueError("The module has no question.html file")
 
-        # Prepare the data payload for formatting.
-        data = {
-            "params": params,
-            "correct_answers": correct_answers,
-        }
-        # Read the question HTML file asynchronously via a thread.
-        question_html_path = os.path.join(tmpdir, "question.html")
-        html_content = await asyncio.to_thread(read_file, question_html_path)
-        # Format the question asynchronously in a thread.
-        rendered_question_html = await asyncio.to_thread(format_question, html=html_content, data=data)
-        return rendered_question_html
+    # Run the generator, server.js first as before, in a background thread.
+    generator = next((name for name in SOURCE_GENERATORS if contents.get(name)), None)
+    generated_data = {}
+    if generator is not None:
+        generated_data = await asyncio.to_thread(run_generate_source, generator, contents[generator], seed)
+
+    # Prepare the data payload for formatting.
+    data = {
+        "params": generated_data.get("params", {}),
+        "correct_answers": generated_data.get("correct_answers", {}),
+    }
+    # Format the question asynchronously in a thread.
+    return await asyncio.to_thread(format_question, html=html_content, data=data)
@@ -9,25 +9,272 @@ It provides functions for retrieving data, creating new records, and downloading
 # Standard Library Imports
 # ─────────────────────────────────────────────────────────────
 import os
+import re
+import sys
 import json
-import tempfile
+import base64
+import hashlib
+import mimetypes
+import threading
 import zipfile
-from io import BytesIO
-from typing import List, Tuple, Dict, Any, Optional
+from collections import defaultdict, deque
+from itertools import islice
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Tuple, Dict, Any, BinaryIO, Optional, Iterable, Iterator, Callable, Hashable, Type
 
 # ─────────────────────────────────────────────────────────────
 # Third-Party Imports
 # ─────────────────────────────────────────────────────────────
+import anyio
+from cachetools import TTLCache
 from fastapi import HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
-from sqlmodel import Session, select
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session, SQLModel, select
 
 # ─────────────────────────────────────────────────────────────
 # Internal App Imports
 # ─────────────────────────────────────────────────────────────
-from .database import engine
-from .helpers import create_zip_file
-from ..model.question_models import Package, QuestionFolder, QuestionFile
+from . import archive_cache, compression
+from .course_import import ImportReport, iter_questions
+from .conditional import cache_headers, is_not_modified, make_etag, not_modified
+from .database import engine, get_session_factory
+from .search import index_documents, search_document, unindex_package
+from .zip_stream import Entry, stream_zip
+from ..model.question_models import (
+    ArchiveLayout,
+    ArchiveMethod,
+    BatchResult,
+    FacetCount,
+    FacetPage,
+    FileBlob,
+    FolderLabel,
+    FolderTree,
+    ImportResult,
+    Package,
+    PackageTree,
+    QuestionFolder,
+    QuestionFile,
+    QuestionFileMeta,
+    PackagePage,
+    QuestionFolderPage,
+    utcnow,
+)
+
+# FolderLabel kinds.
+TOPIC = "topic"
+TAG = "tag"
+
+# ─────────────────────────────────────────────────────────────
+# Content Storage
+# ─────────────────────────────────────────────────────────────
+
+# Upper bound on bound parameters per IN (...) lookup, below SQLite's limit.
+LOOKUP_CHUNK_SIZE = 500
+
+def content_hash(content: str) -> str:
+    """
+    Compute the content address used for blob storage.
+
+    Args:
+        content (str): The file content.
+
+    Returns:
+        str: The hex SHA-256 digest of the UTF-8 encoded content.
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def _insert_blobs_statement(session: Session):
+    """Build an INSERT for FileBlob that skips contents another writer stored first."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(FileBlob).on_conflict_do_nothing(index_elements=["sha256"])
+    if dialect == "sqlite":
+        return sqlite.insert(FileBlob).on_conflict_do_nothing(index_elements=["sha256"])
+    return insert(FileBlob)
+
+def _blob_ids_by_hash(hashes: List[str], session: Session) -> Dict[str, int]:
+    ids = {}
+    for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+        chunk = hashes[start:start + LOOKUP_CHUNK_SIZE]
+        ids.update(session.exec(select(FileBlob.sha256, FileBlob.id).where(FileBlob.sha256.in_(chunk))).all())
+    return ids
+
+def store_blobs(contents: Iterable[str], session: Session) -> Dict[str, int]:
+    """
+    Make sure every content is stored as a blob, writing each distinct content once.
+
+    Contents that already have a blob are not written again. The caller commits.
+
+    Args:
+        contents (Iterable[str]): The file contents to store.
+        session (Session): A SQLModel session.
+
+    Returns:
+        Dict[str, int]: A mapping from content hash to blob ID.
+    """
+    by_hash = {content_hash(content): content for content in contents}
+    ids = _blob_ids_by_hash(list(by_hash), session)
+    missing = [sha for sha in by_hash if sha not in ids]
+    if missing:
+        session.execute(_insert_blobs_statement(session), [_blob_row(sha, by_hash[sha]) for sha in missing])
+        ids.update(_blob_ids_by_hash(missing, session))
+    return ids
+
+def _blob_row(sha: str, content: str) -> Dict[str, Any]:
+    """Encode a content for storage according to the configured compression."""
+    encoding, data = compression.compress(content, compression.settings)
+    row = {"sha256": sha, "size": len(content.encode("utf-8")), "encoding": encoding}
+    if encoding == compression.IDENTITY:
+        row.update(content=content, data=None)
+    else:
+        row.update(content=None, data=data)
+    return row
+
+def blob_text(blob: FileBlob) -> str:
+    """
+    Return the decoded text of a blob, whichever encoding it was stored with.
+
+    Args:
+        blob (FileBlob): The stored blob.
+
+    Returns:
+        str: The file content.
+    """
+    if blob.encoding == compression.IDENTITY:
+        return blob.content
+    return compression.decompress(blob.encoding, blob.data)
+
+def _attach_blobs(files: List[QuestionFile], session: Session) -> None:
+    """Move the inline content of unsaved files into blobs."""
+    pending = [file for file in files if file.content is not None]
+    ids = store_blobs((file.content for file in pending), session)
+    for file in pending:
+        file.blob_id = ids[content_hash(file.content)]
+        file.content = None
+
+def _with_contents(files: List[QuestionFile]) -> List[QuestionFile]:
+    """
+    Fill in `content` on blob-backed files, so callers see the same API as inline rows.
+
+    The value is set as already persisted, so it is never written back to the file row.
+    """
+    for file in files:
+        if file.blob is not None:
+            set_committed_value(file, "content", blob_text(file.blob))
+    return files
+
+# ─────────────────────────────────────────────────────────────
+# Read Cache
+# ─────────────────────────────────────────────────────────────
+
+_MISSING = object()
+
+class ReadCache:
+    """
+    Bounded LRU cache with a time-to-live for package, folder and file lookups.
+
+    Keys are tuples of (lookup name, package id, ...). Entries hold plain column
+    values, and every call, hit or miss, returns fresh detached model instances
+    built from them, so callers always get the same kind of object and no ORM
+    object is shared between sessions; relationships such as `QuestionFile.blob`
+    are not loaded. Writes made through this module drop the entries of the
+    package they touch once committed, and lookups that began before a write do
+    not store their result. Writes made elsewhere, such as by another worker
+    process, show up once the entry's TTL expires; responses that carry an ETag
+    therefore validate against the database, not this cache. The cache is bounded
+    by the approximate bytes its entries hold. A size or TTL of 0 disables caching.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.enabled = max_bytes > 0 and ttl > 0
+        self._cache = TTLCache(maxsize=max(max_bytes, 1), ttl=max(ttl, 1), getsizeof=_stored_size)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any], model: Optional[Type[SQLModel]] = None) -> Any:
+        """
+        Return the cached value for `key`, or call `load` and cache its result.
+
+        Args:
+            key (Hashable): The lookup name, package id and remaining arguments.
+            load (Callable[[], Any]): Runs the lookup against the database.
+            model (Optional[Type[SQLModel]]): The model of the result, or of its items if it
+                is a list. Results without one are cached as-is and must be immutable.
+
+        Returns:
+            Any: The lookup result, as detached `model` instances when a model is given.
+        """
+        if not self.enabled:
+            return load()
+        with self._lock:
+            stored = self._cache.get(key, _MISSING)
+            if stored is _MISSING:
+                self.misses += 1
+                generation = self._generation
+            else:
+                self.hits += 1
+        if stored is _MISSING:
+            stored = _dump(load(), model)
+            with self._lock:
+                if generation == self._generation:
+                    try:
+                        self._cache[key] = stored
+                    except ValueError:
+                        pass  # Larger than the whole cache.
+        return _restore(stored, model)
+
+    def invalidate_package(self, package_id: Optional[int]) -> None:
+        """Drop every entry for `package_id` and discard lookups still in flight."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._cache.keys() if key[1] == package_id]:
+                self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters, the current number of entries and their approximate bytes."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "bytes": self._cache.currsize}
+
+def _stored_size(stored: Any) -> int:
+    """Approximate bytes held by a cached value; dict keys are field names shared between entries."""
+    size = sys.getsizeof(stored)
+    if isinstance(stored, dict):
+        size += sum(_stored_size(value) for value in stored.values())
+    elif isinstance(stored, (tuple, list)):
+        size += sum(_stored_size(item) for item in stored)
+    return size
+
+def _dump(value: Any, model: Optional[Type[SQLModel]]) -> Any:
+    if model is None:
+        return value
+    if isinstance(value, list):
+        return tuple(item.model_dump() for item in value)
+    return value.model_dump()
+
+def _restore(stored: Any, model: Optional[Type[SQLModel]]) -> Any:
+    if model is None:
+        return stored
+    if isinstance(stored, tuple):
+        return [model.model_validate(item) for item in stored]
+    return model.model_validate(stored)
+
+read_cache = ReadCache(
+    max_bytes=int(os.getenv("READ_CACHE_BYTES", 64 * 1024 * 1024)),
+    ttl=float(os.getenv("READ_CACHE_TTL", 300)),
+)
 
 # ─────────────────────────────────────────────────────────────
 # CRUD Service Functions
@@ -36,6 +283,8 @@ from ..model.question_models import Package, QuestionFolder, QuestionFile
 def get_package_folders(package_id: int, session: Session = None) -> List[QuestionFolder]:
     """
     Retrieve all question folders associated with a specific package.
+
+    Results are served from `read_cache` when possible.
     
     Args:
         package_id (int): The ID of the package.
@@ -47,18 +296,23 @@ def get_package_folders(package_id: int, session: Session = None) -> List[Questi
     Raises:
         HTTPException: If the package does not exist or no folders are found.
     """
-    package = session.get(Package, package_id)
-    if not package:
-        raise HTTPException(status_code=404, detail="Package not found")
-    folders = session.query(QuestionFolder).filter_by(package_id=package_id).all()
-    if not folders:
-        raise HTTPException(status_code=404, detail="Question folders not found")
-    return folders
+    def load():
+        package = session.get(Package, package_id)
+        if not package:
+            raise HTTPException(status_code=404, detail="Package not found")
+        folders = session.query(QuestionFolder).filter_by(package_id=package_id).all()
+        if not folders:
+            raise HTTPException(status_code=404, detail="Question folders not found")
+        return folders
+
+    return read_cache.get_or_load(("package_folders", package_id), load, QuestionFolder)
 
 def get_folder_files(package_id: int, folder_id: int, session: Session = None) -> List[QuestionFile]:
     """
     Retrieve all question files within a specific folder of a package.
 
+    Results are served from `read_cache` when possible.
+
     Args:
         package_id (int): The package's ID.
         folder_id (int): The folder's ID.
@@ -70,11 +324,19 @@ def get_folder_files(package_id: int, folder_id: int, session: Session = None) -
     Raises:
         HTTPException: If the folder is not found.
     """
-    get_package_folders(package_id=package_id, session=session)  # Ensures the package exists
-    folder = session.query(QuestionFolder).filter_by(id=folder_id).first()
-    if not folder:
-        raise HTTPException(status_code=404, detail="Question folder not found")
-    return folder.question_files
+    def load():
+        get_package_by_id(package_id, session)  # Ensures the package exists
+        folder = (
+            session.query(QuestionFolder)
+            .options(selectinload(QuestionFolder.question_files))
+            .filter_by(id=folder_id, package_id=package_id)
+            .first()
+        )
+        if not folder:
+            raise HTTPException(status_code=404, detail="Question folder not found")
+        return _with_contents(folder.question_files)
+
+    return read_cache.get_or_load(("folder_files", package_id, folder_id), load, QuestionFile)
 
 def get_all_question_folders(skip: int = 0, limit: int = 10, session: Session = None) -> List[QuestionFolder]:
     """
@@ -90,10 +352,175 @@ def get_all_question_folders(skip: int = 0, limit: int = 10, session: Session =
     """
     return session.exec(select(QuestionFolder).offset(skip).limit(limit)).all()
 
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the ID of the last row on a page as an opaque pagination cursor.
+
+    Args:
+        last_id (int): The ID of the last row returned.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    return base64.urlsafe_b64encode(json.dumps({"after": last_id}).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Decode a pagination cursor back into the ID to resume after.
+
+    Args:
+        cursor (Optional[str]): A cursor produced by `encode_cursor`, or None for the first page.
+
+    Returns:
+        int: The ID to resume after (0 for the first page).
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    if not cursor:
+        return 0
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(after, int):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return after
+
+def _keyset_page(statement, id_column, cursor: Optional[str], limit: int, session: Session):
+    """
+    Run a listing query as one keyset page ordered by `id_column`.
+
+    One extra row is fetched to tell whether another page follows.
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: The rows on the page and the cursor for the next one.
+    """
+    statement = statement.where(id_column > decode_cursor(cursor)).order_by(id_column).limit(limit + 1)
+    rows = session.exec(statement).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].id)
+    return rows, None
+
+def get_packages_page(cursor: Optional[str] = None, limit: int = 10, session: Session = None) -> PackagePage:
+    """
+    Retrieve a page of packages using keyset pagination on the package ID.
+
+    Args:
+        cursor (Optional[str]): The `next_cursor` from the previous page, or None for the first page.
+        limit (int): The maximum number of packages to return.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        PackagePage: The packages on this page and the cursor for the next page, if any.
+    """
+    items, next_cursor = _keyset_page(select(Package), Package.id, cursor, limit, session)
+    return PackagePage(items=items, next_cursor=next_cursor)
+
+def get_question_folders_page(
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    package_id: Optional[int] = None,
+    is_adaptive: Optional[bool] = None,
+    reviewed: Optional[bool] = None,
+    session: Session = None,
+) -> QuestionFolderPage:
+    """
+    Retrieve a page of question folders using keyset pagination on the folder ID.
+
+    Filters are plain equality predicates next to the ID range, so an index on the
+    filtered column lets the database seek straight to the first row after the cursor.
+
+    Args:
+        cursor (Optional[str]): The `next_cursor` from the previous page, or None for the first page.
+        limit (int): The maximum number of folders to return.
+        package_id (Optional[int]): Only return folders belonging to this package.
+        is_adaptive (Optional[bool]): Only return folders with this adaptive flag.
+        reviewed (Optional[bool]): Only return folders with this review status.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        QuestionFolderPage: The folders on this page and the cursor for the next page, if any.
+    """
+    statement = select(QuestionFolder).where(*_folder_filters(package_id, is_adaptive, reviewed))
+    items, next_cursor = _keyset_page(statement, QuestionFolder.id, cursor, limit, session)
+    return QuestionFolderPage(items=items, next_cursor=next_cursor)
+
+def _folder_filters(
+    package_id: Optional[int] = None,
+    is_adaptive: Optional[bool] = None,
+    reviewed: Optional[bool] = None,
+    topics: Iterable[str] = (),
+    tags: Iterable[str] = (),
+) -> List[Any]:
+    """
+    Build WHERE clauses selecting question folders.
+
+    Topic and tag filters are resolved through the indexed FolderLabel table
+    rather than the JSON columns; a folder must carry every requested value.
+    """
+    clauses = []
+    if package_id is not None:
+        clauses.append(QuestionFolder.package_id == package_id)
+    if is_adaptive is not None:
+        clauses.append(QuestionFolder.is_adaptive == is_adaptive)
+    if reviewed is not None:
+        clauses.append(QuestionFolder.reviewed == reviewed)
+    for kind, values in ((TOPIC, topics), (TAG, tags)):
+        for value in values:
+            clauses.append(
+                QuestionFolder.id.in_(
+                    select(FolderLabel.question_folder_id).where(FolderLabel.kind == kind, FolderLabel.value == value)
+                )
+            )
+    return clauses
+
+def get_facets(
+    topics: Iterable[str] = (),
+    tags: Iterable[str] = (),
+    is_adaptive: Optional[bool] = None,
+    reviewed: Optional[bool] = None,
+    package_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    session: Session = None,
+) -> FacetPage:
+    """
+    Count topics and tags over the folders matching the filters, and page through those folders.
+
+    Args:
+        topics (Iterable[str]): Only include folders with every one of these topics.
+        tags (Iterable[str]): Only include folders with every one of these tags.
+        is_adaptive (Optional[bool]): Only include folders with this adaptive flag.
+        reviewed (Optional[bool]): Only include folders with this review status.
+        package_id (Optional[int]): Only include folders belonging to this package.
+        cursor (Optional[str]): The `next_cursor` from the previous page of folders.
+        limit (int): The maximum number of folders to return.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        FacetPage: Per-value counts, most common first, and a keyset page of matching folders.
+    """
+    filters = _folder_filters(package_id, is_adaptive, reviewed, topics, tags)
+    counts = select(FolderLabel.kind, FolderLabel.value, func.count().label("count"))
+    if filters:
+        counts = counts.where(FolderLabel.question_folder_id.in_(select(QuestionFolder.id).where(*filters)))
+    counts = counts.group_by(FolderLabel.kind, FolderLabel.value).order_by(
+        func.count().desc(), FolderLabel.value
+    )
+    facets = {TOPIC: [], TAG: []}
+    for kind, value, count in session.exec(counts).all():
+        facets[kind].append(FacetCount(value=value, count=count))
+    items, next_cursor = _keyset_page(select(QuestionFolder).where(*filters), QuestionFolder.id, cursor, limit, session)
+    return FacetPage(topics=facets[TOPIC], tags=facets[TAG], items=items, next_cursor=next_cursor)
+
 def get_package_by_id(package_id: int, session: Session = None) -> Package:
     """
     Retrieve a specific package by its ID.
 
+    Results are served from `read_cache` when possible.
+
     Args:
         package_id (int): The ID of the package.
         session (Session, optional): A SQLModel session.
@@ -104,10 +531,13 @@ def get_package_by_id(package_id: int, session: Session = None) -> Package:
     Raises:
         HTTPException: If the package is not found.
     """
-    package = session.get(Package, package_id)
-    if not package:
-        raise HTTPException(status_code=404, detail="Package not found")
-    return package
+    def load():
+        package = session.get(Package, package_id)
+        if not package:
+            raise HTTPException(status_code=404, detail="Package not found")
+        return package
+
+    return read_cache.get_or_load(("package", package_id), load, Package)
 
 def get_package_folder(package_id: int, session: Session = None) -> QuestionFolder:
     """
@@ -142,10 +572,164 @@ def get_package_files(package_id: int, session: Session) -> List[QuestionFile]:
     Raises:
         HTTPException: If no folder is found for the package.
     """
-    folder = session.query(QuestionFolder).filter_by(package_id=package_id).first()
+    folder = (
+        session.query(QuestionFolder)
+        .options(selectinload(QuestionFolder.question_files))
+        .filter_by(package_id=package_id)
+        .first()
+    )
     if not folder:
         raise HTTPException(status_code=404, detail="Question folder not found")
-    return folder.question_files
+    return _with_contents(folder.question_files)
+
+def _file_meta(where: Any, session: Session) -> List[QuestionFileMeta]:
+    """Select file metadata matching `where`, without reading any content column."""
+    statement = (
+        select(
+            QuestionFile.id,
+            QuestionFile.name,
+            QuestionFile.save_name,
+            QuestionFile.question_folder_id,
+            func.coalesce(FileBlob.size, 0).label("size"),
+            FileBlob.sha256,
+        )
+        .outerjoin(FileBlob, QuestionFile.blob_id == FileBlob.id)
+        .where(where)
+        .order_by(QuestionFile.id)
+    )
+    return [QuestionFileMeta.model_validate(row._mapping) for row in session.exec(statement)]
+
+def get_folder_file_meta(package_id: int, folder_id: int, session: Session = None) -> List[QuestionFileMeta]:
+    """
+    List the files of a specific folder within a package, without their content.
+
+    Args:
+        package_id (int): The package's ID.
+        folder_id (int): The folder's ID.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        List[QuestionFileMeta]: The folder's file metadata, in creation order.
+
+    Raises:
+        HTTPException: If the folder is not found in the package.
+    """
+    files = _file_meta(
+        QuestionFile.question_folder_id.in_(
+            select(QuestionFolder.id).where(QuestionFolder.id == folder_id, QuestionFolder.package_id == package_id)
+        ),
+        session,
+    )
+    if not files:
+        # Tell an empty folder apart from a missing one.
+        folder = session.get(QuestionFolder, folder_id)
+        if not folder or folder.package_id != package_id:
+            raise HTTPException(status_code=404, detail="Question folder not found")
+    return files
+
+def get_package_file_meta(package_id: int, session: Session) -> List[QuestionFileMeta]:
+    """
+    List the files of the first folder of a package, without their content.
+
+    Args:
+        package_id (int): The package's ID.
+        session (Session): A SQLModel session.
+
+    Returns:
+        List[QuestionFileMeta]: The folder's file metadata, in creation order.
+
+    Raises:
+        HTTPException: If no folder is found for the package.
+    """
+    folder = get_package_folder(package_id, session)
+    return _file_meta(QuestionFile.question_folder_id == folder.id, session)
+
+# Upper bound on the ids of each kind accepted by one batch request.
+MAX_BATCH_IDS = 100
+
+def _folder_trees(folders: List[QuestionFolder], files_where: Any, session: Session) -> List[FolderTree]:
+    """Attach the metadata of the files matching `files_where` to their folders, in one query."""
+    files_by_folder = defaultdict(list)
+    if folders:
+        for meta in _file_meta(files_where, session):
+            files_by_folder[meta.question_folder_id].append(meta)
+    return [FolderTree(folder=folder, files=files_by_folder[folder.id]) for folder in folders]
+
+def get_package_tree(package_id: int, session: Session = None) -> PackageTree:
+    """
+    Retrieve a package with all of its folders and their file metadata.
+
+    Runs three queries whatever the size of the package, and reads no file content.
+
+    Args:
+        package_id (int): The ID of the package.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        PackageTree: The package, its folders in creation order, and each folder's files.
+
+    Raises:
+        HTTPException: If the package is not found.
+    """
+    package = session.get(Package, package_id)
+    if not package:
+        raise HTTPException(status_code=404, detail="Package not found")
+    folder_ids = select(QuestionFolder.id).where(QuestionFolder.package_id == package_id)
+    folders = session.exec(
+        select(QuestionFolder).where(QuestionFolder.package_id == package_id).order_by(QuestionFolder.id)
+    ).all()
+    return PackageTree(
+        package=package,
+        folders=_folder_trees(folders, QuestionFile.question_folder_id.in_(folder_ids), session),
+    )
+
+def get_batch(
+    folder_ids: Iterable[int] = (),
+    file_ids: Iterable[int] = (),
+    include_content: bool = False,
+    session: Session = None,
+) -> BatchResult:
+    """
+    Retrieve several folders, with their file metadata, and several files by id.
+
+    Runs at most four queries, however many ids are given.
+
+    Args:
+        folder_ids (Iterable[int]): The IDs of the folders to fetch.
+        file_ids (Iterable[int]): The IDs of the files to fetch.
+        include_content (bool): Also return the content of the requested files.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        BatchResult: The folders and files found, in the order requested.
+
+    Raises:
+        HTTPException: If more than `MAX_BATCH_IDS` ids of either kind are requested.
+    """
+    folder_ids = list(dict.fromkeys(folder_ids))
+    file_ids = list(dict.fromkeys(file_ids))
+    if len(folder_ids) > MAX_BATCH_IDS or len(file_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids of each kind per batch")
+
+    folders = []
+    if folder_ids:
+        statement = select(QuestionFolder).where(QuestionFolder.id.in_(folder_ids))
+        found = {folder.id: folder for folder in session.exec(statement)}
+        folders = [found[folder_id] for folder_id in folder_ids if folder_id in found]
+
+    files, contents = [], {}
+    if file_ids:
+        found = {meta.id: meta for meta in _file_meta(QuestionFile.id.in_(file_ids), session)}
+        files = [found[file_id] for file_id in file_ids if file_id in found]
+        if include_content and files:
+            stored = session.query(QuestionFile).filter(QuestionFile.id.in_(list(found))).all()
+            contents = {file.id: file.content for file in _with_contents(stored)}
+
+    return BatchResult(
+        folders=_folder_trees(folders, QuestionFile.question_folder_id.in_([folder.id for folder in folders]), session),
+        files=files,
+        contents=contents,
+    )
 
 def get_packages(skip: int = 0, limit: int = 10, session: Session = None) -> List[Package]:
     """
@@ -161,21 +745,69 @@ def get_packages(skip: int = 0, limit: int = 10, session: Session = None) -> Lis
     """
     return session.exec(select(Package).offset(skip).limit(limit)).all()
 
-def get_single_file(package_id: int, file_id: int, session: Session) -> str:
+def serve_packages(
+    skip: int = 0,
+    limit: int = 10,
+    if_none_match: str = "",
+    if_modified_since: str = "",
+    session: Session = None,
+) -> Response:
     """
-    Retrieve the content of a specific question file within a package.
+    Build a conditional response listing packages with pagination.
+
+    The ETag covers the id and version of every listed package, so any write
+    to one of them, or a package entering or leaving the page, changes it.
+
+    Args:
+        skip (int): The number of records to skip.
+        limit (int): The maximum number of records to retrieve.
+        if_none_match (str): The request's If-None-Match header value.
+        if_modified_since (str): The request's If-Modified-Since header value.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        Response: The packages as JSON, or an empty 304 if the client's copy is current.
+    """
+    packages = get_packages(skip, limit, session)
+    etag = make_etag("packages", skip, limit, *[(package.id, package.version) for package in packages])
+    last_modified = max((package.updated_at for package in packages), default=None)
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(etag, last_modified, if_none_match, if_modified_since):
+        return not_modified(headers)
+    return JSONResponse(jsonable_encoder(packages), headers=headers)
+
+def serve_package(
+    package_id: int,
+    if_none_match: str = "",
+    if_modified_since: str = "",
+    session: Session = None,
+) -> Response:
+    """
+    Build a conditional response carrying a specific package.
 
     Args:
         package_id (int): The ID of the package.
-        file_id (int): The ID of the file.
-        session (Session): A SQLModel session.
+        if_none_match (str): The request's If-None-Match header value.
+        if_modified_since (str): The request's If-Modified-Since header value.
+        session (Session, optional): A SQLModel session.
 
     Returns:
-        str: The file content.
+        Response: The package as JSON, or an empty 304 if the client's copy is current.
 
     Raises:
-        HTTPException: If the file is not found.
+        HTTPException: If the package is not found.
     """
+    # Read past `read_cache`, so the validators are never stale.
+    package = session.get(Package, package_id)
+    if not package:
+        raise HTTPException(status_code=404, detail="Package not found")
+    etag = make_etag("package", package.id, package.version)
+    headers = cache_headers(etag, package.updated_at)
+    if is_not_modified(etag, package.updated_at, if_none_match, if_modified_since):
+        return not_modified(headers)
+    return JSONResponse(jsonable_encoder(package), headers=headers)
+
+def _get_package_file(package_id: int, file_id: int, session: Session) -> QuestionFile:
     file = (
         session.query(QuestionFile)
         .join(QuestionFolder, QuestionFile.question_folder_id == QuestionFolder.id)
@@ -184,7 +816,170 @@ def get_single_file(package_id: int, file_id: int, session: Session) -> str:
     )
     if not file:
         raise HTTPException(status_code=404, detail="Question file not found in this package")
-    return file.content
+    return file
+
+def get_single_file(package_id: int, file_id: int, session: Session) -> str:
+    """
+    Retrieve the content of a specific question file within a package.
+
+    Results are served from `read_cache` when possible.
+
+    Args:
+        package_id (int): The ID of the package.
+        file_id (int): The ID of the file.
+        session (Session): A SQLModel session.
+
+    Returns:
+        str: The file content.
+
+    Raises:
+        HTTPException: If the file is not found.
+    """
+    def load():
+        file = _get_package_file(package_id, file_id, session)
+        return _with_contents([file])[0].content
+
+    return read_cache.get_or_load(("file", package_id, file_id), load)
+
+def _file_validators(package_id: int, file_id: int, session: Session) -> Tuple[str, str, Optional[str], str, datetime]:
+    """Look up a package file's names, blob hash and encoding, and its package's update time, without its content."""
+    row = session.exec(
+        select(
+            QuestionFile.name,
+            QuestionFile.save_name,
+            FileBlob.sha256,
+            FileBlob.encoding,
+            Package.updated_at,
+        )
+        .join(QuestionFolder, QuestionFile.question_folder_id == QuestionFolder.id)
+        .join(Package, QuestionFolder.package_id == Package.id)
+        .outerjoin(FileBlob, QuestionFile.blob_id == FileBlob.id)
+        .where(QuestionFile.id == file_id, QuestionFolder.package_id == package_id)
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Question file not found in this package")
+    return tuple(row)
+
+def serve_single_file(
+    package_id: int,
+    file_id: int,
+    accept_encoding: str = "",
+    if_none_match: str = "",
+    if_modified_since: str = "",
+    session: Session = None,
+) -> Response:
+    """
+    Build a conditional response carrying the content of a specific question file within a package.
+
+    If the file is stored compressed and the client accepts that content coding,
+    the stored bytes are sent as-is with a `Content-Encoding` header instead of
+    being decompressed. The ETag is the content's SHA-256, suffixed with the
+    content coding when one is applied, so a client holding the current version
+    gets a 304 without the content being read.
+
+    Args:
+        package_id (int): The ID of the package.
+        file_id (int): The ID of the file.
+        accept_encoding (str): The request's Accept-Encoding header value.
+        if_none_match (str): The request's If-None-Match header value.
+        if_modified_since (str): The request's If-Modified-Since header value.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        Response: The file content, typed from the file's download name, or an empty 304.
+
+    Raises:
+        HTTPException: If the file is not found.
+    """
+    name, save_name, sha, encoding, updated_at = _file_validators(package_id, file_id, session)
+    encoded = (
+        encoding is not None
+        and encoding != compression.IDENTITY
+        and compression.accepts_encoding(accept_encoding, encoding)
+    )
+    if sha is None:
+        # Inline content from before blob storage; hash it to build the validator.
+        sha = content_hash(_get_package_file(package_id, file_id, session).content)
+    etag = f'"{sha}.{encoding}"' if encoded else f'"{sha}"'
+    headers = {"Vary": "Accept-Encoding", **cache_headers(etag, updated_at)}
+    if is_not_modified(etag, updated_at, if_none_match, if_modified_since):
+        return not_modified(headers)
+
+    file = _get_package_file(package_id, file_id, session)
+    media_type = mimetypes.guess_type(file_name_map.get(name, save_name))[0] or "text/plain"
+    if encoded:
+        headers["Content-Encoding"] = encoding
+        return Response(content=file.blob.data, media_type=media_type, headers=headers)
+    return Response(content=_with_contents([file])[0].content, media_type=media_type, headers=headers)
+
+def _invalidate_package(package_id: Optional[int]) -> None:
+    """Drop cached reads and archives of a package after a committed write to it."""
+    read_cache.invalidate_package(package_id)
+    archive_cache.cache.invalidate_package(package_id)
+
+def _touch_package(package_id: Optional[int], session: Session) -> None:
+    """Bump a package's version and update time after a write to it; the caller commits."""
+    if package_id is None:
+        return
+    session.execute(
+        update(Package)
+        .where(Package.id == package_id)
+        .values(version=Package.version + 1, updated_at=utcnow())
+    )
+
+def _delete_package(package_id: int, session: Session) -> None:
+    """Delete a package with its folders, files, labels and search rows, and commit."""
+    folder_ids = select(QuestionFolder.id).where(QuestionFolder.package_id == package_id)
+    unindex_package(package_id, session)
+    session.execute(delete(FolderLabel).where(FolderLabel.question_folder_id.in_(folder_ids)))
+    session.execute(delete(QuestionFile).where(QuestionFile.question_folder_id.in_(folder_ids)))
+    session.execute(delete(QuestionFolder).where(QuestionFolder.package_id == package_id))
+    session.execute(delete(Package).where(Package.id == package_id))
+    session.commit()
+    _invalidate_package(package_id)
+
+def _label_rows(folder_id: int, topic: Optional[List[str]], tags: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Build the FolderLabel rows for a folder's topics and tags."""
+    return [
+        {"question_folder_id": folder_id, "kind": kind, "value": value}
+        for kind, values in ((TOPIC, topic), (TAG, tags))
+        for value in dict.fromkeys(values or [])
+    ]
+
+def _store_labels(rows: List[Dict[str, Any]], session: Session) -> None:
+    if rows:
+        session.execute(insert(FolderLabel), rows)
+
+def _reindex_folder(folder_id: int, session: Session) -> None:
+    """Rebuild the search row of an existing folder from its stored files."""
+    folder = session.get(QuestionFolder, folder_id)
+    if folder is None:
+        return
+    files = _with_contents(session.exec(select(QuestionFile).where(QuestionFile.question_folder_id == folder_id)).all())
+    index_documents(
+        [search_document(folder.id, folder.title, folder.topic, folder.tags, (file.content for file in files))],
+        session,
+    )
+
+def _build_files(data: Any) -> List[QuestionFile]:
+    """
+    Convert a mapping of file names to contents into unsaved QuestionFile records.
+
+    Args:
+        data (Any): A dictionary (or pydantic model) mapping file names to file contents.
+            Dictionary contents are serialized to JSON.
+
+    Returns:
+        List[QuestionFile]: The question files, not yet attached to a folder.
+    """
+    if not isinstance(data, dict):
+        data = data.dict()
+    files = []
+    for filename, contents in data.items():
+        if isinstance(contents, dict):
+            contents = json.dumps(contents)
+        files.append(QuestionFile(name=filename, content=contents, save_name=filename))
+    return files
 
 def create_file(file: QuestionFile, session: Session) -> QuestionFile:
     """
@@ -197,15 +992,27 @@ def create_file(file: QuestionFile, session: Session) -> QuestionFile:
     Returns:
         QuestionFile: The created question file with an assigned ID.
     """
+    _attach_blobs([file], session)
     session.add(file)
+    session.flush()
+    package_id = None
+    if file.question_folder_id is not None:
+        _reindex_folder(file.question_folder_id, session)
+        package_id = session.exec(
+            select(QuestionFolder.package_id).where(QuestionFolder.id == file.question_folder_id)
+        ).first()
+        _touch_package(package_id, session)
     session.commit()
+    _invalidate_package(package_id)
     session.refresh(file)
-    return file
+    return _with_contents([file])[0]
 
 def create_folder(folder: QuestionFolder, data: Dict[str, Any], session: Session) -> QuestionFolder:
     """
     Create a new question folder and its associated question files.
 
+    The folder and all of its files are written in a single transaction.
+
     Args:
         folder (QuestionFolder): The folder to create.
         data (Dict[str, Any]): A dictionary mapping file names to file contents.
@@ -214,18 +1021,107 @@ def create_folder(folder: QuestionFolder, data: Dict[str, Any], session: Session
     Returns:
         QuestionFolder: The created question folder.
     """
+    folder.question_files = _build_files(data)
+    contents = [file.content for file in folder.question_files]
+    _attach_blobs(folder.question_files, session)
     session.add(folder)
+    session.flush()
+    index_documents([search_document(folder.id, folder.title, folder.topic, folder.tags, contents)], session)
+    _store_labels(_label_rows(folder.id, folder.topic, folder.tags), session)
+    _touch_package(folder.package_id, session)
     session.commit()
+    _invalidate_package(folder.package_id)
     session.refresh(folder)
-    if not isinstance(data, dict):
-        data = data.dict()
-    for filename, contents in data.items():
-        if isinstance(contents, dict):
-            contents = json.dumps(contents)
-        file = QuestionFile(name=filename, content=contents, save_name=filename, question_folder_id=folder.id)
-        create_file(file, session)
     return folder
 
+def _insert_folders(
+    package_id: int,
+    folders: List[Tuple[QuestionFolder, Dict[str, Any]]],
+    session: Session,
+) -> List[int]:
+    """
+    Insert folders and their files into a package with one batched INSERT per table.
+
+    Labels and the search index are written alongside; the caller commits.
+
+    Args:
+        package_id (int): The package the folders belong to.
+        folders (List[Tuple[QuestionFolder, Dict[str, Any]]]): Unsaved folders paired with their file data.
+        session (Session): A SQLModel session on the writer engine.
+
+    Returns:
+        List[int]: The new folder ids, in the order of `folders`.
+    """
+    if not folders:
+        return []
+    folder_rows = [
+        {**folder.model_dump(exclude={"id"}), "package_id": package_id}
+        for folder, _ in folders
+    ]
+    # The ids come back from the INSERT itself, in the order of the rows, whatever else writes to the package.
+    folder_ids = session.scalars(
+        insert(QuestionFolder).returning(QuestionFolder.id, sort_by_parameter_order=True),
+        folder_rows,
+    ).all()
+    file_rows = [
+        {**file.model_dump(exclude={"id"}), "question_folder_id": folder_id}
+        for folder_id, (_, files_content) in zip(folder_ids, folders)
+        for file in _build_files(files_content)
+    ]
+    _store_labels(
+        [
+            label
+            for folder_id, row in zip(folder_ids, folder_rows)
+            for label in _label_rows(folder_id, row["topic"], row["tags"])
+        ],
+        session,
+    )
+    contents_by_folder = defaultdict(list)
+    for row in file_rows:
+        contents_by_folder[row["question_folder_id"]].append(row["content"])
+    index_documents(
+        [
+            search_document(folder_id, row["title"], row["topic"], row["tags"], contents_by_folder[folder_id])
+            for folder_id, row in zip(folder_ids, folder_rows)
+        ],
+        session,
+    )
+    blob_ids = store_blobs((row["content"] for row in file_rows if row["content"] is not None), session)
+    for row in file_rows:
+        if row["content"] is not None:
+            row["blob_id"] = blob_ids[content_hash(row["content"])]
+            row["content"] = None
+    if file_rows:
+        session.execute(insert(QuestionFile), file_rows)
+    return list(folder_ids)
+
+def bulk_create_package(
+    package: Package,
+    folders: List[Tuple[QuestionFolder, Dict[str, Any]]],
+    session: Session
+) -> Package:
+    """
+    Persist a package, its question folders and all of their files in one transaction.
+
+    Folders and files are written with one batched INSERT per table rather than one
+    statement per row. Only a single commit is issued and no rows are refreshed afterwards.
+
+    Args:
+        package (Package): The package to create.
+        folders (List[Tuple[QuestionFolder, Dict[str, Any]]]): A list of tuples pairing an
+            unsaved folder with a dictionary of file data.
+        session (Session): A SQLModel session.
+
+    Returns:
+        Package: The created package.
+    """
+    session.add(package)
+    session.flush()
+    _insert_folders(package.id, folders, session)
+    session.commit()
+    _invalidate_package(package.id)
+    return package
+
 def create_package_with_folders(
     package: Package,
     folders: List[Tuple[str, Dict[str, Any]]],
@@ -243,13 +1139,11 @@ def create_package_with_folders(
     Returns:
         Package: The created package.
     """
-    session.add(package)
-    session.commit()
-    session.refresh(package)
-    for title, files_content in folders:
-        folder = QuestionFolder(title=title, package_id=package.id)
-        create_folder(folder, files_content, session)
-    return package
+    return bulk_create_package(
+        package,
+        [(QuestionFolder(title=title), files_content) for title, files_content in folders],
+        session,
+    )
 
 def create_package(package: Package, session: Session) -> Package:
     """
@@ -264,9 +1158,70 @@ def create_package(package: Package, session: Session) -> Package:
     """
     session.add(package)
     session.commit()
+    _invalidate_package(package.id)
     session.refresh(package)
     return package
 
+# Folders inserted per transaction by a course import.
+IMPORT_BATCH_SIZE = 500
+
+def import_package(package: Package, archive: BinaryIO, session: Session) -> ImportResult:
+    """
+    Create a package from a ZIP of PrairieLearn question directories.
+
+    The archive is read one question at a time without extracting it, and
+    folders are inserted `IMPORT_BATCH_SIZE` at a time, each batch in its own
+    transaction, so memory use does not grow with the size of the course.
+    Known PrairieLearn files are stored under their usual names (see
+    `file_name_map`); other text files keep their path in the question
+    directory. Binary, oversized, encrypted and unsupported-compression
+    entries are skipped and reported.
+
+    Args:
+        package (Package): The package to create.
+        archive (BinaryIO): A seekable file object holding the ZIP.
+        session (Session): A SQLModel session on the writer engine.
+
+    Returns:
+        ImportResult: The created package and a summary of the import.
+
+    Raises:
+        HTTPException: If the upload is not a ZIP file or contains no question directories.
+            A corrupt entry found partway through also ends the import with a 400,
+            and any batches committed before it are deleted again.
+    """
+    report = ImportReport()
+    stored_names = {download: name for name, download in file_name_map.items()}
+    questions = iter_questions(archive, stored_names, report)
+
+    def next_batch() -> List[Tuple[QuestionFolder, Dict[str, Any]]]:
+        try:
+            return list(islice(questions, IMPORT_BATCH_SIZE))
+        except zipfile.BadZipFile as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {exc}")
+
+    batch = next_batch()
+    if not batch:
+        raise HTTPException(status_code=400, detail="No question directories found in the archive.")
+
+    session.add(package)
+    session.flush()
+    package_id = package.id
+    try:
+        while batch:
+            _insert_folders(package_id, batch, session)
+            _touch_package(package_id, session)
+            session.commit()
+            _invalidate_package(package_id)
+            batch = next_batch()
+    except BaseException:
+        # Never leave a half-imported package behind.
+        session.rollback()
+        _delete_package(package_id, session)
+        raise
+    session.refresh(package)
+    return ImportResult(package=package, folders=report.folders, files=report.files, skipped=report.skipped)
+
 # ─────────────────────────────────────────────────────────────
 # Download Services
 # ─────────────────────────────────────────────────────────────
@@ -281,12 +1236,22 @@ file_name_map: Dict[str, str] = {
     "metadata": "info.json",
 }
 
+def _archive_entry(file: QuestionFile) -> Tuple[str, bytes]:
+    """The name and bytes a question file is stored under in a download archive."""
+    filename = file.save_name or file_name_map.get(file.name, file.name)
+    content = file.content
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    elif isinstance(content, dict):
+        content = json.dumps(content).encode("utf-8")
+    return filename, content
+
 def download_single_folder(package_id: int, folder_id: int, session: Session):
     """
     Download a specific question folder as a ZIP file.
     
-    This function retrieves a folder by its package ID and folder ID, writes its files
-    to temporary files, and zips them up for download.
+    The folder's files are zipped straight from their stored contents into a
+    streamed response, without touching the filesystem.
 
     Args:
         package_id (int): The package ID.
@@ -301,80 +1266,280 @@ def download_single_folder(package_id: int, folder_id: int, session: Session):
     """
     folder: QuestionFolder = (
         session.query(QuestionFolder)
+        .options(selectinload(QuestionFolder.question_files))
         .filter(QuestionFolder.package_id == package_id, QuestionFolder.id == folder_id)
         .first()
     )
     if not folder:
         raise HTTPException(status_code=404, detail="Folder not found for this module")
-    
-    folder_name = folder.title
-    folder_files: List[QuestionFile] = folder.question_files
-    temp_filepaths = []
-    with tempfile.TemporaryDirectory() as tmpdir:
-        for file in folder_files:
-            tempfile_path = os.path.join(
-                tmpdir,
-                file.save_name if file.save_name is not None else file_name_map.get(file.name)
+
+    # Read everything now: the request's session is closed before the body is sent.
+    entries = [_archive_entry(file) for file in _with_contents(folder.question_files)]
+    headers = {"Content-Disposition": f"attachment; filename={folder.title}.zip"}
+    # Stored uncompressed, as before: a single folder is small and this keeps latency down.
+    return StreamingResponse(
+        stream_zip(entries, compression=zipfile.ZIP_STORED), media_type="application/zip", headers=headers
+    )
+
+# Folders loaded per query while streaming a module archive.
+DOWNLOAD_BATCH_SIZE = 50
+# Part of every module archive key; bump it when the archive bytes change, so old cached archives and ETags are not reused.
+ARCHIVE_FORMAT = 2
+# Threads building nested folder archives; zlib releases the GIL while it works.
+DOWNLOAD_WORKERS = int(os.getenv("DOWNLOAD_WORKERS", os.cpu_count() or 1))
+
+_compression_pool: Optional[ThreadPoolExecutor] = None
+_compression_pool_lock = threading.Lock()
+
+def _get_compression_pool() -> ThreadPoolExecutor:
+    """The process-wide pool for archive compression, shared so concurrent downloads cannot oversubscribe the CPU."""
+    global _compression_pool
+    with _compression_pool_lock:
+        if _compression_pool is None:
+            _compression_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="zip")
+        return _compression_pool
+
+# zipfile methods for each download option; zstd is None where zipfile lacks it.
+ARCHIVE_METHODS: Dict[ArchiveMethod, Optional[int]] = {
+    ArchiveMethod.stored: zipfile.ZIP_STORED,
+    ArchiveMethod.deflate: zipfile.ZIP_DEFLATED,
+    ArchiveMethod.zstd: getattr(zipfile, "ZIP_ZSTANDARD", None),
+}
+# Accepted compression levels for each method.
+ARCHIVE_LEVELS: Dict[ArchiveMethod, range] = {
+    ArchiveMethod.deflate: range(0, 10),
+    ArchiveMethod.zstd: range(1, 23),
+}
+
+def _archive_method(method: ArchiveMethod, level: Optional[int]) -> Tuple[int, Optional[int]]:
+    """
+    Resolve a download's compression option to a zipfile method and level.
+
+    Raises:
+        HTTPException: If the method is unavailable here or the level is out of range.
+    """
+    compress_type = ARCHIVE_METHODS[method]
+    if compress_type is None:
+        raise HTTPException(status_code=400, detail=f"Compression method '{method.value}' is not supported by this server.")
+    if level is not None and level not in ARCHIVE_LEVELS.get(method, ()):
+        raise HTTPException(status_code=400, detail=f"Invalid compression level {level} for '{method.value}'.")
+    return compress_type, level
+
+# Characters that cannot appear in a directory name on common filesystems.
+_UNSAFE_PATH_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+def question_directory(folder: QuestionFolder, used: set) -> str:
+    """
+    A directory name for `folder` in a flat archive or course, unique (ignoring case) among `used`.
+
+    Args:
+        folder (QuestionFolder): The folder to name.
+        used (set): Lower-cased names already taken; the returned name is added to it.
+
+    Returns:
+        str: The directory name.
+    """
+    name = _UNSAFE_PATH_CHARS.sub("_", folder.title or "").strip(" .") or "question"
+    if name.lower() in used:
+        name = f"{name}_{folder.id}"
+    used.add(name.lower())
+    return name
+
+def module_folders(
+    package_id: int,
+    session_factory: Callable[[], Session],
+    course_names: bool = False,
+) -> Iterator[Tuple[QuestionFolder, List[Tuple[str, bytes]]]]:
+    """
+    Yield each folder of a package with its archive entries, reading folders in batches.
+
+    Opens its own session, so it can run in a response body after the request's
+    session has closed; loaded rows are released after each batch so memory stays flat.
+
+    Args:
+        package_id (int): The package to read.
+        session_factory (Callable[[], Session]): Opens the session used for reading.
+        course_names (bool): Replace stored names such as "question_html" with their
+            PrairieLearn file names (see `file_name_map`).
+
+    Yields:
+        Tuple[QuestionFolder, List[Tuple[str, bytes]]]: A folder and its (name, content) entries.
+    """
+    with session_factory() as session:
+        after = 0
+        while True:
+            folders = (
+                session.query(QuestionFolder)
+                .options(selectinload(QuestionFolder.question_files))
+                .filter(QuestionFolder.package_id == package_id, QuestionFolder.id > after)
+                .order_by(QuestionFolder.id)
+                .limit(DOWNLOAD_BATCH_SIZE)
+                .all()
             )
-            content = file.content
-            if isinstance(content, str):
-                content = content.encode("utf-8")
-            elif isinstance(content, dict):
-                content = json.dumps(content).encode("utf-8")
-            with open(tempfile_path, "wb") as f:
-                f.write(content)
-            temp_filepaths.append(tempfile_path)
-        zip_stream = create_zip_file(temp_filepaths)
-        headers = {"Content-Disposition": f"attachment; filename={folder_name}.zip"}
-        return StreamingResponse(zip_stream, media_type="application/zip", headers=headers)
-
-def download_all_folders_in_module(package_id: int, session: Session):
+            for folder in folders:
+                entries = [_archive_entry(file) for file in _with_contents(folder.question_files)]
+                if course_names:
+                    entries = [(file_name_map.get(name, name), data) for name, data in entries]
+                yield folder, entries
+            if len(folders) < DOWNLOAD_BATCH_SIZE:
+                return
+            after = folders[-1].id
+            session.expunge_all()
+
+def _nested_folder(name: str, entries: List[Tuple[str, bytes]], method: int, level: Optional[int]) -> Tuple[str, Entry]:
+    # The folder ZIP is already compressed, so the module archive stores it as is.
+    return name, Entry(b"".join(stream_zip(entries, compression=method, compresslevel=level)))
+
+def _module_entries(
+    package_id: int,
+    session_factory: Callable[[], Session],
+    executor: Optional[Executor] = None,
+    max_pending: int = 2 * DOWNLOAD_WORKERS,
+    layout: ArchiveLayout = ArchiveLayout.nested,
+    method: int = zipfile.ZIP_DEFLATED,
+    level: Optional[int] = None,
+) -> Iterator[Tuple[str, Entry]]:
     """
-    Download a ZIP file containing all question folders for a given package.
-    
-    Each folder is zipped individually and then combined into a master ZIP file.
+    Yield the entries of a package's module archive, in folder id order.
+
+    With the nested layout each folder becomes one stored ZIP entry, built on
+    `executor` (the shared compression pool by default) while later folders
+    are read, with at most `max_pending` folders in flight. With the flat
+    layout each file is stored under `questions/<folder title>/` and is
+    compressed by `stream_zip` as it is written. Either way every byte is
+    compressed once.
+    """
+    folders = module_folders(package_id, session_factory, course_names=layout == ArchiveLayout.flat)
+    if layout == ArchiveLayout.flat:
+        directories: set = set()
+        for folder, entries in folders:
+            directory = question_directory(folder, directories)
+            for name, data in entries:
+                yield f"questions/{directory}/{name}", Entry(data, method, level)
+        return
+    executor = executor or _get_compression_pool()
+    pending = deque()
+    for folder, entries in folders:
+        pending.append(executor.submit(_nested_folder, f"{folder.title}_{folder.id}.zip", entries, method, level))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _module_archive_key(package_id: int, session: Session, *options: object) -> Optional[str]:
+    """
+    Identify a package's module archive by the package's version and the download options.
+
+    Every write to a package bumps its version (see `_touch_package`), so the
+    key changes whenever the archive would.
 
     Args:
         package_id (int): The package ID.
         session (Session): A SQLModel session.
+        options (object): The archive's layout and compression settings.
 
     Returns:
-        StreamingResponse: A streaming response containing the master ZIP file.
-    
-    Raises:
-        HTTPException: If no folders are found for the package.
+        Optional[str]: The archive cache key, or None if the package has no folders.
     """
-    folders: List[QuestionFolder] = (
-        session.query(QuestionFolder).filter(QuestionFolder.package_id == package_id).all()
-    )
+    row = session.exec(
+        select(Package.version, Package.updated_at).where(
+            Package.id == package_id,
+            select(QuestionFolder.id).where(QuestionFolder.package_id == package_id).exists(),
+        )
+    ).first()
+    if row is None:
+        return None
+    return archive_cache.archive_key([(package_id, *row)], *options)
 
-    if not folders:
-        raise HTTPException(status_code=404, detail="No folders found for this module.")
+class _CachedArchiveResponse(FileResponse):
+    """
+    Serves an archive from `archive_cache`, pinned so it outlives eviction while it is sent.
+
+    If the archive was deleted between the cache lookup and the response, by
+    eviction in another worker or a write to the package, `rebuild()` answers
+    instead, as on a cache miss.
+    """
+
+    def __init__(self, path: str, rebuild: Callable[[], Response], **kwargs: Any):
+        super().__init__(path, **kwargs)
+        self.rebuild = rebuild
 
-    master_zip_buffer = BytesIO()
+    async def __call__(self, scope, receive, send) -> None:
+        archive = self.path
+        pinned = await anyio.to_thread.run_sync(archive_cache.cache.pin, archive)
+        if pinned is None:
+            await self.rebuild()(scope, receive, send)
+            return
+        self.path = pinned
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.path = archive
+            await anyio.to_thread.run_sync(archive_cache.cache.unpin, pinned)
 
-    with zipfile.ZipFile(master_zip_buffer, "w", zipfile.ZIP_DEFLATED) as master_zip:
-        for folder in folders:
-            folder_name = folder.title
-            folder_id = folder.id
-            folder_files: List[QuestionFile] = folder.question_files
+def download_all_folders_in_module(
+    package_id: int,
+    session: Session,
+    session_factory: Callable[[], Session] = get_session_factory(),
+    layout: ArchiveLayout = ArchiveLayout.nested,
+    method: ArchiveMethod = ArchiveMethod.deflate,
+    level: Optional[int] = None,
+    if_none_match: str = "",
+):
+    """
+    Download a ZIP file containing all question folders for a given package.
+    
+    With the nested layout each folder is zipped individually and stored,
+    without recompressing, in a master ZIP file; the flat layout writes the
+    files in PrairieLearn's `questions/<title>/` directories instead. The master
+    ZIP is streamed: folders are read and compressed while the response is being
+    sent, so memory use does not grow with the size of the module. The finished
+    archive is kept in `archive_cache`, keyed by the package's version and
+    the download options, and later downloads are served from disk.
+
+    Archives are built deterministically, so the cache key doubles as a strong
+    ETag. Served from disk, the archive honors `Range` (and `If-Range`) with
+    206 Partial Content, so an interrupted download can resume. While an
+    archive is still being built it is streamed whole; `Range` is ignored, as
+    HTTP allows, and the resumed request is then served from disk.
+
+    Args:
+        package_id (int): The package ID.
+        session (Session): A SQLModel session, used to compute the archive's cache key.
+        session_factory (Callable[[], Session]): Opens the session the archive is built with.
+        layout (ArchiveLayout): Nested folder ZIPs or a flat directory tree.
+        method (ArchiveMethod): How files are compressed.
+        level (Optional[int]): The compression level, or None for the method's default.
+        if_none_match (str): The request's If-None-Match header value.
 
-            folder_zip_buffer = BytesIO()
+    Returns:
+        Response: A file or streaming response containing the master ZIP file, or an empty 304.
+    
+    Raises:
+        HTTPException: If no folders are found for the package, or the compression option is invalid.
+    """
+    compress_type, level = _archive_method(method, level)
+    key = _module_archive_key(package_id, session, ARCHIVE_FORMAT, layout.value, method.value, level)
+    if key is None:
+        raise HTTPException(status_code=404, detail="No folders found for this module.")
 
-            with zipfile.ZipFile(folder_zip_buffer, "w", zipfile.ZIP_DEFLATED) as folder_zip:
-                for file in folder_files:
-                    filename = file.save_name or file_name_map.get(file.name, file.name)
-                    content = file.content
-                    if isinstance(content, str):
-                        content = content.encode("utf-8")
-                    elif isinstance(content, dict):
-                        content = json.dumps(content).encode("utf-8")
-                    folder_zip.writestr(filename, content)
+    headers = cache_headers(f'"{key}"')
+    if is_not_modified(headers["ETag"], if_none_match=if_none_match):
+        return not_modified(headers)
 
-            folder_zip_buffer.seek(0)
-            master_zip.writestr(f"{folder_name}_{folder_id}.zip", folder_zip_buffer.read())
+    filename = f"module_{package_id}_folders.zip"
 
-    master_zip_buffer.seek(0)
-    headers = {"Content-Disposition": f"attachment; filename=module_{package_id}_folders.zip"}
+    def build() -> StreamingResponse:
+        entries = _module_entries(package_id, session_factory, layout=layout, method=compress_type, level=level)
+        chunks = archive_cache.cache.tee(package_id, key, stream_zip(entries))
+        return StreamingResponse(
+            chunks,
+            media_type="application/zip",
+            headers={**headers, "Content-Disposition": f"attachment; filename={filename}"},
+        )
 
-    return StreamingResponse(master_zip_buffer, media_type="application/zip", headers=headers)
+    cached = archive_cache.cache.get(package_id, key)
+    if cached is not None:
+        # Starlette answers Range and If-Range itself, against the ETag given here.
+        return _CachedArchiveResponse(cached, build, media_type="application/zip", filename=filename, headers=headers)
+    return build()
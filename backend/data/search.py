@@ -0,0 +1,169 @@
+"""
+Full-Text Search over Question Folders
+
+Maintains and queries the `questionsearch` FTS5 table declared in the model
+module. Each folder has one row holding its title, topic, tags and the text of
+all of its files. Search is only available on SQLite; on other databases the
+index is not maintained and searching raises a 501.
+"""
+
+# ─────────────────────────────────────────────────────────────
+# Standard Library Imports
+# ─────────────────────────────────────────────────────────────
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# ─────────────────────────────────────────────────────────────
+# Third-Party Imports
+# ─────────────────────────────────────────────────────────────
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlmodel import Session
+
+# ─────────────────────────────────────────────────────────────
+# Internal App Imports
+# ─────────────────────────────────────────────────────────────
+from ..model.question_models import SearchHit, SearchPage
+
+# Column weights for bm25(): title, topic, tags, content.
+RANK_WEIGHTS = (10.0, 4.0, 4.0, 1.0)
+
+# Upper bound on rows per DELETE ... IN (...) statement, below SQLite's parameter limit.
+DELETE_CHUNK_SIZE = 500
+
+SEARCH_SQL = text(
+    f"""
+    SELECT questionsearch.rowid AS folder_id,
+           questionfolder.package_id AS package_id,
+           questionfolder.title AS title,
+           snippet(questionsearch, -1, '<mark>', '</mark>', '…', 16) AS snippet,
+           bm25(questionsearch, {", ".join(map(str, RANK_WEIGHTS))}) AS rank
+    FROM questionsearch
+    JOIN questionfolder ON questionfolder.id = questionsearch.rowid
+    WHERE questionsearch MATCH :match
+    ORDER BY rank
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+
+def _supported(session: Session) -> bool:
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def search_document(
+    folder_id: int,
+    title: str,
+    topic: Optional[List[str]],
+    tags: Optional[List[str]],
+    contents: Iterable[str],
+) -> Dict[str, Any]:
+    """
+    Build the search row for one folder.
+
+    Args:
+        folder_id (int): The folder's ID, used as the row ID.
+        title (str): The folder title.
+        topic (Optional[List[str]]): The folder topics.
+        tags (Optional[List[str]]): The folder tags.
+        contents (Iterable[str]): The text of the folder's files.
+
+    Returns:
+        Dict[str, Any]: Parameters for `index_documents`.
+    """
+    return {
+        "rowid": folder_id,
+        "title": title,
+        "topic": " ; ".join(topic or []),
+        "tags": " ; ".join(tags or []),
+        "content": "\n".join(content for content in contents if content),
+    }
+
+
+def index_documents(documents: List[Dict[str, Any]], session: Session) -> None:
+    """
+    Insert or replace the search rows for the given folders. The caller commits.
+
+    Args:
+        documents (List[Dict[str, Any]]): Rows built by `search_document`.
+        session (Session): A SQLModel session.
+    """
+    if not documents or not _supported(session):
+        return
+    rowids = [document["rowid"] for document in documents]
+    for start in range(0, len(rowids), DELETE_CHUNK_SIZE):
+        chunk = rowids[start:start + DELETE_CHUNK_SIZE]
+        placeholders = ", ".join(f":id{i}" for i in range(len(chunk)))
+        session.execute(
+            text(f"DELETE FROM questionsearch WHERE rowid IN ({placeholders})"),
+            {f"id{i}": rowid for i, rowid in enumerate(chunk)},
+        )
+    session.execute(
+        text(
+            "INSERT INTO questionsearch (rowid, title, topic, tags, content) "
+            "VALUES (:rowid, :title, :topic, :tags, :content)"
+        ),
+        documents,
+    )
+
+
+def unindex_package(package_id: int, session: Session) -> None:
+    """
+    Delete the search rows of every folder in a package. The caller commits.
+
+    Args:
+        package_id (int): The package whose folders are removed from the index.
+        session (Session): A SQLModel session.
+    """
+    if not _supported(session):
+        return
+    session.execute(
+        text("DELETE FROM questionsearch WHERE rowid IN (SELECT id FROM questionfolder WHERE package_id = :package_id)"),
+        {"package_id": package_id},
+    )
+
+
+def match_expression(query: str) -> str:
+    """
+    Turn free text into an FTS5 query that matches every word, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in user input are matched literally.
+
+    Args:
+        query (str): The user's search text.
+
+    Returns:
+        str: The MATCH expression, or an empty string if the query has no words.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_folders(query: str, limit: int = 10, offset: int = 0, session: Session = None) -> SearchPage:
+    """
+    Search question folders by title, topic, tags and file contents.
+
+    Args:
+        query (str): The search text.
+        limit (int): The maximum number of hits to return.
+        offset (int): The number of hits to skip.
+        session (Session, optional): A SQLModel session.
+
+    Returns:
+        SearchPage: Ranked hits with highlighted snippets, and the offset of the next page if any.
+
+    Raises:
+        HTTPException: If the database does not support full-text search.
+    """
+    if not _supported(session):
+        raise HTTPException(status_code=501, detail="Full-text search requires SQLite FTS5")
+    match = match_expression(query)
+    if not match:
+        return SearchPage(items=[])
+    rows = session.execute(SEARCH_SQL, {"match": match, "limit": limit + 1, "offset": offset}).mappings().all()
+    items = [SearchHit(**row) for row in rows[:limit]]
+    return SearchPage(items=items, next_offset=offset + limit if len(rows) > limit else None)
@@ -0,0 +1,83 @@
+# data/zip_stream.py
+"""
+Streaming ZIP archives.
+
+`stream_zip` turns an iterable of (name, bytes) entries into ZIP bytes chunk by
+chunk, so a response can start sending before the archive is complete and only
+one entry is held in memory at a time. It drives `zipfile` over an unseekable
+sink: entries are written with data descriptors instead of patched headers,
+and ZIP64 records are added automatically for large entries or archives.
+
+Entries may carry their own compression settings as an `Entry`, e.g. to store
+a nested ZIP without compressing it again. Only the public `zipfile` API is
+used, so nothing here depends on its internals.
+"""
+import zipfile
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+# Default timestamp for entries: the earliest a ZIP can hold, so equal inputs give equal archives.
+EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+@dataclass(frozen=True)
+class Entry:
+    """Entry data with its own compression method and level, overriding the archive's."""
+    data: bytes
+    method: int = zipfile.ZIP_STORED
+    level: Optional[int] = None
+
+
+class _ChunkSink:
+    """A write-only, unseekable file object that buffers what `zipfile` writes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            # zipfile hands over immutable bytes or views of the entry's bytes; join copies them once.
+            self._chunks.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        if self._chunks:
+            chunk = b"".join(self._chunks)
+            self._chunks.clear()
+            yield chunk
+
+
+def stream_zip(
+    entries: Iterable[Tuple[str, Union[bytes, Entry]]],
+    compression: int = zipfile.ZIP_DEFLATED,
+    compresslevel: Optional[int] = None,
+    date_time: Tuple[int, int, int, int, int, int] = EPOCH,
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of `entries` as a sequence of byte chunks.
+
+    Args:
+        entries (Iterable[Tuple[str, Union[bytes, Entry]]]): Archive names and contents,
+            consumed lazily. `Entry` contents keep their own method and level.
+        compression (int): The `zipfile` compression method for plain bytes entries.
+        compresslevel (Optional[int]): The compression level, or None for the method's default.
+        date_time (Tuple[int, ...]): The modification time recorded for every entry.
+
+    Yields:
+        bytes: Consecutive pieces of the archive; one per entry, then the central directory.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=compression, compresslevel=compresslevel) as archive:
+        for name, data in entries:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.external_attr = 0o644 << 16
+            if not isinstance(data, Entry):
+                data = Entry(data, compression, compresslevel)
+            # writestr records the size up front, so zipfile decides whether the entry needs ZIP64.
+            archive.writestr(info, data.data, compress_type=data.method, compresslevel=data.level)
+            yield from sink.drain()
+    # The central directory is written on close.
+    yield from sink.drain()
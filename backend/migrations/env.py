@@ -1,3 +1,4 @@
+import os
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -12,7 +13,7 @@ from pathlib import Path
 config = context.config
 
 DB_PATH =str((Path().parent /'backend/data/database.db').resolve())
-config.set_main_option('sqlalchemy.url',f"sqlite:///{DB_PATH}")
+config.set_main_option('sqlalchemy.url',os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
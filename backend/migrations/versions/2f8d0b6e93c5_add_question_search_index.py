@@ -0,0 +1,87 @@
+"""Add question search index
+
+Revision ID: 2f8d0b6e93c5
+Revises: e3a1d57c4f02
+Create Date: 2026-10-18 13:05:09.662470
+
+"""
+import json
+import zlib
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f8d0b6e93c5'
+down_revision: Union[str, None] = 'e3a1d57c4f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _decompress(encoding: str, data: bytes) -> str:
+    # Frozen copy of the blob codecs as of this revision; migrations must not follow app code.
+    if encoding == 'identity':
+        raw = data
+    elif encoding == 'deflate':
+        raw = zlib.decompress(data)
+    elif encoding == 'zstd':
+        import zstandard
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        raise ValueError(f'Unsupported blob encoding: {encoding}')
+    return raw.decode('utf-8')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    if conn.dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS questionsearch "
+        "USING fts5(title, topic, tags, content, tokenize='porter unicode61')"
+    )
+
+    # Index the folders that already exist.
+    contents = defaultdict(list)
+    files = conn.execute(sa.text(
+        'SELECT questionfile.question_folder_id, questionfile.content, '
+        'fileblob.content, fileblob.data, fileblob.encoding '
+        'FROM questionfile LEFT OUTER JOIN fileblob ON fileblob.id = questionfile.blob_id'
+    ))
+    for folder_id, inline, blob_content, blob_data, encoding in files:
+        if inline is not None:
+            contents[folder_id].append(inline)
+        elif blob_content is not None:
+            contents[folder_id].append(blob_content)
+        elif blob_data is not None:
+            contents[folder_id].append(_decompress(encoding, blob_data))
+
+    documents = []
+    for folder_id, title, topic, tags in conn.execute(sa.text('SELECT id, title, topic, tags FROM questionfolder')):
+        documents.append({
+            'rowid': folder_id,
+            'title': title,
+            'topic': ' ; '.join(json.loads(topic) if topic else []),
+            'tags': ' ; '.join(json.loads(tags) if tags else []),
+            'content': '\n'.join(c for c in contents[folder_id] if c),
+        })
+    if documents:
+        conn.execute(
+            sa.text(
+                'INSERT OR REPLACE INTO questionsearch (rowid, title, topic, tags, content) '
+                'VALUES (:rowid, :title, :topic, :tags, :content)'
+            ),
+            documents,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute('DROP TABLE IF EXISTS questionsearch')
@@ -0,0 +1,38 @@
+"""Add lookup indexes
+
+Revision ID: 5b7e2c1d9a40
+Revises: 016835cea6d0
+Create Date: 2026-10-18 11:02:14.381950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c1d9a40'
+down_revision: Union[str, None] = '016835cea6d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by create_all() after this change already have these indexes.
+    op.create_index('ix_questionfolder_package_id', 'questionfolder', ['package_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_questionfolder_package_id_id', 'questionfolder', ['package_id', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_questionfolder_reviewed', 'questionfolder', ['reviewed'], unique=False, if_not_exists=True)
+    op.create_index('ix_questionfolder_is_adaptive', 'questionfolder', ['is_adaptive'], unique=False, if_not_exists=True)
+    op.create_index('ix_questionfile_question_folder_id', 'questionfile', ['question_folder_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_questionfile_question_folder_id', table_name='questionfile')
+    op.drop_index('ix_questionfolder_is_adaptive', table_name='questionfolder')
+    op.drop_index('ix_questionfolder_reviewed', table_name='questionfolder')
+    op.drop_index('ix_questionfolder_package_id_id', table_name='questionfolder')
+    op.drop_index('ix_questionfolder_package_id', table_name='questionfolder')
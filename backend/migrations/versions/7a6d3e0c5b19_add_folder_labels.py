@@ -0,0 +1,60 @@
+"""Add folder labels
+
+Revision ID: 7a6d3e0c5b19
+Revises: 2f8d0b6e93c5
+Create Date: 2026-10-18 14:21:37.118204
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a6d3e0c5b19'
+down_revision: Union[str, None] = '2f8d0b6e93c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    # create_all() at application startup may already have built the table.
+    if not sa.inspect(conn).has_table('folderlabel'):
+        op.create_table(
+            'folderlabel',
+            sa.Column('question_folder_id', sa.Integer(), nullable=False),
+            sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column('value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.ForeignKeyConstraint(['question_folder_id'], ['questionfolder.id'], ),
+            sa.PrimaryKeyConstraint('question_folder_id', 'kind', 'value'),
+        )
+        op.create_index(
+            'ix_folderlabel_kind_value_folder', 'folderlabel', ['kind', 'value', 'question_folder_id'], unique=False
+        )
+
+    # Label the folders that already exist.
+    conn.execute(sa.text('DELETE FROM folderlabel'))
+    labels = []
+    for folder_id, topic, tags in conn.execute(sa.text('SELECT id, topic, tags FROM questionfolder')):
+        for kind, values in (('topic', topic), ('tag', tags)):
+            for value in dict.fromkeys(json.loads(values) if values else []):
+                labels.append({'question_folder_id': folder_id, 'kind': kind, 'value': value})
+    if labels:
+        conn.execute(
+            sa.text(
+                'INSERT INTO folderlabel (question_folder_id, kind, value) '
+                'VALUES (:question_folder_id, :kind, :value)'
+            ),
+            labels,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_folderlabel_kind_value_folder', table_name='folderlabel')
+    op.drop_table('folderlabel')
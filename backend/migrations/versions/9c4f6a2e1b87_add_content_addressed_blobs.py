@@ -0,0 +1,84 @@
+"""Add content-addressed blobs
+
+Revision ID: 9c4f6a2e1b87
+Revises: 5b7e2c1d9a40
+Create Date: 2026-10-18 11:47:32.904117
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f6a2e1b87'
+down_revision: Union[str, None] = '5b7e2c1d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    # The app's create_all() may already have created the table at startup.
+    if not sa.inspect(conn).has_table('fileblob'):
+        _create_fileblob_table()
+    with op.batch_alter_table('questionfile') as batch_op:
+        batch_op.add_column(sa.Column('blob_id', sa.Integer(), nullable=True))
+        batch_op.alter_column('content', existing_type=sa.VARCHAR(), nullable=True)
+        batch_op.create_index('ix_questionfile_blob_id', ['blob_id'], unique=False)
+        batch_op.create_foreign_key('fk_questionfile_blob_id_fileblob', 'fileblob', ['blob_id'], ['id'])
+
+    # Move existing inline contents into blobs, one blob per distinct content.
+    questionfile = sa.table('questionfile', sa.column('id'), sa.column('content'), sa.column('blob_id'))
+    fileblob = sa.table('fileblob', sa.column('id'), sa.column('sha256'), sa.column('content'), sa.column('size'))
+    extra_values = {}
+    if 'encoding' in {column['name'] for column in sa.inspect(conn).get_columns('fileblob')}:
+        fileblob.append_column(sa.column('encoding'))
+        extra_values['encoding'] = 'identity'
+    blob_ids = {}
+    rows = conn.execute(sa.select(questionfile.c.id, questionfile.c.content).where(questionfile.c.content.is_not(None)))
+    for file_id, content in rows.all():
+        sha = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if sha not in blob_ids:
+            blob_ids[sha] = conn.execute(
+                sa.insert(fileblob)
+                .values(sha256=sha, content=content, size=len(content.encode('utf-8')), **extra_values)
+                .returning(fileblob.c.id)
+            ).scalar_one()
+        conn.execute(
+            sa.update(questionfile)
+            .where(questionfile.c.id == file_id)
+            .values(blob_id=blob_ids[sha], content=None)
+        )
+
+
+def _create_fileblob_table() -> None:
+    op.create_table(
+        'fileblob',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sha256', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('content', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_fileblob_sha256', 'fileblob', ['sha256'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    conn.execute(sa.text(
+        'UPDATE questionfile SET content = (SELECT content FROM fileblob WHERE fileblob.id = questionfile.blob_id) '
+        'WHERE blob_id IS NOT NULL'
+    ))
+    with op.batch_alter_table('questionfile') as batch_op:
+        batch_op.drop_constraint('fk_questionfile_blob_id_fileblob', type_='foreignkey')
+        batch_op.drop_index('ix_questionfile_blob_id')
+        batch_op.alter_column('content', existing_type=sa.VARCHAR(), nullable=False)
+        batch_op.drop_column('blob_id')
+    op.drop_index('ix_fileblob_sha256', table_name='fileblob')
+    op.drop_table('fileblob')
@@ -0,0 +1,39 @@
+"""Add package versions
+
+Revision ID: b41e9f2a6c73
+Revises: 7a6d3e0c5b19
+Create Date: 2026-10-18 15:02:54.731920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e9f2a6c73'
+down_revision: Union[str, None] = '7a6d3e0c5b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The app's create_all() only creates missing tables, so package predates these columns.
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('package')}
+    if 'version' in columns:
+        return
+    with op.batch_alter_table('package') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+        batch_op.add_column(sa.Column(
+            'updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.current_timestamp()
+        ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('package') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
@@ -0,0 +1,47 @@
+"""Add blob compression
+
+Revision ID: e3a1d57c4f02
+Revises: 9c4f6a2e1b87
+Create Date: 2026-10-18 12:20:41.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a1d57c4f02'
+down_revision: Union[str, None] = '9c4f6a2e1b87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The app's create_all() may already have created fileblob with these columns.
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('fileblob')}
+    if 'encoding' in columns:
+        return
+    # Existing blobs are uncompressed, so they keep their text and get the identity encoding.
+    with op.batch_alter_table('fileblob') as batch_op:
+        batch_op.add_column(sa.Column('data', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column(
+            'encoding', sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default='identity'
+        ))
+        batch_op.alter_column('content', existing_type=sa.VARCHAR(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Compressed blobs cannot be represented without these columns.
+    conn = op.get_bind()
+    compressed = conn.execute(sa.text("SELECT count(*) FROM fileblob WHERE encoding != 'identity'")).scalar()
+    if compressed:
+        raise RuntimeError(f"{compressed} compressed blobs must be decompressed before downgrading")
+    with op.batch_alter_table('fileblob') as batch_op:
+        batch_op.alter_column('content', existing_type=sa.VARCHAR(), nullable=False)
+        batch_op.drop_column('encoding')
+        batch_op.drop_column('data')
@@ -1,37 +1,181 @@
-from typing import Optional, List
+from datetime import datetime, timezone
+from typing import Dict, Optional, List
 from sqlmodel import Field, SQLModel, Relationship
 from enum import Enum
-from sqlalchemy import Column
+from sqlalchemy import DDL, Column, DateTime, Index, event
 from sqlalchemy.types import JSON
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Package(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
+    # Bumped whenever the package or anything in it is written; backs HTTP validators.
+    version: int = 1
+    # Aware UTC; SQLite reads it back naive, Postgres stores it as timestamptz.
+    updated_at: datetime = Field(default_factory=utcnow, sa_column=Column(DateTime(timezone=True), nullable=False))
     question_folders: List["QuestionFolder"] = Relationship(back_populates="package")
 
 
 class QuestionFolder(SQLModel, table=True):
+    __table_args__ = (
+        # Serves package lookups ordered or paged by folder id.
+        Index("ix_questionfolder_package_id_id", "package_id", "id"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     # Question Information 
     title: str
     topic: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
     tags: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
     pre_reqs: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
-    is_adaptive: Optional[bool] = None
+    is_adaptive: Optional[bool] = Field(default=None, index=True)
     ai_generated: Optional[bool] = True
     # Data for who is reviewing 
     created_by: Optional[str] = None
     reviewers: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
-    reviewed: Optional[bool] = False
+    reviewed: Optional[bool] = Field(default=False, index=True)
     # Relationships
-    package_id: Optional[int] = Field(default=None, foreign_key="package.id")
+    package_id: Optional[int] = Field(default=None, foreign_key="package.id", index=True)
     package: Optional[Package] = Relationship(back_populates="question_folders")
     question_files: List["QuestionFile"] = Relationship(back_populates="question_folder")
 
+class FileBlob(SQLModel, table=True):
+    """File contents stored once, addressed by the SHA-256 of the content."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    sha256: str = Field(index=True, unique=True)
+    # Uncompressed blobs keep their text in `content`; compressed ones keep
+    # the encoded bytes in `data`, tagged with their HTTP content coding.
+    content: Optional[str] = None
+    data: Optional[bytes] = None
+    encoding: str = "identity"
+    size: int
+
+
 class QuestionFile(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
-    content: str
+    # Inline content is only kept for rows written before blob storage;
+    # the service layer fills this in from the blob when reading.
+    content: Optional[str] = None
     save_name: str
-    question_folder_id: Optional[int] = Field(default=None, foreign_key="questionfolder.id")
+    question_folder_id: Optional[int] = Field(default=None, foreign_key="questionfolder.id", index=True)
     question_folder: Optional[QuestionFolder] = Relationship(back_populates="question_files")
+    blob_id: Optional[int] = Field(default=None, foreign_key="fileblob.id", index=True)
+    blob: Optional[FileBlob] = Relationship(sa_relationship_kwargs={"lazy": "joined"})
+
+
+class QuestionFileMeta(SQLModel):
+    """A question file without its content, for listings."""
+    id: int
+    name: str
+    save_name: str
+    question_folder_id: int
+    size: int  # Uncompressed content size in bytes.
+    sha256: Optional[str] = None  # Content hash; equal hashes mean identical content.
+
+
+class FolderLabel(SQLModel, table=True):
+    """A topic or tag of a question folder, normalized out of the JSON columns for indexed filtering."""
+    __table_args__ = (
+        # Serves "folders with this topic/tag" lookups and per-value counts.
+        Index("ix_folderlabel_kind_value_folder", "kind", "value", "question_folder_id"),
+    )
+    question_folder_id: int = Field(foreign_key="questionfolder.id", primary_key=True)
+    kind: str = Field(primary_key=True)  # "topic" or "tag"
+    value: str = Field(primary_key=True)
+
+
+# Full-text index over folder metadata and file contents, one row per folder
+# (rowid = folder id). SQLite only; the service layer keeps it in sync.
+question_search_ddl = DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS questionsearch "
+    "USING fts5(title, topic, tags, content, tokenize='porter unicode61')"
+)
+event.listen(SQLModel.metadata, "after_create", question_search_ddl.execute_if(dialect="sqlite"))
+
+
+class PackagePage(SQLModel):
+    """A page of packages from a keyset-paginated listing."""
+    items: List[Package]
+    next_cursor: Optional[str] = None
+
+
+class QuestionFolderPage(SQLModel):
+    """A page of question folders from a keyset-paginated listing."""
+    items: List[QuestionFolder]
+    next_cursor: Optional[str] = None
+
+
+class SearchHit(SQLModel):
+    """A question folder matching a full-text search."""
+    folder_id: int
+    package_id: Optional[int] = None
+    title: str
+    snippet: str
+    rank: float
+
+
+class SearchPage(SQLModel):
+    """A page of full-text search results, best match first."""
+    items: List[SearchHit]
+    next_offset: Optional[int] = None
+
+
+class FacetCount(SQLModel):
+    """The number of matching folders carrying a topic or tag."""
+    value: str
+    count: int
+
+
+class FacetPage(SQLModel):
+    """Topic and tag counts over the filtered folders, plus one page of those folders."""
+    topics: List[FacetCount]
+    tags: List[FacetCount]
+    items: List[QuestionFolder]
+    next_cursor: Optional[str] = None
+
+
+class FolderTree(SQLModel):
+    """A question folder with the metadata of its files."""
+    folder: QuestionFolder
+    files: List[QuestionFileMeta]
+
+
+class PackageTree(SQLModel):
+    """A package with all of its folders and their file metadata."""
+    package: Package
+    folders: List[FolderTree]
+
+
+class BatchResult(SQLModel):
+    """Folders and files fetched by id, in the order they were requested; unknown ids are left out."""
+    folders: List[FolderTree]
+    files: List[QuestionFileMeta]
+    # File id -> content, when requested.
+    contents: Dict[int, str] = {}
+
+
+class ArchiveLayout(str, Enum):
+    """How a module download arranges its folders."""
+    # One ZIP per folder inside the module ZIP.
+    nested = "nested"
+    # PrairieLearn's course layout: questions/<title>/question.html, ...
+    flat = "flat"
+
+
+class ArchiveMethod(str, Enum):
+    """How the files of a module download are compressed."""
+    stored = "stored"
+    deflate = "deflate"
+    # Needs a Python whose zipfile supports Zstandard (3.14+).
+    zstd = "zstd"
+
+
+class ImportResult(SQLModel):
+    """The package created by a course import, with what was read and what was left out."""
+    package: Package
+    folders: int
+    files: int
+    skipped: List[str] = []
@@ -1,8 +1,9 @@
-import subprocess
-import json5
 import importlib.util
 import os
-from typing import Callable, Union, Any
+from typing import Callable, Optional, Union, Any
+
+from .node_pool import get_node_pool
+from .py_pool import get_python_pool
 
 
 def import_module_from_path(path: str) -> Any:
@@ -29,53 +30,129 @@ def import_module_from_path(path: str) -> Any:
         raise ImportError(f"Error importing module from path '{path}': {e}")
 
 
-def run_generate_py(path: str) -> dict:
+def run_py_source(source: str, seed: Optional[int] = None) -> dict:
+    """
+    Runs the 'generate' function of Python generator source held in memory.
+
+    The source runs on a pooled worker process (see `py_pool`), not in this
+    process, under the pool's timeout and memory limit.
+
+    Args:
+        source (str): Python source defining a 'generate' function.
+        seed (Optional[int]): Seeds the generator's random numbers for a reproducible result.
+
+    Returns:
+        dict: Output from the generate function.
+
+    Raises:
+        RuntimeError: If running the generator fails.
+    """
+    try:
+        return get_python_pool().run(source, seed=seed)
+    except Exception as e:
+        raise RuntimeError(f"Error running Python generator: {e}")
+
+
+def run_generate_py(path: str, seed: Optional[int] = None) -> dict:
     """
     Runs the 'generate' function from a Python module at the given path.
 
     Args:
         path (str): Path to the Python file containing a 'generate' function.
+        seed (Optional[int]): Seeds the generator's random numbers for a reproducible result.
 
     Returns:
         dict: Output from the generate function.
 
     Raises:
-        Exception: If importing or running the module fails.
+        RuntimeError: If reading or running the module fails.
     """
     try:
-        module = import_module_from_path(path)
-        if not hasattr(module, "generate"):
-            raise AttributeError("The module does not have a 'generate' function.")
-        return module.generate()
-    except Exception as e:
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+    except OSError as e:
         raise RuntimeError(f"Error running Python generator: {e}")
+    return run_py_source(source, seed=seed)
 
 
-def run_js(path: str) -> dict[str, Union[str, dict[str, Any]]]:
+def run_js_source(source: str, filename: str = "server.js", seed: Optional[int] = None) -> dict[str, Union[str, dict[str, Any]]]:
     """
-    Runs a Node.js script and parses the result as JSON.
+    Runs the 'generate' function exported by Node.js module source held in memory.
+
+    The source is sent to a pooled, long-lived Node.js worker (see `node_pool`)
+    over its stdin; nothing is written to disk.
 
     Args:
-        path (str): Path to the JavaScript file with a generate() function.
+        source (str): JavaScript source exporting a generate() function.
+        filename (str): The path `require` calls in the source resolve relative to.
+        seed (Optional[int]): Seeds the generator's random numbers for a reproducible result.
 
     Returns:
-        dict: Parsed JSON output from the JS file.
+        dict: The value returned by generate().
 
     Raises:
-        RuntimeError: If the script fails to run or returns invalid JSON.
+        RuntimeError: If the script fails to run or does not finish in time.
     """
     try:
-        result = subprocess.run(
-            ["node", path, "generate"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return json5.loads(result.stdout)
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"JavaScript execution failed: {e.stderr or e.stdout}")
+        return get_node_pool().run(source, filename=filename, seed=seed)
+    except RuntimeError:
+        raise
     except Exception as e:
+        raise RuntimeError(f"Error running JS file '{filename}': {e}")
+
+
+def run_js(path: str, seed: Optional[int] = None) -> dict[str, Union[str, dict[str, Any]]]:
+    """
+    Runs the 'generate' function exported by a Node.js module.
+
+    Args:
+        path (str): Path to the JavaScript file with a generate() function.
+        seed (Optional[int]): Seeds the generator's random numbers for a reproducible result.
+
+    Returns:
+        dict: The value returned by generate().
+
+    Raises:
+        RuntimeError: If the script fails to run or does not finish in time.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+    except OSError as e:
         raise RuntimeError(f"Error running JS file '{path}': {e}")
+    return run_js_source(source, filename=path, seed=seed)
+
+
+# Generator runners by file name, for paths and for in-memory sources.
+GENERATORS: dict[str, Callable[[str], dict]] = {
+    "server.js": run_js,
+    "server.py": run_generate_py,
+}
+SOURCE_GENERATORS: dict[str, Callable[..., dict]] = {
+    "server.js": run_js_source,
+    "server.py": run_py_source,
+}
+
+
+def run_generate_source(name: str, source: str, seed: Optional[int] = None) -> dict:
+    """
+    Runs generator source held in memory, choosing the runner by its file name.
+
+    Args:
+        name (str): The generator's file name, "server.js" or "server.py".
+        source (str): The generator's source.
+        seed (Optional[int]): Seeds the generator's random numbers for a reproducible result.
+
+    Returns:
+        dict: The output from the generator.
+
+    Raises:
+        ValueError: If `name` is not a supported generator.
+        RuntimeError: If the generator fails.
+    """
+    if name not in SOURCE_GENERATORS:
+        raise ValueError(f"Unsupported file type: {name}")
+    return SOURCE_GENERATORS[name](source, seed=seed)
 
 
 def run_generate(path: str) -> Union[dict, tuple[dict, int]]:
@@ -88,19 +165,14 @@ def run_generate(path: str) -> Union[dict, tuple[dict, int]]:
     Returns:
         dict | tuple: The output from the generator or an error tuple.
     """
-    generators: dict[str, Callable[[str], dict]] = {
-        "server.js": run_js,
-        "server.py": run_generate_py,
-    }
-
     if not os.path.isfile(path):
         return {"error": "File not found"}, 404
 
     base_name = os.path.basename(path)
 
     try:
-        if base_name in generators:
-            return generators[base_name](path)
+        if base_name in GENERATORS:
+            return GENERATORS[base_name](path)
         else:
             return {"error": f"Unsupported file type: {base_name}"}, 400
     except Exception as e:
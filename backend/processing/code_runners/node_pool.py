@@ -0,0 +1,90 @@
+"""
+A pool of long-lived Node.js processes for running `server.js` generators.
+
+Starting `node` costs tens of milliseconds per call, far more than a typical
+generator takes to run. Each worker here runs `node_worker.js` and serves jobs
+over a JSON-lines protocol on its stdin/stdout, keeping compiled generators
+cached between calls. A job that exceeds the timeout gets its worker killed
+and replaced, and workers are retired after `max_jobs` jobs so leaks in
+generator code cannot accumulate.
+"""
+import os
+import shutil
+import threading
+from typing import Any, Dict, Optional
+
+from .worker_pool import Worker, WorkerPool
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_worker.js")
+
+NODE_BINARY = os.getenv("NODE_BINARY", "node")
+# Worker processes, which is also the number of generators run at once.
+NODE_POOL_SIZE = int(os.getenv("NODE_POOL_SIZE", os.cpu_count() or 1))
+# Seconds a single generator may run before its worker is killed.
+NODE_JOB_TIMEOUT = float(os.getenv("NODE_JOB_TIMEOUT", 5))
+# Jobs a worker serves before it is replaced; 0 keeps workers forever.
+NODE_MAX_JOBS = int(os.getenv("NODE_MAX_JOBS", 1000))
+
+class NodeWorker(Worker):
+    """One `node_worker.js` process."""
+
+    def __init__(self, node: str = NODE_BINARY):
+        super().__init__([node, WORKER_SCRIPT], "JavaScript")
+
+
+class NodePool(WorkerPool[NodeWorker]):
+    """
+    A fixed-size pool of `NodeWorker` processes, started on demand.
+
+    Args:
+        size (int): The most workers, and so the most generators running at once.
+        timeout (float): Seconds a job may run before its worker is killed.
+        max_jobs (int): Jobs a worker serves before it is replaced; 0 for no limit.
+        node (str): The Node.js executable.
+    """
+
+    def __init__(
+        self,
+        size: int = NODE_POOL_SIZE,
+        timeout: float = NODE_JOB_TIMEOUT,
+        max_jobs: int = NODE_MAX_JOBS,
+        node: str = NODE_BINARY,
+    ):
+        super().__init__(size, timeout, max_jobs)
+        self.node = node
+
+    def _start_worker(self) -> NodeWorker:
+        return NodeWorker(self.node)
+
+    def run(self, source: str, filename: str = "server.js", seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run a generator's `generate()` on a pooled worker.
+
+        Args:
+            source (str): The generator's JavaScript source, a CommonJS module exporting `generate`.
+            filename (str): Where the source lives; `require` resolves relative to it.
+            seed (Optional[int]): Seeds Math.random (and mathjs) for a reproducible result.
+
+        Returns:
+            Dict[str, Any]: What `generate()` returned, typically `params` and `correct_answers`.
+
+        Raises:
+            TimeoutError: If the generator runs longer than the pool's timeout.
+            RuntimeError: If the generator fails.
+        """
+        return self._submit({"source": source, "filename": os.path.abspath(filename), "seed": seed})
+
+
+_pool: Optional[NodePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_node_pool() -> NodePool:
+    """The process-wide pool, configured from the `NODE_*` environment variables."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if shutil.which(NODE_BINARY) is None:
+                raise RuntimeError(f"Node.js executable '{NODE_BINARY}' not found")
+            _pool = NodePool()
+        return _pool
@@ -0,0 +1,101 @@
+// Long-lived worker for node_pool.py.
+//
+// Reads one JSON job per line on stdin:
+//     {"id": 1, "source": "...", "filename": "/path/server.js", "seed": 42}
+// and writes one JSON reply per line on stdout:
+//     {"id": 1, "ok": true, "result": {...}}  or  {"id": 1, "ok": false, "error": "..."}
+//
+// The source is compiled as a CommonJS module (so `require` resolves relative
+// to `filename`) and its exported `generate()` is called. Compiled modules are
+// cached by a hash of the filename and source. With a seed, Math.random (and
+// mathjs, when the generator uses it) is reseeded before the call so the
+// output is reproducible; without one, both go back to unseeded.
+"use strict";
+
+const crypto = require("crypto");
+const Module = require("module");
+const path = require("path");
+const readline = require("readline");
+
+const MAX_CACHED_MODULES = 256;
+const nativeRandom = Math.random;
+const modules = new Map();
+
+// The protocol owns stdout; anything a generator logs goes to stderr.
+const reply = process.stdout.write.bind(process.stdout);
+console.log = console.info = console.debug = (...args) => console.error(...args);
+
+// mulberry32: small, fast and good enough for question parameters.
+function seededRandom(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function load(source, filename) {
+  const key = crypto.createHash("sha256").update(filename).update("\0").update(source).digest("hex");
+  let entry = modules.get(key);
+  if (entry === undefined) {
+    const mod = new Module(filename, null);
+    mod.filename = filename;
+    mod.paths = Module._nodeModulePaths(path.dirname(filename));
+    mod._compile(source, filename);
+    entry = { exports: mod.exports, require: Module.createRequire(filename), usesMathjs: source.includes("mathjs") };
+    if (modules.size >= MAX_CACHED_MODULES) {
+      modules.delete(modules.keys().next().value);
+    }
+    modules.set(key, entry);
+  }
+  return entry;
+}
+
+function seed(entry, value) {
+  const seeded = value !== null && value !== undefined;
+  Math.random = seeded ? seededRandom(value) : nativeRandom;
+  if (entry.usesMathjs) {
+    try {
+      const math = entry.require("mathjs");
+      if (typeof math.config === "function") {
+        // mathjs only rebuilds its generator when randomSeed changes, and the instance outlives the job,
+        // so the seed is cleared first: a repeated seed starts over and an unseeded job is not left seeded.
+        math.config({ randomSeed: null });
+        if (seeded) math.config({ randomSeed: String(value) });
+      }
+    } catch (error) {
+      // Not installed next to this generator; Math.random is still seeded.
+    }
+  }
+}
+
+async function handle(job) {
+  const entry = load(job.source, path.resolve(job.filename || "server.js"));
+  const generate = entry.exports && entry.exports.generate;
+  if (typeof generate !== "function") {
+    throw new Error("The module does not export a 'generate' function.");
+  }
+  seed(entry, job.seed);
+  return await generate();
+}
+
+const lines = readline.createInterface({ input: process.stdin, terminal: false });
+let queue = Promise.resolve();
+lines.on("line", (line) => {
+  // Jobs run one at a time, in order; the pool never sends a second before the first is answered.
+  queue = queue.then(async () => {
+    let job = { id: null };
+    try {
+      job = JSON.parse(line);
+      const result = await handle(job);
+      reply(JSON.stringify({ id: job.id, ok: true, result }) + "\n");
+    } catch (error) {
+      const message = error && error.stack ? error.stack : String(error);
+      reply(JSON.stringify({ id: job.id, ok: false, error: message }) + "\n");
+    }
+  });
+});
+lines.on("close", () => queue.then(() => process.exit(0)));
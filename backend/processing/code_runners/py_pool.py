@@ -0,0 +1,92 @@
+"""
+A pool of isolated worker processes for running `server.py` generators.
+
+Generated Python used to be imported into the API process on every call:
+recompiled each time, holding the GIL while it ran, and free to exhaust the
+server's memory. Each worker here runs `py_worker.py` as a separate
+interpreter and serves jobs over the JSON-lines protocol of `worker_pool`, so
+nothing from the generator is unpickled or executed in the API process.
+Workers keep compiled code cached by the source's SHA-256, so a generator is
+compiled once per worker however often it is rendered. A job that exceeds the
+timeout gets its worker killed and replaced, and where the platform supports
+it (not on Windows) workers run under an address-space limit.
+"""
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from .worker_pool import Worker, WorkerPool
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "py_worker.py")
+
+# Worker processes, which is also the number of generators run at once.
+PY_POOL_SIZE = int(os.getenv("PY_POOL_SIZE", os.cpu_count() or 1))
+# Seconds a single generator may run before its worker is killed.
+PY_JOB_TIMEOUT = float(os.getenv("PY_JOB_TIMEOUT", 10))
+# Address space per worker, in MiB; 0 for no limit. Not enforced on Windows.
+PY_MEMORY_LIMIT_MB = int(os.getenv("PY_MEMORY_LIMIT_MB", 1024))
+# Jobs a worker serves before it is replaced; 0 keeps workers forever.
+PY_MAX_JOBS = int(os.getenv("PY_MAX_JOBS", 1000))
+
+
+class PythonWorker(Worker):
+    """One `py_worker.py` process."""
+
+    def __init__(self, memory_limit_mb: int = PY_MEMORY_LIMIT_MB):
+        super().__init__([sys.executable, WORKER_SCRIPT, str(memory_limit_mb)], "Python")
+
+
+class PythonPool(WorkerPool[PythonWorker]):
+    """
+    A fixed-size pool of `PythonWorker` processes, started on demand.
+
+    Args:
+        size (int): The most workers, and so the most generators running at once.
+        timeout (float): Seconds a job may run before its worker is killed.
+        max_jobs (int): Jobs a worker serves before it is replaced; 0 for no limit.
+        memory_limit_mb (int): Address space per worker in MiB; 0 for no limit.
+    """
+
+    def __init__(
+        self,
+        size: int = PY_POOL_SIZE,
+        timeout: float = PY_JOB_TIMEOUT,
+        max_jobs: int = PY_MAX_JOBS,
+        memory_limit_mb: int = PY_MEMORY_LIMIT_MB,
+    ):
+        super().__init__(size, timeout, max_jobs)
+        self.memory_limit_mb = memory_limit_mb
+
+    def _start_worker(self) -> PythonWorker:
+        return PythonWorker(self.memory_limit_mb)
+
+    def run(self, source: str, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run a generator's `generate()` on a pooled worker.
+
+        Args:
+            source (str): The generator's Python source, defining `generate()`.
+            seed (Optional[int]): Seeds `random` (and numpy) for a reproducible result.
+
+        Returns:
+            Dict[str, Any]: What `generate()` returned, typically `params` and `correct_answers`.
+
+        Raises:
+            TimeoutError: If the generator runs longer than the pool's timeout.
+            RuntimeError: If the generator fails.
+        """
+        return self._submit({"source": source, "seed": seed})
+
+
+_pool: Optional[PythonPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_python_pool() -> PythonPool:
+    """The process-wide pool, configured from the `PY_*` environment variables."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PythonPool()
+        return _pool
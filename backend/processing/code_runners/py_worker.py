@@ -0,0 +1,93 @@
+"""
+Long-lived worker for py_pool.py; runs as a standalone script, outside the API's package.
+
+Reads one JSON job per line on stdin:
+    {"id": 1, "source": "...", "seed": 42}
+and writes one JSON reply per line on stdout:
+    {"id": 1, "ok": true, "result": {...}}  or  {"id": 1, "ok": false, "error": "..."}
+
+The source's compiled code object is cached by its SHA-256, and each job runs
+it in a fresh namespace before calling `generate()`. With a seed, `random`
+(and numpy, when the generator uses it) is seeded first. Values JSON cannot
+represent, such as sympy numbers, are sent as strings.
+
+Usage:
+    python py_worker.py [MEMORY_LIMIT_MB]
+"""
+import hashlib
+import json
+import random
+import sys
+import traceback
+from collections import OrderedDict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Compiled generators kept per worker.
+CODE_CACHE_SIZE = 256
+
+
+def limit_memory(limit_mb: int) -> None:
+    """Cap this process's address space, where the platform supports it."""
+    if resource is None or limit_mb <= 0:
+        return
+    limit = limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def seed(value, source: str) -> None:
+    random.seed(value)
+    if value is None or "numpy" not in source:
+        return
+    try:
+        import numpy
+    except ImportError:
+        return
+    numpy.random.seed(value % 2**32)
+
+
+def main() -> None:
+    limit_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+    protocol = sys.stdout
+    # The protocol owns stdout; anything a generator prints goes to stderr.
+    sys.stdout = sys.stderr
+    codes = OrderedDict()
+    for line in sys.stdin:
+        job = {}
+        try:
+            job = json.loads(line)
+            source = job["source"]
+            key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+            code = codes.get(key)
+            if code is None:
+                code = compile(source, "server.py", "exec")
+                codes[key] = code
+                if len(codes) > CODE_CACHE_SIZE:
+                    codes.popitem(last=False)
+            else:
+                codes.move_to_end(key)
+            namespace = {"__name__": "generate"}
+            exec(code, namespace)
+            generate = namespace.get("generate")
+            if not callable(generate):
+                raise AttributeError("The module does not have a 'generate' function.")
+            seed(job.get("seed"), source)
+            reply = {"id": job.get("id"), "ok": True, "result": generate()}
+            message = json.dumps(reply, default=str)
+        except MemoryError:
+            message = json.dumps({"id": job.get("id"), "ok": False, "error": "MemoryError: generator exceeded the memory limit"})
+        except BaseException as e:
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            message = json.dumps({"id": job.get("id"), "ok": False, "error": error})
+        protocol.write(message + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Long-lived generator worker processes and the pools that share them.
+
+Shared by the Node.js and Python generator pools. A worker is a child process
+serving one job at a time over a JSON-lines protocol on its stdin/stdout:
+
+    {"id": 1, ...job fields}                    -> worker
+    {"id": 1, "ok": true, "result": ...}        <- worker
+    {"id": 1, "ok": false, "error": "..."}      <- worker
+
+A pool starts workers on demand up to its size, hands each job to an idle
+worker, and retires workers that died, timed out or served `max_jobs` jobs.
+"""
+import abc
+import json
+import queue
+import subprocess
+import threading
+from itertools import count
+from typing import Any, Dict, Generic, List, TypeVar
+
+# Marks a worker's stdout closing.
+_EOF = object()
+
+
+class Worker:
+    """
+    A child process speaking the JSON-lines job protocol.
+
+    Args:
+        command (List[str]): The command starting the worker.
+        language (str): Names the generator language in error messages.
+    """
+
+    def __init__(self, command: List[str], language: str):
+        self.language = language
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.jobs = 0
+        self._ids = count(1)
+        self._replies: "queue.Queue[Any]" = queue.Queue()
+        # Pipes cannot be read with a timeout portably, so a thread hands lines over through a queue.
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self) -> None:
+        for line in self.process.stdout:
+            self._replies.put(line)
+        self._replies.put(_EOF)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, job: Dict[str, Any], timeout: float) -> Any:
+        """
+        Send one job and return the worker's result.
+
+        Raises:
+            TimeoutError: If no reply arrives within `timeout` seconds; the process is killed.
+            RuntimeError: If the job fails or the worker dies.
+        """
+        job_id = next(self._ids)
+        self.jobs += 1
+        try:
+            self.process.stdin.write(json.dumps({**job, "id": job_id}) + "\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            self.kill()
+            raise RuntimeError(f"{self.language} worker exited: {e}")
+        try:
+            line = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise TimeoutError(f"{self.language} generator timed out after {timeout} s")
+        if line is _EOF:
+            self.kill()
+            raise RuntimeError(f"{self.language} worker exited while running the generator")
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            reply = None
+        if not isinstance(reply, dict):
+            # Something other than the worker loop wrote to its stdout; the stream can't be trusted.
+            self.kill()
+            raise RuntimeError(f"{self.language} worker sent an unreadable reply: {line[:200]!r}")
+        if reply.get("id") != job_id:
+            self.kill()
+            raise RuntimeError(f"{self.language} worker replied out of order")
+        if not reply["ok"]:
+            raise RuntimeError(f"{self.language} execution failed: {reply['error']}")
+        return reply.get("result")
+
+    def close(self) -> None:
+        """Let the worker finish and exit; kill it if it does not."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.wait()
+
+
+W = TypeVar("W", bound=Worker)
+
+
+class WorkerPool(abc.ABC, Generic[W]):
+    """
+    A fixed-size pool of worker processes, started on demand.
+
+    Subclasses say how a worker is started with `_start_worker`.
+
+    Args:
+        size (int): The most workers, and so the most jobs running at once.
+        timeout (float): Seconds a job may run before its worker is killed.
+        max_jobs (int): Jobs a worker serves before it is replaced; 0 for no limit.
+    """
+
+    def __init__(self, size: int, timeout: float, max_jobs: int):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: List[W] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @abc.abstractmethod
+    def _start_worker(self) -> W:
+        """Start a new worker process."""
+
+    def _checkout(self) -> W:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"The {type(self).__name__} is closed")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+        return self._start_worker()
+
+    def _checkin(self, worker: W) -> None:
+        retire = not worker.alive or (self.max_jobs and worker.jobs >= self.max_jobs)
+        with self._lock:
+            if not retire and not self._closed:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+    def _submit(self, job: Dict[str, Any]) -> Any:
+        """Run `job` on an idle worker, waiting for a free slot first."""
+        with self._slots:
+            worker = self._checkout()
+            try:
+                return worker.run(job, self.timeout)
+            finally:
+                self._checkin(worker)
+
+    def close(self) -> None:
+        """Stop every idle worker; workers running jobs stop when they finish."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
@@ -4,7 +4,7 @@ from sqlmodel import Session
 from ..model.question_models import Package
 from ..data import question_models as service
 from ..ai_workspace.agents.engineering_codegen.chains import graph, InitialMetadata, OutputState
-from ..data.module import get_session
+from ..data.database import get_write_session
 
 router = APIRouter(prefix="/chains")
 
@@ -15,7 +15,7 @@ class QueryRequest(BaseModel):
 
 
 @router.post("/", response_model=OutputState)
-def run_chain(data: QueryRequest, session: Session = Depends(get_session)):
+def run_chain(data: QueryRequest, session: Session = Depends(get_write_session)):
     """
     Runs the AI code generation chain with an initial metadata template,
     creates a module in the database, and returns the chain output.
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Form
 from pydantic import BaseModel
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Tuple
 import os
 import shutil
@@ -8,8 +8,8 @@ import tempfile
 from ast import literal_eval
 
 
-from ..data.module import get_session
-from ..data import question_models as service
+from ..data.database import get_async_write_session
+from ..data import async_question_models as service
 from ..model.question_models import Package, QuestionFolder
 from ..ai_workspace.agents.engineering_codegen.code_generator import (
     QuestionPayload,
@@ -41,13 +41,8 @@ class QuestionData(BaseModel):
     questions: List[str]
     package_name: str
 
-def create_package_with_folders(package_title:str,question_packages:List[QuestionPackage],session: Session):
-    package = Package(title=package_title)
-    session.add(package)
-    session.commit()
-    session.refresh(package)
-    
-    
+async def create_package_with_folders(package_title:str,question_packages:List[QuestionPackage],session: AsyncSession):
+    folders = []
     for q_pack in question_packages:
         if not isinstance(q_pack,QuestionPackage):
             q_pack = QuestionPackage(**q_pack)
@@ -66,15 +61,14 @@ def create_package_with_folders(package_title:str,question_packages:List[Questio
             reviewers=None,
             reviewed=False,
             created_by=initial_metadata.createdBy,
-            package_id=package.id
         )
-        service.create_folder(folder,data=q_files,session=session)
-    return package
+        folders.append((folder, q_files))
+    return await service.bulk_create_package(Package(title=package_title), folders, session=session)
 
 
 @router.post("/", response_model=List[QuestionPackage])
 async def generate_question_module_v1(
-    data: QuestionData, session: Session = Depends(get_session)
+    data: QuestionData, session: AsyncSession = Depends(get_async_write_session)
 ) -> List[QuestionPackage]:
     """
     Version 1 endpoint for generating a question module from text input using the code generation graph.
@@ -104,7 +98,7 @@ async def generate_question_module_v1(
         tasks.append(graph.ainvoke(graph_input))
     
     question_packages:List[QuestionPackage] =  await asyncio.gather(*tasks)
-    create_package_with_folders(package_title=data.package_name, question_packages=question_packages,session=session)
+    await create_package_with_folders(package_title=data.package_name, question_packages=question_packages,session=session)
     return question_packages
 
 
@@ -116,7 +110,7 @@ async def generate_question_module_v1(
 async def generate_question_module_image_v1(
     files: List[UploadFile] = File(...),
     folder_name: str = Form(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """
     Endpoint to process uploaded image files using the AI pipeline
@@ -148,5 +142,5 @@ async def generate_question_module_image_v1(
         response = ImageExtractionOutputState(**result)
 
         q_packages = response.question_packages
-        create_package_with_folders(package_title=folder_name, question_packages=q_packages,session=session)
+        await create_package_with_folders(package_title=folder_name, question_packages=q_packages,session=session)
     return response
@@ -14,7 +14,7 @@ from ..ai_workspace.agents.engineering_codegen.code_generator_image import (
 )
 from ..data import question_models as service
 from ..model.question_models import Package
-from ..data.module import get_session
+from ..data.database import get_write_session
 
 router = APIRouter(prefix="/chain_image")
 
@@ -45,7 +45,7 @@ async def preview_extracted_content(files: List[UploadFile]):
 @router.post("/extract-and-save", response_model=ImageExtractionOutputState)
 async def extract_and_save_content(
     files: List[UploadFile],
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_write_session)
 ):
     """
     Process uploaded image files using the AI pipeline and save the resulting
@@ -91,7 +91,7 @@ async def extract_and_save_content(
 async def save_generated_module(
     folders: List[Tuple[str, dict[str, str]]],
     title: str = "Module",
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_write_session)
 ):
     """
     Save AI-generated folders and files into the database as a new module.
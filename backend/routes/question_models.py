@@ -5,22 +5,38 @@ Routes for Package, Folder, and File operations.
 # ─────────────────────────────────────────────────────────────
 # Standard Library Imports
 # ─────────────────────────────────────────────────────────────
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 
 # ─────────────────────────────────────────────────────────────
 # Third-Party Imports
 # ─────────────────────────────────────────────────────────────
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # ─────────────────────────────────────────────────────────────
 # Internal App Imports
 # ─────────────────────────────────────────────────────────────
-from ..data import question_models as service
-from ..data.database import get_session
-from ..model.question_models import Package, QuestionFolder, QuestionFile
+from ..data import async_question_models as service
+from ..data import question_models
+from ..data.database import get_async_session, get_async_write_session, get_session_factory, get_write_session
+from ..model.question_models import (
+    ArchiveLayout,
+    ArchiveMethod,
+    BatchResult,
+    PackageTree,
+    Package,
+    QuestionFolder,
+    QuestionFile,
+    QuestionFileMeta,
+    FacetPage,
+    ImportResult,
+    PackagePage,
+    QuestionFolderPage,
+    SearchPage,
+)
 
 # ─────────────────────────────────────────────────────────────
 # Router Configuration
@@ -43,19 +59,35 @@ class FolderCreateRequest(BaseModel):
 # ─────────────────────────────────────────────────────────────
 
 @router.post("/", response_model=Package)
-def create_package_route(package: Package, session: Session = Depends(get_session)) -> Package:
+async def create_package_route(package: Package, session: AsyncSession = Depends(get_async_write_session)) -> Package:
     """
     Create a new package.
     """
-    return service.create_package(package, session)
+    return await service.create_package(package, session)
 
 
 @router.post("/add_folder", response_model=QuestionFolder)
-def create_folder_route(data: FolderCreateRequest, session: Session = Depends(get_session)) -> QuestionFolder:
+async def create_folder_route(data: FolderCreateRequest, session: AsyncSession = Depends(get_async_write_session)) -> QuestionFolder:
     """
     Create a new folder within a package along with its associated files.
     """
-    return service.create_folder(folder=data.folder, data=data.files_content, session=session)
+    return await service.create_folder(folder=data.folder, data=data.files_content, session=session)
+
+
+@router.post("/import", response_model=ImportResult)
+def import_package_route(
+    file: UploadFile = File(...),
+    title: Optional[str] = Form(None),
+    session: Session = Depends(get_write_session),
+) -> ImportResult:
+    """
+    Create a package from a ZIP of PrairieLearn question directories.
+
+    The package is titled `title`, or after the uploaded file when omitted.
+    """
+    # A plain `def`, so FastAPI runs the import, which unzips and writes in batches, in a worker thread.
+    package = Package(title=title or (file.filename or "Imported course").rsplit(".", 1)[0])
+    return question_models.import_package(package, file.file, session)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -63,80 +95,241 @@ def create_folder_route(data: FolderCreateRequest, session: Session = Depends(ge
 # ─────────────────────────────────────────────────────────────
 
 @router.get("/simple/{package_id}/get_all_folders", response_model=List[QuestionFolder])
-def get_all_folders_route(package_id: int, session: Session = Depends(get_session)) -> List[QuestionFolder]:
+async def get_all_folders_route(package_id: int, session: AsyncSession = Depends(get_async_session)) -> List[QuestionFolder]:
     """
     Retrieve all question folders for the specified package.
     """
-    return service.get_package_folders(package_id=package_id, session=session)
+    return await service.get_package_folders(package_id=package_id, session=session)
 
 
 @router.get("/simple/{skip}/{limit}/get_all_folders", response_model=List[QuestionFolder])
-def get_paginated_folders_route(skip: int, limit: int, session: Session = Depends(get_session)) -> List[QuestionFolder]:
+async def get_paginated_folders_route(skip: int, limit: int, session: AsyncSession = Depends(get_async_session)) -> List[QuestionFolder]:
     """
     Retrieve a paginated list of question folders.
     """
-    return service.get_all_question_folders(skip, limit, session)
+    return await service.get_all_question_folders(skip, limit, session)
+
+
+@router.get("/folders", response_model=QuestionFolderPage)
+async def get_folders_page_route(
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    package_id: Optional[int] = None,
+    is_adaptive: Optional[bool] = None,
+    reviewed: Optional[bool] = None,
+    session: AsyncSession = Depends(get_async_session),
+) -> QuestionFolderPage:
+    """
+    Retrieve a cursor-paginated list of question folders, optionally filtered.
+    """
+    return await service.get_question_folders_page(
+        cursor=cursor,
+        limit=limit,
+        package_id=package_id,
+        is_adaptive=is_adaptive,
+        reviewed=reviewed,
+        session=session,
+    )
+
+
+@router.get("/facets", response_model=FacetPage)
+async def get_facets_route(
+    topic: List[str] = Query([]),
+    tag: List[str] = Query([]),
+    is_adaptive: Optional[bool] = None,
+    reviewed: Optional[bool] = None,
+    package_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session),
+) -> FacetPage:
+    """
+    Count topics and tags over the filtered question folders and return a page of them.
+
+    Repeat `topic` or `tag` to require several values.
+    """
+    return await service.get_facets(
+        topics=topic,
+        tags=tag,
+        is_adaptive=is_adaptive,
+        reviewed=reviewed,
+        package_id=package_id,
+        cursor=cursor,
+        limit=limit,
+        session=session,
+    )
+
+
+@router.get("/search", response_model=SearchPage)
+async def search_folders_route(
+    q: str,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_async_session),
+) -> SearchPage:
+    """
+    Full-text search over question folder titles, topics, tags and file contents.
+    """
+    return await service.search_folders(q, limit=limit, offset=offset, session=session)
+
+
+@router.get("/tree/{package_id}", response_model=PackageTree)
+async def get_package_tree_route(package_id: int, session: AsyncSession = Depends(get_async_session)) -> PackageTree:
+    """
+    Retrieve a package with all of its folders and the metadata of their files.
+    """
+    return await service.get_package_tree(package_id, session=session)
+
+
+@router.get("/batch", response_model=BatchResult)
+async def get_batch_route(
+    folder_id: List[int] = Query([]),
+    file_id: List[int] = Query([]),
+    include_content: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+) -> BatchResult:
+    """
+    Retrieve several folders, with their file metadata, and several files in one request.
+
+    Repeat `folder_id` or `file_id` for each id; unknown ids are left out of the result.
+    """
+    return await service.get_batch(folder_id, file_id, include_content, session=session)
+
+
+@router.get("/simple/{package_id}/folder/files", response_model=List[QuestionFileMeta])
+async def get_file_meta_from_folder_route(package_id: int, session: AsyncSession = Depends(get_async_session)) -> List[QuestionFileMeta]:
+    """
+    List the files of the first folder of the specified package, without their content.
+
+    Fetch a file's content from `/simple/{package_id}/folder/file_contents/{file_id}`.
+    """
+    return await service.get_package_file_meta(package_id, session)
+
+
+@router.get("/simple/{package_id}/{folder_id}/files", response_model=List[QuestionFileMeta])
+async def get_file_meta_for_folder_route(package_id: int, folder_id: int, session: AsyncSession = Depends(get_async_session)) -> List[QuestionFileMeta]:
+    """
+    List the files of a specific folder within a package, without their content.
+
+    Fetch a file's content from `/simple/{package_id}/folder/file_contents/{file_id}`.
+    """
+    return await service.get_folder_file_meta(package_id, folder_id, session=session)
 
 
 @router.get("/simple/{package_id}/{folder_id}/get_all_files", response_model=List[QuestionFile])
-def get_files_for_folder_route(package_id: int, folder_id: int, session: Session = Depends(get_session)) -> List[QuestionFile]:
+async def get_files_for_folder_route(package_id: int, folder_id: int, session: AsyncSession = Depends(get_async_session)) -> List[QuestionFile]:
     """
     Retrieve all question files for a specific folder within a package.
     """
-    return service.get_folder_files(package_id, folder_id, session=session)
+    return await service.get_folder_files(package_id, folder_id, session=session)
 
 
 @router.get("/simple/{package_id}/{folder_id}/download", response_class=StreamingResponse)
-def download_folder_route(package_id: int, folder_id: int, session: Session = Depends(get_session)) -> StreamingResponse:
+async def download_folder_route(package_id: int, folder_id: int, session: AsyncSession = Depends(get_async_session)) -> StreamingResponse:
     """
     Download a specific question folder as a ZIP file.
     """
-    return service.download_single_folder(package_id=package_id, folder_id=folder_id, session=session)
+    return await service.download_single_folder(package_id=package_id, folder_id=folder_id, session=session)
 
 
 @router.get("/simple/{module_id}/download", response_class=StreamingResponse)
-def download_all_folders_route(module_id: int, session: Session = Depends(get_session)) -> StreamingResponse:
+async def download_all_folders_route(
+    module_id: int,
+    layout: ArchiveLayout = Query(ArchiveLayout.nested),
+    method: ArchiveMethod = Query(ArchiveMethod.deflate),
+    level: Optional[int] = Query(None),
+    if_none_match: str = Header(""),
+    session: AsyncSession = Depends(get_async_session),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+) -> StreamingResponse:
     """
     Download all folders for the specified package (module) as a master ZIP file.
+
+    `layout=flat` writes PrairieLearn's `questions/<title>/` directories instead
+    of one ZIP per folder; `method` and `level` choose the compression. The
+    archive is streamed while it is being built; once built, it supports
+    `Range` requests so interrupted downloads can resume.
     """
-    return service.download_all_folders_in_module(module_id, session)
+    return await service.download_all_folders_in_module(
+        module_id, session, session_factory, layout=layout, method=method, level=level,
+        if_none_match=if_none_match,
+    )
 
 
 @router.get("/simple", response_model=List[Package])
-def get_all_packages_route(session: Session = Depends(get_session)) -> List[Package]:
+async def get_all_packages_route(
+    if_none_match: str = Header(""),
+    if_modified_since: str = Header(""),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
     """
     Retrieve all packages.
+
+    Answers 304 Not Modified when the client's `If-None-Match` or `If-Modified-Since` is current.
     """
-    return service.get_packages(session=session)
+    return await service.serve_packages(
+        if_none_match=if_none_match, if_modified_since=if_modified_since, session=session
+    )
+
+
+@router.get("/page", response_model=PackagePage)
+async def get_packages_page_route(
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session),
+) -> PackagePage:
+    """
+    Retrieve a cursor-paginated list of packages.
+    """
+    return await service.get_packages_page(cursor=cursor, limit=limit, session=session)
 
 
 @router.get("/simple/{package_id}", response_model=Package)
-def get_package_by_id_route(package_id: int, session: Session = Depends(get_session)) -> Package:
+async def get_package_by_id_route(
+    package_id: int,
+    if_none_match: str = Header(""),
+    if_modified_since: str = Header(""),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
     """
     Retrieve a package by its ID.
+
+    Answers 304 Not Modified when the client's `If-None-Match` or `If-Modified-Since` is current.
     """
-    return service.get_package_by_id(package_id, session)
+    return await service.serve_package(package_id, if_none_match, if_modified_since, session=session)
 
 
 @router.get("/simple/{package_id}/folder", response_model=QuestionFolder)
-def get_first_folder_route(package_id: int, session: Session = Depends(get_session)) -> QuestionFolder:
+async def get_first_folder_route(package_id: int, session: AsyncSession = Depends(get_async_session)) -> QuestionFolder:
     """
     Retrieve the first question folder associated with the specified package.
     """
-    return service.get_package_folder(package_id, session)
+    return await service.get_package_folder(package_id, session)
 
 
 @router.get("/simple/{package_id}/folder/file_contents", response_model=List[QuestionFile])
-def get_files_from_folder_route(package_id: int, session: Session = Depends(get_session)) -> List[QuestionFile]:
+async def get_files_from_folder_route(package_id: int, session: AsyncSession = Depends(get_async_session)) -> List[QuestionFile]:
     """
     Retrieve all question files from the first folder of the specified package.
     """
-    return service.get_package_files(package_id, session)
+    return await service.get_package_files(package_id, session)
 
 
-@router.get("/simple/{package_id}/folder/file_contents/{file_id}")
-def get_file_content_route(package_id: int, file_id: int, session: Session = Depends(get_session)):
+@router.get("/simple/{package_id}/folder/file_contents/{file_id}", response_class=Response)
+async def get_file_content_route(
+    package_id: int,
+    file_id: int,
+    accept_encoding: str = Header(""),
+    if_none_match: str = Header(""),
+    if_modified_since: str = Header(""),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
     """
     Retrieve the content of a specific question file within a package.
+
+    Compressed files are sent without decompressing when the client accepts their encoding.
+    Answers 304 Not Modified when the client's `If-None-Match` or `If-Modified-Since` is current.
     """
-    return service.get_single_file(package_id, file_id, session)
+    return await service.serve_single_file(
+        package_id, file_id, accept_encoding, if_none_match, if_modified_since, session=session
+    )
@@ -1,7 +1,7 @@
 from ..data import generate_quiz as quiz_service
 from fastapi import APIRouter, HTTPException, Query
-from ..data.database import get_session
-from sqlmodel import Session
+from ..data.database import get_async_session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi.responses import HTMLResponse
 from fastapi import APIRouter, Depends
 
@@ -9,6 +9,6 @@ router =  APIRouter(prefix="/quiz")
 
 
 @router.post("/adaptive_quiz/{module_id}", response_class=HTMLResponse)
-async def get_adaptive_quiz(module_id:int, session: Session = Depends(get_session)):
+async def get_adaptive_quiz(module_id:int, session: AsyncSession = Depends(get_async_session)):
     content = await quiz_service.generate_quiz(module_id, session)
     return HTMLResponse(content=content)
\ No newline at end of file
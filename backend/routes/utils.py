@@ -2,7 +2,7 @@ from typing import List, Tuple
 from sqlmodel import Session
 from fastapi import Depends
 
-from ..data.module import get_session
+from ..data.database import get_write_session
 from ..data import question_models as service
 from ..model.question_models import Package
 
@@ -10,7 +10,7 @@ from ..model.question_models import Package
 async def save_generated_module(
     folders: List[Tuple[str, dict[str, str]]],
     title: str = "Module",
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_write_session)
 ):
     """
     Saves generated folders and their files to the database under a new module.
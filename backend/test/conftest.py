@@ -0,0 +1,150 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session
+
+# The application builds its engines when its database module is first imported, while tests are
+# being collected; an in-memory database keeps them off the checked-in development database.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from backend.data import database  # noqa: E402
+from backend.data.database import DatabaseSettings, create_async_db_engine, create_db_engine  # noqa: E402
+from backend.model import question_models  # noqa: F401,E402  (registers the tables)
+
+APP_ENGINES = ("engine", "write_engine", "async_engine", "async_write_engine")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_engines(tmp_path_factory):
+    """Point the application's own engines at a database file that lives for the test session."""
+    settings = DatabaseSettings(url=f"sqlite:///{tmp_path_factory.mktemp('app') / 'app.db'}")
+    engines = dict(zip(APP_ENGINES, (
+        create_db_engine(settings),
+        create_db_engine(settings, writer=True),
+        create_async_db_engine(settings),
+        create_async_db_engine(settings, writer=True),
+    )))
+    SQLModel.metadata.create_all(engines["write_engine"])
+    originals = {name: getattr(database, name) for name in APP_ENGINES}
+    for name, engine in engines.items():
+        setattr(database, name, engine)
+    yield engines
+    for name, engine in originals.items():
+        setattr(database, name, engine)
+    engines["engine"].dispose()
+    engines["write_engine"].dispose()
+    asyncio.run(engines["async_engine"].dispose())
+    asyncio.run(engines["async_write_engine"].dispose())
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def engine(db_path):
+    """An isolated SQLite engine with the full schema."""
+    engine = create_db_engine(DatabaseSettings(url=f"sqlite:///{db_path}"))
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine, db_path):
+    """An async engine over the same database file as `engine`."""
+    async_engine = create_async_db_engine(DatabaseSettings(url=f"sqlite:///{db_path}"))
+    yield async_engine
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture(autouse=True)
+def read_cache():
+    """Start every test with an empty service read cache, since each test has its own database."""
+    from backend.data.question_models import read_cache
+
+    read_cache.clear()
+    read_cache.hits = read_cache.misses = 0
+    yield read_cache
+    read_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def archive_cache(tmp_path, monkeypatch):
+    """Keep built download archives in the test's own directory."""
+    from backend.data import archive_cache
+
+    cache = archive_cache.ArchiveCache(str(tmp_path / "archives"))
+    monkeypatch.setattr(archive_cache, "cache", cache)
+    return cache
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+TRANSACTION_CONTROL = {"BEGIN", "COMMIT", "ROLLBACK"}
+
+
+class QueryCounter:
+    """Count the SQL statements the given engines execute while the block is active."""
+
+    def __init__(self, *engines):
+        self.engines = engines
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.split(" ", 1)[0] not in TRANSACTION_CONTROL:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self):
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+
+
+@pytest.fixture
+def count_queries(engine, async_engine):
+    """Return a context manager factory counting statements on the test database."""
+    return lambda: QueryCounter(engine, async_engine.sync_engine)
+
+
+@pytest.fixture
+def client(engine, async_engine):
+    """A TestClient for the package routes, bound to the test database."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from backend.data.database import get_async_session, get_async_write_session, get_session_factory, get_write_session
+    from backend.routes import question_models as routes
+
+    async def override_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    def override_write_session():
+        with Session(engine) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[get_async_session] = override_session
+    app.dependency_overrides[get_async_write_session] = override_session
+    app.dependency_overrides[get_session_factory] = lambda: (lambda: Session(engine))
+    app.dependency_overrides[get_write_session] = override_write_session
+    with TestClient(app) as client:
+        yield client
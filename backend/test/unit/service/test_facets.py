@@ -0,0 +1,60 @@
+from backend.data import question_models as service
+from backend.model.question_models import Package, QuestionFolder
+
+
+def seed(session):
+    folders = [
+        (QuestionFolder(title="Projectile", topic=["Kinematics"], tags=["gravity", "gravity"]), {}),
+        (QuestionFolder(title="Heat engine", topic=["Thermodynamics"], tags=["first law"], reviewed=True), {}),
+        (QuestionFolder(title="Piston", topic=["Thermodynamics"], tags=["first law", "work"]), {}),
+        (QuestionFolder(title="Untagged"), {}),
+    ]
+    return service.bulk_create_package(Package(title="Physics"), folders, session)
+
+
+def counts(facets):
+    return {facet.value: facet.count for facet in facets}
+
+
+def test_facets_count_every_folder(session):
+    seed(session)
+    page = service.get_facets(session=session)
+
+    assert counts(page.topics) == {"Thermodynamics": 2, "Kinematics": 1}
+    assert counts(page.tags) == {"first law": 2, "gravity": 1, "work": 1}
+    assert page.topics[0].value == "Thermodynamics"
+    assert len(page.items) == 4
+
+
+def test_facets_narrow_to_folders_with_every_label(session):
+    seed(session)
+    page = service.get_facets(topics=["Thermodynamics"], tags=["first law", "work"], session=session)
+
+    assert [folder.title for folder in page.items] == ["Piston"]
+    assert counts(page.tags) == {"first law": 1, "work": 1}
+
+    reviewed = service.get_facets(topics=["Thermodynamics"], reviewed=True, session=session)
+    assert [folder.title for folder in reviewed.items] == ["Heat engine"]
+
+
+def test_facets_paginate_and_include_new_folders(session):
+    package = seed(session)
+    first = service.get_facets(topics=["Thermodynamics"], limit=1, session=session)
+    second = service.get_facets(topics=["Thermodynamics"], limit=1, cursor=first.next_cursor, session=session)
+    assert [first.items[0].title, second.items[0].title] == ["Heat engine", "Piston"]
+    assert second.next_cursor is None
+
+    service.create_folder(
+        QuestionFolder(title="Carnot", topic=["Thermodynamics"], tags=["second law"], package_id=package.id), {}, session
+    )
+    assert counts(service.get_facets(tags=["second law"], session=session).topics) == {"Thermodynamics": 1}
+
+
+def test_facets_route(client, session):
+    seed(session)
+    response = client.get("/packages/facets", params=[("topic", "Thermodynamics"), ("tag", "work")])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["title"] for item in body["items"]] == ["Piston"]
+    assert {facet["value"] for facet in body["tags"]} == {"first law", "work"}
@@ -0,0 +1,76 @@
+import asyncio
+import sys
+from contextlib import contextmanager
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.data import question_models as service
+from backend.data.generate_quiz import generate_quiz
+from backend.model.question_models import Package
+from backend.processing.code_runners import py_pool
+
+GENERATOR = """
+import random
+
+def generate():
+    return {"params": {"height": random.randint(10, 1000)}, "correct_answers": {}}
+"""
+
+# Audit events that touch the filesystem.
+FS_EVENTS = {"open", "os.mkdir", "os.rmdir", "os.remove", "os.listdir", "os.scandir", "os.chmod", "shutil.rmtree"}
+# Audit hooks cannot be removed, so one hook is installed and records into the innermost active list.
+_recordings = []
+_hook_installed = False
+
+
+def _audit(event, args):
+    if _recordings and event in FS_EVENTS:
+        _recordings[-1].append((event, args))
+
+
+@contextmanager
+def record_fs_events():
+    global _hook_installed
+    if not _hook_installed:
+        sys.addaudithook(_audit)
+        _hook_installed = True
+    events = []
+    _recordings.append(events)
+    try:
+        yield events
+    finally:
+        _recordings.remove(events)
+
+
+@pytest.fixture
+def python_pool(monkeypatch):
+    """A fresh process-wide Python generator pool, shut down after the test."""
+    monkeypatch.setattr(py_pool, "_pool", None)
+    yield
+    if py_pool._pool is not None:
+        py_pool._pool.close()
+
+
+def test_quiz_renders_from_stored_contents(session, async_engine, python_pool):
+    package = service.create_package_with_folders(
+        Package(title="Quiz"),
+        [("Drop", {"question_html": "<p>Height: {{ params.height }}</p>", "server_py": GENERATOR})],
+        session,
+    )
+
+    async def render(package_id, seed=None):
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            return await generate_quiz(package_id, async_session, seed=seed)
+
+    # The first render starts the generator pool's worker.
+    first = asyncio.run(render(package.id, 3))
+    assert "Height: " in first and first.split("Height: ")[1].split()[0].isdigit()
+    with record_fs_events() as events:
+        again = asyncio.run(render(package.id, 3))
+    assert again == first
+    assert events == []
+
+    empty = service.create_package_with_folders(Package(title="Empty"), [("None", {"server_py": GENERATOR})], session)
+    with pytest.raises(ValueError):
+        asyncio.run(render(empty.id))
@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import pytest
+
+from backend.processing.code_runners.node_pool import NodePool
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="Node.js is not installed")
+
+GENERATOR = """
+const generate = () => {
+    const height = Math.floor(Math.random() * 91) + 10;
+    return { params: { height }, correct_answers: { time: Math.sqrt(2 * height / 9.81).toFixed(3) } };
+};
+module.exports = { generate };
+console.log("logged output does not break the protocol");
+"""
+
+
+@pytest.fixture
+def pool():
+    pool = NodePool(size=2, timeout=2, max_jobs=3)
+    yield pool
+    pool.close()
+
+
+def test_pool_runs_seeded_generators(pool):
+    first = pool.run(GENERATOR, seed=7)
+    assert set(first) == {"params", "correct_answers"}
+    assert pool.run(GENERATOR, seed=7) == first
+    assert [pool.run(GENERATOR, seed=s)["params"] for s in range(8)] != [first["params"]] * 8
+
+    with pytest.raises(RuntimeError, match="does not export a 'generate'"):
+        pool.run("module.exports = {};")
+    with pytest.raises(RuntimeError, match="boom"):
+        pool.run("module.exports = { generate: () => { throw new Error('boom'); } };")
+
+
+def test_pool_resets_the_mathjs_seed_for_every_job(pool, tmp_path):
+    # A stand-in for mathjs that records every randomSeed it is configured with.
+    stub = tmp_path / "node_modules" / "mathjs"
+    stub.mkdir(parents=True)
+    (stub / "index.js").write_text(
+        "const seeds = [];\n"
+        "module.exports = { seeds, config: (options) => { seeds.push(options.randomSeed); return options; } };\n"
+    )
+    source = 'const math = require("mathjs");\nmodule.exports = { generate: () => math.seeds.splice(0) };'
+    filename = os.path.join(str(tmp_path), "server.js")
+
+    assert pool.run(source, filename=filename, seed=7) == [None, "7"]
+    assert pool.run(source, filename=filename, seed=7) == [None, "7"]
+    assert pool.run(source, filename=filename) == [None]
+
+
+def test_pool_recycles_workers_and_recovers_from_timeouts(pool):
+    pid = "module.exports = { generate: () => process.pid };"
+    pids = [pool.run(pid) for _ in range(4)]
+    # One worker serves jobs in turn, and is replaced after max_jobs=3.
+    assert pids[0] == pids[1] == pids[2] != pids[3]
+
+    with pytest.raises(TimeoutError):
+        pool.run("module.exports = { generate: () => { for (;;) {} } };")
+    assert pool.run(GENERATOR, seed=1)["params"]
@@ -0,0 +1,65 @@
+import sys
+
+import pytest
+
+from backend.processing.code_runners.py_pool import PythonPool
+
+GENERATOR = """
+import random
+from fractions import Fraction
+
+def generate():
+    print("printed output does not break the protocol")
+    height = random.uniform(10, 50)
+    return {"params": {"height": height}, "correct_answers": {"ratio": Fraction(1, 3)}}
+"""
+
+
+@pytest.fixture
+def pool():
+    pool = PythonPool(size=2, timeout=5, max_jobs=3, memory_limit_mb=256)
+    yield pool
+    pool.close()
+
+
+def test_pool_runs_seeded_generators(pool):
+    first = pool.run(GENERATOR, seed=7)
+    assert pool.run(GENERATOR, seed=7) == first
+    assert pool.run(GENERATOR, seed=8) != first
+    # Values JSON cannot carry come back as strings.
+    assert first["correct_answers"] == {"ratio": "1/3"}
+
+    with pytest.raises(RuntimeError, match="does not have a 'generate'"):
+        pool.run("x = 1")
+    with pytest.raises(RuntimeError, match="SyntaxError"):
+        pool.run("def generate(:")
+
+
+def test_pool_enforces_limits_and_recycles_workers(pool):
+    pid = "import os\ndef generate():\n    return os.getpid()"
+    pids = [pool.run(pid) for _ in range(4)]
+    assert pids[0] == pids[1] == pids[2] != pids[3]
+
+    quick = PythonPool(size=1, timeout=0.5)
+    try:
+        with pytest.raises(TimeoutError):
+            quick.run("def generate():\n    while True:\n        pass")
+        assert quick.run(pid) > 0
+    finally:
+        quick.close()
+    if sys.platform != "win32":
+        with pytest.raises(RuntimeError, match="MemoryError"):
+            pool.run("def generate():\n    return len(bytearray(512 * 1024 * 1024))")
+    assert "params" in pool.run(GENERATOR)
+
+
+def test_pool_replaces_a_worker_whose_stdout_is_written_directly(pool):
+    pid = "import os\ndef generate():\n    return os.getpid()"
+    before = pool.run(pid)
+    stray = "import os\ndef generate():\n    os.write(1, b'not a reply\\n')\n    return {}"
+    with pytest.raises(RuntimeError, match="unreadable reply"):
+        pool.run(stray)
+    with pytest.raises(RuntimeError, match="unreadable reply"):
+        pool.run("import sys\ndef generate():\n    sys.__stdout__.write('[1]\\n')\n    sys.__stdout__.flush()\n    return {}")
+    after = pool.run(pid)
+    assert after > 0 and after != before
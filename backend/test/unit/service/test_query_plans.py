@@ -0,0 +1,90 @@
+"""EXPLAIN QUERY PLAN regression tests for the main service queries."""
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+
+from backend.data import question_models as service
+from backend.model.question_models import Package, QuestionFolder
+
+
+@pytest.fixture
+def seeded(session):
+    def folders():
+        return [
+            (QuestionFolder(title=f"Question {i}", topic=["Statics"], tags=[f"tag {i % 3}"]), {"question_html": "<p></p>"})
+            for i in range(20)
+        ]
+
+    package_id = service.bulk_create_package(Package(title="Plans"), folders(), session).id
+    service.bulk_create_package(Package(title="Other"), folders(), session)
+    folder_id = service.get_package_folder(package_id, session).id
+    session.expire_all()
+    return package_id, folder_id
+
+
+def captured_selects(engine, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def query_plans(engine, statements):
+    with engine.connect() as conn:
+        return [
+            (statement, [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+            for statement, parameters in statements
+        ]
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda s, p, f: service.get_package_folders(p, session=s),
+        lambda s, p, f: service.get_package_folder(p, session=s),
+        lambda s, p, f: service.get_package_files(p, session=s),
+        lambda s, p, f: service.get_folder_files(p, f, session=s),
+        lambda s, p, f: service.get_single_file(p, 1, session=s),
+        lambda s, p, f: service.download_single_folder(p, f, session=s),
+        lambda s, p, f: list(service._module_entries(p, lambda: Session(s.get_bind()))),
+        lambda s, p, f: service.get_question_folders_page(limit=5, package_id=p, session=s),
+        lambda s, p, f: service.get_question_folders_page(limit=5, reviewed=True, session=s),
+        lambda s, p, f: service.get_question_folders_page(limit=5, is_adaptive=True, session=s),
+        lambda s, p, f: service.get_facets(topics=["Statics"], tags=["friction"], limit=5, session=s),
+        lambda s, p, f: service.get_facets(package_id=p, limit=5, session=s),
+        lambda s, p, f: service.get_package_tree(p, session=s),
+        lambda s, p, f: service.get_batch([f, f + 1], [1, 2], include_content=True, session=s),
+    ],
+    ids=[
+        "package_folders",
+        "package_folder",
+        "package_files",
+        "folder_files",
+        "single_file",
+        "download_folder",
+        "download_module",
+        "page_by_package",
+        "page_by_reviewed",
+        "page_by_adaptive",
+        "facets_by_label",
+        "facets_by_package",
+        "package_tree",
+        "batch",
+    ],
+)
+def test_queries_do_not_scan_folders_or_files(engine, session, seeded, call):
+    package_id, folder_id = seeded
+    statements = captured_selects(engine, lambda: call(session, package_id, folder_id))
+    assert statements
+
+    for statement, plan in query_plans(engine, statements):
+        for step in plan:
+            assert not step.startswith(("SCAN questionfolder", "SCAN questionfile")), (statement, plan)
@@ -0,0 +1,696 @@
+import asyncio
+import io
+import json
+import os
+import zipfile
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.data import async_question_models as async_service
+from backend.data import compression
+from backend.data import question_models as service
+from backend.data.database import DatabaseSettings
+from backend.data.search import search_folders
+from backend.model.question_models import FileBlob, Package, QuestionFolder, QuestionFile
+
+
+def make_folders(n):
+    return [
+        (f"Question {i}", {"question_html": f"<p>{i}</p>", "server_js": "", "metadata": {"title": i}})
+        for i in range(n)
+    ]
+
+
+def test_create_package_with_folders_single_commit(engine, session):
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+    package = service.create_package_with_folders(Package(title="Bulk"), make_folders(25), session)
+
+    assert len(commits) == 1
+    folders = session.query(QuestionFolder).filter_by(package_id=package.id).all()
+    assert len(folders) == 25
+    assert session.query(QuestionFile).count() == 25 * 3
+    files = {f.name: f for f in service.get_folder_files(package.id, folders[3].id, session)}
+    assert files["question_html"].content == "<p>3</p>"
+    assert files["metadata"].content == '{"title": 3}'
+
+
+def test_create_folder_single_commit(engine, session):
+    package = service.create_package(Package(title="Single"), session)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+    folder = service.create_folder(
+        QuestionFolder(title="Folder", package_id=package.id),
+        {"question_html": "<p></p>", "solution_html": "<p></p>"},
+        session,
+    )
+
+    assert len(commits) == 1
+    assert len(service.get_folder_files(package.id, folder.id, session)) == 2
+
+
+def seed_package(session, n_folders):
+    return service.create_package_with_folders(Package(title="Module"), make_folders(n_folders), session)
+
+
+def test_read_paths_use_constant_queries(session, count_queries):
+    small = seed_package(session, 2)
+    large = seed_package(session, 40)
+    large_folder = service.get_package_folder(large.id, session)
+    small_folder = service.get_package_folder(small.id, session)
+    session.expire_all()
+
+    def measure(fn):
+        with count_queries() as counter:
+            result = fn()
+            if isinstance(result, list):
+                [f.content for f in result]
+        session.expire_all()
+        return counter.count
+
+    assert measure(lambda: service.get_package_files(small.id, session)) == measure(
+        lambda: service.get_package_files(large.id, session)
+    )
+    assert measure(lambda: service.get_folder_files(small.id, small_folder.id, session)) == measure(
+        lambda: service.get_folder_files(large.id, large_folder.id, session)
+    )
+
+
+def test_module_download_queries_do_not_grow_with_folders(client, session, count_queries):
+    small_id = seed_package(session, 2).id
+    large_id = seed_package(session, 40).id
+
+    with count_queries() as small_counter:
+        assert client.get(f"/packages/simple/{small_id}/download").status_code == 200
+    with count_queries() as large_counter:
+        assert client.get(f"/packages/simple/{large_id}/download").status_code == 200
+
+    assert large_counter.count == small_counter.count
+    assert 0 < large_counter.count <= 3
+
+
+def test_folder_pages_follow_cursor_and_filters(client, session):
+    first = seed_package(session, 5)
+    second = seed_package(session, 3)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, "package_id": first.id}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/packages/folders", params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 5 and seen == sorted(seen)
+
+    # Rows inserted after a cursor was issued are picked up without shifting earlier pages.
+    page = client.get("/packages/folders", params={"limit": 6}).json()
+    seed_package(session, 2)
+    rest = client.get("/packages/folders", params={"limit": 100, "cursor": page["next_cursor"]}).json()
+    assert [i["id"] for i in page["items"]] + [i["id"] for i in rest["items"]] == list(range(1, 11))
+    assert client.get("/packages/folders", params={"reviewed": True}).json()["items"] == []
+    assert client.get("/packages/folders", params={"package_id": second.id}).json()["next_cursor"] is None
+
+
+def test_package_page_rejects_bad_cursor(client, session):
+    seed_package(session, 1)
+    assert client.get("/packages/page").json()["items"][0]["title"] == "Module"
+    assert client.get("/packages/page", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_async_service_round_trip(async_engine):
+    async def scenario():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            package = await async_service.create_package_with_folders(
+                Package(title="Async"), make_folders(3), session
+            )
+            folders = await async_service.get_package_folders(package.id, session=session)
+            files = await async_service.get_folder_files(package.id, folders[0].id, session=session)
+            return package, folders, files
+
+    package, folders, files = asyncio.run(scenario())
+    assert package.title == "Async"
+    assert [f.title for f in folders] == ["Question 0", "Question 1", "Question 2"]
+    assert {f.name for f in files} == {"question_html", "server_js", "metadata"}
+
+
+def test_sqlite_engine_uses_wal_and_pragmas(engine):
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+def test_database_settings_from_env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql://user:pw@db/gestalt")
+    monkeypatch.setenv("DB_POOL_SIZE", "25")
+    monkeypatch.setenv("DB_ECHO", "true")
+    settings = DatabaseSettings.from_env()
+    assert not settings.is_sqlite
+    assert settings.pool_size == 25 and settings.echo
+    assert settings.async_url == "postgresql+asyncpg://user:pw@db/gestalt"
+
+
+def test_identical_contents_are_stored_once(session):
+    first = seed_package(session, 10)
+    seed_package(session, 10)
+    extra = service.create_file(
+        QuestionFile(name="question_html", content="<p>0</p>", save_name="question.html",
+                     question_folder_id=service.get_package_folder(first.id, session).id),
+        session,
+    )
+
+    # 10 distinct question_html bodies, 10 distinct metadata bodies and one shared server_js.
+    assert session.exec(select(func.count()).select_from(FileBlob)).one() == 21
+    assert extra.content == "<p>0</p>"
+    stored = session.get(QuestionFile, extra.id)
+    assert stored.blob.sha256 == service.content_hash("<p>0</p>")
+    assert service.get_single_file(first.id, extra.id, session) == "<p>0</p>"
+    # Filling in blob contents must not mark the file rows as modified.
+    assert not session.dirty
+
+
+def test_compressed_blobs_are_transparent(session, client, monkeypatch):
+    monkeypatch.setattr(compression, "settings", compression.CompressionSettings(method=compression.DEFLATE))
+    html = "<pl-question-panel>" + "A ball is thrown from a building. " * 200 + "</pl-question-panel>"
+    package = service.create_package_with_folders(Package(title="Zipped"), [("Q", {"question_html": html})], session)
+    file = service.get_package_files(package.id, session)[0]
+
+    assert file.content == html
+    assert file.blob.encoding == compression.DEFLATE
+    assert file.blob.content is None and len(file.blob.data) < len(html)
+
+    url = f"/packages/simple/{package.id}/folder/file_contents/{file.id}"
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+    assert compressed.headers["content-encoding"] == "deflate"
+    assert compressed.headers["content-type"].startswith("text/html")
+    assert compressed.text == html
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.text == html
+
+
+def test_accepts_encoding():
+    assert compression.accepts_encoding("gzip, deflate, br", "deflate")
+    assert not compression.accepts_encoding("gzip;q=1.0, deflate;q=0", "deflate")
+    assert compression.accepts_encoding("*", "zstd")
+    assert not compression.accepts_encoding("*, zstd;q=0", "zstd")
+    assert not compression.accepts_encoding("", "deflate")
+
+
+def test_file_metadata_listing_skips_content(session, client, count_queries):
+    package = seed_package(session, 3)
+    folder_id = service.get_package_folders(package.id, session)[1].id
+
+    with count_queries() as counter:
+        files = service.get_folder_file_meta(package.id, folder_id, session)
+    assert counter.count == 1
+    assert not any("content" in statement.split("FROM")[0] for statement in counter.statements)
+    by_name = {f.name: f for f in files}
+    assert set(by_name) == {"question_html", "server_js", "metadata"}
+    assert by_name["question_html"].size == len("<p>1</p>")
+    assert by_name["question_html"].sha256 == service.content_hash("<p>1</p>")
+
+    response = client.get(f"/packages/simple/{package.id}/{folder_id}/files")
+    assert response.status_code == 200
+    assert [f["id"] for f in response.json()] == [f.id for f in files]
+    assert "content" not in response.json()[0]
+    assert client.get(f"/packages/simple/{package.id}/folder/files").json()[0]["question_folder_id"] != folder_id
+    assert client.get(f"/packages/simple/{package.id + 1}/{folder_id}/files").status_code == 404
+
+    content = client.get(f"/packages/simple/{package.id}/folder/file_contents/{by_name['question_html'].id}")
+    assert content.text == "<p>1</p>"
+
+
+def test_package_routes_answer_conditional_requests(session, client, count_queries):
+    package = seed_package(session, 2)
+    url = f"/packages/simple/{package.id}"
+
+    first = client.get(url)
+    assert first.status_code == 200 and first.json()["title"] == "Module"
+    assert first.headers["cache-control"] == "no-cache"
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    with count_queries() as counter:
+        cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+    # Validators come from the package row itself, never from the read cache.
+    assert counter.count == 1
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    listing = client.get("/packages/simple")
+    assert client.get("/packages/simple", headers={"If-None-Match": listing.headers["etag"]}).status_code == 304
+
+    # Adding a folder is a write to the package, so both validators move on.
+    service.create_folder(QuestionFolder(title="New", package_id=package.id), {"question_html": "<p></p>"}, session)
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert client.get("/packages/simple", headers={"If-None-Match": listing.headers["etag"]}).status_code == 200
+
+
+def test_package_updated_at_is_stored_timezone_aware():
+    # asyncpg rejects aware datetimes bound to a naive TIMESTAMP column.
+    ddl = str(CreateTable(Package.__table__).compile(dialect=postgresql.dialect()))
+    assert "updated_at TIMESTAMP WITH TIME ZONE NOT NULL" in ddl
+
+
+def test_file_route_etag_is_content_hash(session, client, count_queries):
+    package = seed_package(session, 1)
+    file = next(f for f in service.get_package_file_meta(package.id, session) if f.name == "question_html")
+    url = f"/packages/simple/{package.id}/folder/file_contents/{file.id}"
+
+    response = client.get(url)
+    assert response.headers["etag"] == f'"{file.sha256}"'
+    with count_queries() as counter:
+        cached = client.get(url, headers={"If-None-Match": f'W/"x", "{file.sha256}"'})
+    assert cached.status_code == 304
+    assert counter.count == 1
+    assert client.get(url, headers={"If-None-Match": '"stale"'}).text == "<p>0</p>"
+
+
+def test_read_cache_serves_repeats_and_never_stale_reads(session, read_cache, count_queries):
+    package = seed_package(session, 2)
+    folder = service.get_package_folder(package.id, session)
+    other_id = seed_package(session, 1).id
+
+    first = service.get_folder_files(package.id, folder.id, session)
+    file_id = first[0].id
+    assert service.get_single_file(package.id, file_id, session) == "<p>0</p>"
+    with count_queries() as counter:
+        again = service.get_folder_files(package.id, folder.id, session)
+        assert service.get_single_file(package.id, file_id, session) == "<p>0</p>"
+    assert counter.count == 0
+    assert [(f.id, f.content) for f in again] == [(f.id, f.content) for f in first]
+    # Hits and misses alike are fresh instances outside any session.
+    assert again[0] is not first[0]
+    assert inspect(first[0]).transient and inspect(again[0]).transient
+    assert read_cache.stats()["hits"] == 2
+    service.get_package_folders(other_id, session)
+
+    service.create_file(
+        QuestionFile(name="solution_html", content="<p>new</p>", save_name="solution.html",
+                     question_folder_id=folder.id),
+        session,
+    )
+    assert "solution_html" in {f.name for f in service.get_folder_files(package.id, folder.id, session)}
+    version = service.get_package_by_id(package.id, session).version
+    service.create_folder(QuestionFolder(title="Late", package_id=package.id), {}, session)
+    assert len(service.get_package_folders(package.id, session)) == 3
+    assert service.get_package_by_id(package.id, session).version == version + 1
+
+    # Writes only drop the entries of the package they touch.
+    with count_queries() as counter:
+        service.get_package_folders(other_id, session)
+    assert counter.count == 0
+
+
+def test_read_cache_drops_lookups_that_race_a_write():
+    cache = service.ReadCache(max_bytes=1024, ttl=60)
+    calls = []
+
+    def load():
+        calls.append(1)
+        # A write commits while this lookup is still reading.
+        cache.invalidate_package(1)
+        return "old"
+
+    assert cache.get_or_load(("file", 1, 1), load) == "old"
+    assert cache.get_or_load(("file", 1, 1), lambda: "new") == "new"
+    assert cache.stats()["hits"] == 0 and cache.stats()["size"] == 1
+
+
+def test_read_cache_is_bounded_by_bytes():
+    cache = service.ReadCache(max_bytes=10_000, ttl=60)
+    for i in range(4):
+        cache.get_or_load(("file", 1, i), lambda: "x" * 3000)
+    # The oldest entry made room for the last one.
+    assert cache.stats()["size"] == 3 and cache.stats()["bytes"] <= 10_000
+    # A value larger than the whole cache is returned but not kept.
+    assert cache.get_or_load(("file", 1, 9), lambda: "x" * 20_000) == "x" * 20_000
+    assert cache.stats()["size"] == 3
+
+
+def test_package_tree_uses_fixed_queries(session, client, count_queries):
+    small = seed_package(session, 2).id
+    large = seed_package(session, 30).id
+
+    for package_id in (small, large):
+        with count_queries() as counter:
+            tree = service.get_package_tree(package_id, session)
+        assert counter.count == 3
+    assert len(tree.folders) == 30
+    assert [f.name for f in tree.folders[4].files] == ["question_html", "server_js", "metadata"]
+
+    body = client.get(f"/packages/tree/{small}").json()
+    assert body["package"]["id"] == small
+    assert [node["folder"]["title"] for node in body["folders"]] == ["Question 0", "Question 1"]
+    assert "content" not in body["folders"][0]["files"][0]
+    assert client.get("/packages/tree/999").status_code == 404
+
+
+def test_batch_fetches_folders_and_files_by_id(session, client, count_queries):
+    package = seed_package(session, 5)
+    tree = service.get_package_tree(package.id, session)
+    folder_ids = [tree.folders[3].folder.id, tree.folders[1].folder.id, 999]
+    file_ids = [tree.folders[2].files[0].id, tree.folders[0].files[0].id]
+
+    with count_queries() as counter:
+        batch = service.get_batch(folder_ids, file_ids, include_content=True, session=session)
+    assert counter.count == 4
+    assert [node.folder.title for node in batch.folders] == ["Question 3", "Question 1"]
+    assert all(len(node.files) == 3 for node in batch.folders)
+    assert [f.id for f in batch.files] == file_ids
+    assert batch.contents == {file_ids[0]: "<p>2</p>", file_ids[1]: "<p>0</p>"}
+
+    response = client.get("/packages/batch", params=[("folder_id", folder_ids[0]), ("file_id", file_ids[0])])
+    assert response.status_code == 200
+    assert response.json()["contents"] == {}
+    too_many = [("file_id", i) for i in range(service.MAX_BATCH_IDS + 1)]
+    assert client.get("/packages/batch", params=too_many).status_code == 400
+
+
+def test_module_download_streams_folders_in_batches(client, session, monkeypatch):
+    monkeypatch.setattr(service, "DOWNLOAD_BATCH_SIZE", 2)
+    package_id = seed_package(session, 5).id
+
+    response = client.get(f"/packages/simple/{package_id}/download")
+    assert response.headers["content-type"] == "application/zip"
+
+    master = zipfile.ZipFile(io.BytesIO(response.content))
+    names = master.namelist()
+    assert len(names) == 5 and names[0].startswith("Question 0_")
+    inner = zipfile.ZipFile(io.BytesIO(master.read(names[4])))
+    assert inner.namelist() == ["question_html", "server_js", "metadata"]
+    assert inner.read("question_html") == b"<p>4</p>"
+    assert client.get("/packages/simple/999/download").status_code == 404
+
+
+def test_module_download_flat_layout(client, session):
+    package_id = seed_package(session, 2).id
+    service.create_folder(QuestionFolder(title="Question 1", package_id=package_id), {"question_html": "<p>dup</p>"}, session)
+    url = f"/packages/simple/{package_id}/download"
+
+    flat = zipfile.ZipFile(io.BytesIO(client.get(url, params={"layout": "flat", "method": "stored"}).content))
+    names = flat.namelist()
+    assert names[:3] == ["questions/Question 0/question.html", "questions/Question 0/server.js", "questions/Question 0/info.json"]
+    assert names[-1].startswith("questions/Question 1_") and names[-1].endswith("/question.html")
+    assert flat.read("questions/Question 1/question.html") == b"<p>1</p>"
+    assert {info.compress_type for info in flat.infolist()} == {zipfile.ZIP_STORED}
+
+    # The default nests deflated folder ZIPs without compressing them a second time.
+    nested = zipfile.ZipFile(io.BytesIO(client.get(url).content))
+    assert {info.compress_type for info in nested.infolist()} == {zipfile.ZIP_STORED}
+    inner = zipfile.ZipFile(io.BytesIO(nested.read(nested.namelist()[0])))
+    assert {info.compress_type for info in inner.infolist()} == {zipfile.ZIP_DEFLATED}
+
+    assert client.get(url, params={"method": "deflate", "level": 12}).status_code == 400
+    zstd = client.get(url, params={"method": "zstd"})
+    assert zstd.status_code == (200 if hasattr(zipfile, "ZIP_ZSTANDARD") else 400)
+
+
+def test_folder_download_zips_stored_contents(client, session):
+    package_id = seed_package(session, 2).id
+    folder_id = service.get_package_folders(package_id, session)[1].id
+
+    response = client.get(f"/packages/simple/{package_id}/{folder_id}/download")
+    assert response.headers["content-disposition"] == "attachment; filename=Question 1.zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.read("question_html") == b"<p>1</p>"
+    assert archive.read("metadata") == b'{"title": 1}'
+    assert client.get(f"/packages/simple/{package_id}/999/download").status_code == 404
+
+
+def test_module_archives_are_cached_until_the_package_changes(client, session, archive_cache, count_queries):
+    package_id = seed_package(session, 3).id
+    url = f"/packages/simple/{package_id}/download"
+
+    built = client.get(url).content
+    [stored] = os.listdir(archive_cache.directory)
+    assert stored.startswith(f"{package_id}-")
+    with count_queries() as counter:
+        cached = client.get(url)
+    assert cached.content == built
+    # Only the cache key lookup; no folder or file content is read.
+    assert counter.count == 1
+
+    service.create_folder(QuestionFolder(title="Late", package_id=package_id), {"question_html": "<p></p>"}, session)
+    assert os.listdir(archive_cache.directory) == []
+    rebuilt = client.get(url).content
+    assert len(zipfile.ZipFile(io.BytesIO(rebuilt)).namelist()) == 4
+
+
+def test_cached_module_archives_resume_with_ranges(client, session):
+    package_id = seed_package(session, 3).id
+    url = f"/packages/simple/{package_id}/download"
+
+    built = client.get(url, headers={"Range": "bytes=0-9"})
+    # Not built yet: streamed whole, but already carrying the ETag it will keep.
+    assert built.status_code == 200
+    etag = built.headers["etag"]
+
+    part = client.get(url, headers={"Range": "bytes=10-", "If-Range": etag})
+    assert part.status_code == 206
+    assert part.headers["etag"] == etag
+    assert part.headers["content-range"] == f"bytes 10-{len(built.content) - 1}/{len(built.content)}"
+    assert part.content == built.content[10:]
+    last_modified = part.headers["last-modified"]
+
+    # Serving an archive does not move its Last-Modified, so resuming by date works too.
+    again = client.get(url, headers={"Range": "bytes=0-0", "If-Range": last_modified})
+    assert again.status_code == 206 and again.content == built.content[:1]
+    assert client.get(url, headers={"Range": "bytes=0-0", "If-Range": '"stale"'}).status_code == 200
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_cached_module_archive_survives_eviction_during_a_download(client, session, archive_cache, monkeypatch):
+    package_id = seed_package(session, 3).id
+    url = f"/packages/simple/{package_id}/download"
+    built = client.get(url).content
+    pin = archive_cache.pin
+
+    def pin_then_invalidate(path):
+        pinned = pin(path)
+        archive_cache.invalidate_package(package_id)
+        return pinned
+
+    # Deleted after the response pinned it: still served in full, and the pin is released.
+    monkeypatch.setattr(archive_cache, "pin", pin_then_invalidate)
+    assert client.get(url, headers={"Range": "bytes=5-"}).content == built[5:]
+    assert os.listdir(archive_cache.directory) == []
+
+    # Deleted between the lookup and the response: rebuilt as on a miss.
+    monkeypatch.setattr(archive_cache, "get", lambda *args: archive_cache.path(package_id, "gone"))
+    response = client.get(url)
+    assert response.status_code == 200 and response.content == built
+
+
+def test_archive_cache_evicts_least_recently_used(tmp_path):
+    from backend.data.archive_cache import ArchiveCache
+
+    cache = ArchiveCache(str(tmp_path), max_bytes=250)
+    for key in ("a", "b"):
+        list(cache.tee(1, key, [b"x" * 100]))
+    os.utime(cache.path(1, "a"), (1, 1))
+    os.utime(cache.path(1, "b"), (2, 2))
+    assert cache.get(1, "a") is not None  # Now the most recently used.
+    list(cache.tee(2, "c", [b"x" * 100]))
+
+    assert sorted(os.listdir(tmp_path)) == ["1-a.zip", "2-c.zip"]
+
+    def interrupted():
+        yield b"partial"
+        raise ConnectionError
+
+    try:
+        list(cache.tee(3, "d", interrupted()))
+    except ConnectionError:
+        pass
+    assert sorted(os.listdir(tmp_path)) == ["1-a.zip", "2-c.zip"]
+
+
+def test_parallel_folder_compression_keeps_archive_order(session, engine, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(service, "DOWNLOAD_BATCH_SIZE", 4)
+    package_id = seed_package(session, 11).id
+    factory = lambda: Session(engine)  # noqa: E731
+
+    with ThreadPoolExecutor(max_workers=1) as serial:
+        expected = list(service._module_entries(package_id, factory, serial, max_pending=1))
+    with ThreadPoolExecutor(max_workers=4) as parallel:
+        assert list(service._module_entries(package_id, factory, parallel, max_pending=8)) == expected
+    assert [name.split("_")[0] for name, _ in expected] == [f"Question {i}" for i in range(11)]
+
+
+def test_import_reads_prairielearn_directories_in_batches(client, session, monkeypatch):
+    monkeypatch.setattr(service, "IMPORT_BATCH_SIZE", 2)
+    loops = []
+    import_package = service.import_package
+
+    def import_off_the_loop(*args):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return import_package(*args)
+
+    monkeypatch.setattr(service, "import_package", import_off_the_loop)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as course:
+        for i in range(3):
+            info = {"title": f"Imported {i}", "topic": "Statics", "tags": ["pl", f"t{i}"]}
+            course.writestr(f"course/questions/q{i}/info.json", json.dumps(info))
+            course.writestr(f"course/questions/q{i}/question.html", f"<p>{i}</p>")
+            course.writestr(f"course/questions/q{i}/server.py", "def generate(data): pass")
+        course.writestr("course/questions/q1/clientFilesQuestion/notes.txt", "notes")
+        course.writestr("course/questions/q1/clientFilesQuestion/figure.png", b"\x89PNG\xff\xfe")
+        course.writestr("course/infoCourse.json", "{}")
+        course.writestr("__MACOSX/course/._info.json", b"\x00")
+
+    response = client.post(
+        "/packages/import", files={"file": ("statics.zip", buffer.getvalue(), "application/zip")}
+    )
+    assert response.status_code == 200
+    # The import runs in a worker thread, not on the event loop.
+    assert loops == [None]
+    result = response.json()
+    assert (result["package"]["title"], result["folders"], result["files"]) == ("statics", 3, 10)
+    assert sorted(result["skipped"]) == [
+        "course/infoCourse.json: not inside a question directory",
+        "course/questions/q1/clientFilesQuestion/figure.png: not UTF-8 text",
+    ]
+
+    package_id = result["package"]["id"]
+    folders = service.get_package_folders(package_id, session)
+    assert [(f.title, f.topic, f.tags) for f in folders] == [
+        (f"Imported {i}", ["Statics"], ["pl", f"t{i}"]) for i in range(3)
+    ]
+    files = {f.name: f.content for f in service.get_folder_files(package_id, folders[1].id, session)}
+    assert files["question_html"] == "<p>1</p>"
+    assert files["clientFilesQuestion/notes.txt"] == "notes"
+    assert set(files) == {"metadata", "question_html", "server_py", "clientFilesQuestion/notes.txt"}
+    assert service.get_package_by_id(package_id, session).version == 3
+
+    bad = client.post("/packages/import", files={"file": ("x.zip", b"not a zip", "application/zip")})
+    assert bad.status_code == 400
+
+
+def test_import_keeps_files_with_their_folders_when_the_package_is_written_meanwhile(engine, session, monkeypatch):
+    monkeypatch.setattr(service, "IMPORT_BATCH_SIZE", 2)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as course:
+        for i in range(4):
+            course.writestr(f"q{i}/info.json", json.dumps({"title": f"Q{i}", "tags": [f"t{i}"]}))
+            course.writestr(f"q{i}/question.html", f"<p>{i}</p>")
+    read = service.iter_questions
+
+    def iter_with_intruder(*args):
+        for i, question in enumerate(read(*args)):
+            if i == 2:
+                # Another writer adds a folder to the package between two import batches.
+                with Session(engine) as other:
+                    package_id = other.exec(select(func.max(Package.id))).one()
+                    service.create_folder(
+                        QuestionFolder(title="Intruder", package_id=package_id), {"question_html": "<p>x</p>"}, other
+                    )
+            yield question
+
+    monkeypatch.setattr(service, "iter_questions", iter_with_intruder)
+    package_id = service.import_package(Package(title="Course"), buffer, session).package.id
+
+    for folder in service.get_package_folders(package_id, session):
+        files = service.get_folder_files(package_id, folder.id, session)
+        expected = "<p>x</p>" if folder.title == "Intruder" else f"<p>{folder.title[1]}</p>"
+        assert [f.content for f in files if f.name == "question_html"] == [expected]
+        if folder.title != "Intruder":
+            assert folder.tags == [f"t{folder.title[1]}"]
+    # Search rows were written for the right folders too.
+    for i in range(4):
+        assert [hit.title for hit in search_folders(f"t{i}", session=session).items] == [f"Q{i}"]
+
+
+def _patch_zip_entry(data: bytes, name: str, flag_bits: int = None, method: int = None) -> bytes:
+    """Rewrite the flag bits or compression method in both headers of a ZIP entry."""
+    data = bytearray(data)
+    encoded = name.encode()
+    for signature, flags_at, name_at in ((b"PK\x03\x04", 6, 30), (b"PK\x01\x02", 8, 46)):
+        start = 0
+        while (start := data.find(signature, start)) != -1:
+            if data[start + name_at:start + name_at + len(encoded)] == encoded:
+                if flag_bits is not None:
+                    data[start + flags_at:start + flags_at + 2] = flag_bits.to_bytes(2, "little")
+                if method is not None:
+                    data[start + flags_at + 2:start + flags_at + 4] = method.to_bytes(2, "little")
+            start += 4
+    return bytes(data)
+
+
+def test_import_skips_unreadable_entries_and_never_keeps_a_partial_package(client, engine, monkeypatch):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as course:
+        course.writestr("q0/question.html", "<p>0</p>")
+        course.writestr("q0/secret.txt", "hidden")
+        course.writestr("q0/packed.txt", "packed")
+        course.writestr("q0/../../evil.txt", "evil")
+        course.writestr("q0/notes/../notes.txt", "notes")
+    data = _patch_zip_entry(buffer.getvalue(), "q0/secret.txt", flag_bits=0x1)
+    data = _patch_zip_entry(data, "q0/packed.txt", method=99)
+
+    response = client.post("/packages/import", files={"file": ("c.zip", data, "application/zip")})
+    assert response.status_code == 200
+    assert sorted(response.json()["skipped"]) == [
+        "q0/../../evil.txt: path outside its question directory",
+        "q0/packed.txt: unsupported compression method",
+        "q0/secret.txt: encrypted",
+    ]
+    files = client.get(f"/packages/simple/{response.json()['package']['id']}/folder/files").json()
+    assert sorted(f["name"] for f in files) == ["notes.txt", "question_html"]
+
+    # The second batch holds an entry whose CRC no longer matches.
+    monkeypatch.setattr(service, "IMPORT_BATCH_SIZE", 1)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as course:
+        course.writestr("q0/question.html", "<p>0</p>")
+        course.writestr("q1/question.html", "<p>1</p>")
+    data = buffer.getvalue().replace(b"<p>1</p>", b"<p>X</p>")
+
+    def counts():
+        with Session(engine) as session:
+            return [session.exec(select(func.count()).select_from(model)).one() for model in (Package, QuestionFolder)]
+
+    before = counts()
+    response = client.post("/packages/import", files={"file": ("c.zip", data, "application/zip")})
+    assert response.status_code == 400
+    assert counts() == before
+
+
+def test_course_sync_writes_only_changed_files(session, engine, tmp_path):
+    from backend.data.course_sync import sync_package
+
+    package_id = seed_package(session, 3).id
+    factory = lambda: Session(engine)  # noqa: E731
+
+    first = sync_package(package_id, str(tmp_path), factory, workers=2)
+    assert len(first.written) == 9 and first.unchanged == []
+    html = tmp_path / "questions" / "Question 1" / "question.html"
+    assert html.read_text() == "<p>1</p>"
+    assert (tmp_path / "questions" / "Question 1" / "info.json").read_text() == '{"title": 1}'
+
+    html.write_text("edited by hand")
+    (tmp_path / "questions" / "Question 2" / "notes.txt").write_text("stale")
+    service.create_folder(QuestionFolder(title="Question 3", package_id=package_id), {"question_html": "<p>3</p>"}, session)
+    second = sync_package(package_id, str(tmp_path), factory, workers=2, prune=True)
+    assert second.written == ["questions/Question 1/question.html", "questions/Question 3/question.html"]
+    assert len(second.unchanged) == 8
+    assert second.removed == ["questions/Question 2/notes.txt"]
+    assert html.read_text() == "<p>1</p>"
@@ -0,0 +1,66 @@
+from backend.data import question_models as service
+from backend.data import search
+from backend.model.question_models import Package, QuestionFile, QuestionFolder
+
+
+def seed(session):
+    folders = [
+        (
+            QuestionFolder(title="Projectile from a building", topic=["Kinematics"], tags=["gravity"]),
+            {"question_html": "<p>A ball is thrown horizontally from a building.</p>"},
+        ),
+        (
+            QuestionFolder(title="Heat engine efficiency", topic=["Thermodynamics"], tags=["first law"]),
+            {"question_html": "<p>A heat engine rejects heat to a cold reservoir.</p>"},
+        ),
+        (
+            QuestionFolder(title="Piston work", topic=["Thermodynamics"], tags=["boundary work"]),
+            {"question_html": "<p>Gas expands in a piston; find the work. Heat is added.</p>"},
+        ),
+    ]
+    return service.bulk_create_package(Package(title="Physics"), folders, session)
+
+
+def test_search_ranks_title_matches_first(session):
+    seed(session)
+    page = search.search_folders("heat", session=session)
+
+    assert [hit.title for hit in page.items] == ["Heat engine efficiency", "Piston work"]
+    assert "<mark>" in page.items[1].snippet
+    assert page.next_offset is None
+
+
+def test_search_matches_topics_tags_and_prefixes(session):
+    seed(session)
+    assert [h.title for h in search.search_folders("first law", session=session).items] == ["Heat engine efficiency"]
+    assert len(search.search_folders("thermo", session=session).items) == 2
+    assert search.search_folders('"unbalanced ( OR', session=session).items == []
+    assert search.search_folders("  ", session=session).items == []
+
+
+def test_search_paginates(session):
+    seed(session)
+    first = search.search_folders("the", limit=1, session=session)
+    assert len(first.items) == 1 and first.next_offset == 1
+    second = search.search_folders("the", limit=1, offset=first.next_offset, session=session)
+    assert second.items[0].folder_id != first.items[0].folder_id
+
+
+def test_new_files_are_searchable(session):
+    package = seed(session)
+    folder = service.get_package_folder(package.id, session)
+    service.create_file(
+        QuestionFile(name="solution_html", content="Use the quadratic formula.", save_name="solution.html",
+                     question_folder_id=folder.id),
+        session,
+    )
+    assert [h.folder_id for h in search.search_folders("quadratic", session=session).items] == [folder.id]
+    # The folder's existing text is still indexed alongside the new file.
+    assert folder.id in [h.folder_id for h in search.search_folders("horizontally", session=session).items]
+
+
+def test_search_route(client, session):
+    seed(session)
+    response = client.get("/packages/search", params={"q": "piston"})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["title"] == "Piston work"
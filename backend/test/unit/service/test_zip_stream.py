@@ -0,0 +1,45 @@
+import io
+import shutil
+import subprocess
+import zipfile
+
+from backend.data.zip_stream import Entry, stream_zip
+
+
+def test_stream_zip_yields_a_readable_archive_per_entry():
+    entries = [("question.html", b"<p>hello</p>" * 500), ("nested/info.json", b"{}"), ("empty.txt", b"")]
+    chunks = list(stream_zip(iter(entries), compresslevel=9))
+
+    assert len(chunks) > len(entries)
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    assert [(info.filename, archive.read(info)) for info in archive.infolist()] == entries
+    assert archive.getinfo("question.html").compress_size < 500
+    assert archive.getinfo("question.html").date_time == (1980, 1, 1, 0, 0, 0)
+
+
+def test_stream_zip_is_deterministic_and_handles_no_entries():
+    entries = [("a.txt", b"a" * 10_000), ("b.txt", b"b")]
+    assert b"".join(stream_zip(entries)) == b"".join(stream_zip(entries))
+    assert zipfile.ZipFile(io.BytesIO(b"".join(stream_zip([])))).namelist() == []
+
+
+def test_stream_zip_keeps_per_entry_methods_and_passes_unzip(tmp_path):
+    inner = b"".join(stream_zip([("q.html", b"<p>q</p>" * 100)]))
+    entries = [
+        ("folder.zip", Entry(inner)),
+        ("deflated.txt", Entry(b"x" * 5000, zipfile.ZIP_DEFLATED, 9)),
+        ("plain.txt", b"plain"),
+    ]
+    data = b"".join(stream_zip(entries, compression=zipfile.ZIP_STORED))
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    assert [info.compress_type for info in archive.infolist()] == [
+        zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED,
+    ]
+    assert archive.read("folder.zip") == inner
+    if shutil.which("unzip"):
+        path = tmp_path / "archive.zip"
+        path.write_bytes(data)
+        assert subprocess.run(["unzip", "-tq", str(path)], capture_output=True).returncode == 0
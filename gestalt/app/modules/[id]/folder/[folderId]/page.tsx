@@ -8,9 +8,10 @@ import api from "@/api";
 interface FileResponse {
   id: number;
   name: string;
-  content: string;
-  save_name: string | null;
-  folder_id: number;
+  save_name: string;
+  question_folder_id: number;
+  size: number;
+  sha256: string | null;
 }
 
 const FileNameMap: Record<string, string> = {
@@ -67,7 +68,7 @@ const FilePage: React.FC = () => {
     try {
       console.log(module_id, folder_id);
       const response = await api.get(
-        `/packages/simple/${module_id}/${folder_id}/get_all_files`
+        `/packages/simple/${module_id}/${folder_id}/files`
       );
       console.log(response.data);
       setFiles(response.data);
@@ -56,9 +56,9 @@ const FolderPage: React.FC = () => {
   const fetchFolders = async () => {
     setLoading(true);
     try {
-      const response = await api.get(`/packages/simple/${id}/get_all_folders`);
-      console.log(response.data);
-      setFolders(response.data); //
+      // One request returns the package, its folders and their files.
+      const response = await api.get(`/packages/tree/${id}`);
+      setFolders(response.data.folders.map((node: { folder: Folder }) => node.folder));
     } catch (error) {
       console.error("There was an error getting the folders", error);
     } finally {
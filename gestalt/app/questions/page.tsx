@@ -58,13 +58,15 @@ const QuestionPage: React.FC = () => {
   const [Question, setQuestions] = useState<QuestionFolderResponse[]>([]);
   const [loading, setLoading] = useState<boolean>(false);
 
-  // Currently Pagination is hard coded
+  // Currently Pagination is hard coded to the first page
   const fetchQuestions = async () => {
     setLoading(true);
     try {
-      const response = await api.get(`/packages/simple/0/10/get_all_folders`);
+      const response = await api.get(`/packages/folders`, {
+        params: { limit: 10 },
+      });
       console.log(response.data);
-      setQuestions(response.data);
+      setQuestions(response.data.items);
     } catch (error) {
       console.log("There was an error getting the folders");
     } finally {